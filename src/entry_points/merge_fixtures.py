@@ -0,0 +1,73 @@
+"""
+Combines the outputs of the nodes of a multi-node fill into a single fixtures directory.
+
+example: Usage
+    ```
+    fill --shard=1/2 --output=fixtures-1  # on the first node
+    fill --shard=2/2 --output=fixtures-2  # on the second node
+    python merge_fixtures.py fixtures-1 fixtures-2 --output fixtures
+    # or using the entry point
+    merge_fixtures fixtures-1 fixtures-2 --output fixtures
+    ```
+
+The fixture shards written by every node are merged in the collection order of the tests
+that produced them, so that the output directory contains the same files, with the same
+contents, as a single-node fill of all the shards. The fill fingerprints of `--incremental`
+are merged as well. The input directories are left untouched, unless one of them is also the
+output directory.
+"""
+
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+from pytest_plugins.test_filler.fingerprints import FillFingerprints
+from pytest_plugins.test_filler.fixture_writer import merge_shards, remove_shards
+
+
+def merge_fingerprints(input_dirs: List[Path], output_dir: Path) -> None:
+    """
+    Merges the fill fingerprints of the input directories, if any, into the output directory.
+    """
+    inputs = [FillFingerprints(input_dir) for input_dir in input_dirs]
+    if not any(fingerprints.path.exists() for fingerprints in inputs):
+        return
+    merged = FillFingerprints(output_dir)
+    for fingerprints in inputs:
+        merged.entries.update(fingerprints.entries)
+    merged.save()
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    Main function.
+
+    Returns:
+        None.
+    """
+    parser = argparse.ArgumentParser(description="Merge the fixture shards of a multi-node fill.")
+    parser.add_argument(
+        "inputs", type=Path, nargs="+", help="Output directories of the `fill --shard` runs."
+    )
+    parser.add_argument(
+        "--output", type=Path, required=True, help="Directory to write the merged fixtures to."
+    )
+    parsed = parser.parse_args(args)
+
+    output_dir = parsed.output.resolve()
+    input_dirs = [input_dir.resolve() for input_dir in parsed.inputs]
+    missing = [str(input_dir) for input_dir in input_dirs if not input_dir.is_dir()]
+    if missing:
+        parser.error(f"no such directories: {', '.join(missing)}")
+    count = merge_shards(
+        str(output_dir), [str(input_dir) for input_dir in input_dirs], remove=False
+    )
+    if output_dir in input_dirs:
+        # The shards of the output directory are now merged into its fixture files.
+        remove_shards(str(output_dir))
+    merge_fingerprints(input_dirs, output_dir)
+    print(f"Merged {count} fixture files into {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""
+Micro-benchmarks of the hot paths of the test filling framework.
+
+example: Usage
+    ```
+    python micro_benchmarks.py t8n-io --iterations 2000
+    # or using the entry point
+    micro_benchmarks t8n-io
+    micro_benchmarks json-encode --txs 100
+    micro_benchmarks sign --txs 512 --workers 2 4 8
+    micro_benchmarks rlp --txs 100
+    micro_benchmarks tx-memo --iterations 10000
+    micro_benchmarks keccak --size 64
+    ```
+
+Every benchmark runs the previous and the current implementation of a code path side by
+side on the same synthetic inputs and prints the resources they used: time, read/write
+syscalls and bytes as reported by `/proc/self/io` where available (Linux), or peak memory.
+"""
+
+import argparse
+import copy
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, fields, is_dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from ethereum import rlp as eth_rlp
+from ethereum.base_types import Uint
+from ethereum.crypto.hash import keccak256
+
+from ethereum_test_tools.common import (
+    AccessList,
+    Address,
+    Bloom,
+    Bytes,
+    Environment,
+    FixtureHeader,
+    Hash,
+    HeaderNonce,
+    JSONEncoder,
+    Transaction,
+)
+from ethereum_test_tools.common.hashing import available_keccak_backends
+from ethereum_test_tools.common.types import (
+    FixtureTransaction,
+    sign_transaction,
+    sign_transactions,
+)
+from evm_transition_tool.evmone import read_json_file, write_json_file
+from evm_transition_tool.json_codec import JSONCodec
+from evm_transition_tool.scratch import ScratchDirectoryPool
+
+
+@dataclass(kw_only=True)
+class Measurement:
+    """
+    Resources used by a benchmarked function.
+    """
+
+    seconds: float
+    syscalls: Optional[int]
+    bytes: Optional[int]
+
+
+def process_io() -> Optional[Dict[str, int]]:
+    """
+    Returns the I/O counters of the current process, or None if they are not available.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            return {key: int(value) for key, value in (line.split(":") for line in f)}
+    except OSError:
+        return None
+
+
+def measure(function: Callable[[], Any], iterations: int) -> Measurement:
+    """
+    Runs the function the given number of times and returns the resources it used.
+    """
+    before = process_io()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    seconds = time.perf_counter() - start
+    after = process_io()
+    if before is None or after is None:
+        return Measurement(seconds=seconds, syscalls=None, bytes=None)
+    return Measurement(
+        seconds=seconds,
+        syscalls=sum(after[k] - before[k] for k in ("syscr", "syscw")),
+        bytes=sum(after[k] - before[k] for k in ("rchar", "wchar")),
+    )
+
+
+def report(name: str, measurements: Dict[str, Measurement], iterations: int) -> None:
+    """
+    Prints the measurements of the implementations of a benchmark, per iteration.
+    """
+    print(f"{name} ({iterations} iterations)")
+    for implementation, m in measurements.items():
+        line = f"  {implementation:<10} {m.seconds / iterations * 1e6:10.1f} us"
+        if m.syscalls is not None and m.bytes is not None:
+            line += f" {m.syscalls / iterations:8.1f} syscalls {m.bytes / iterations:10.0f} bytes"
+        print(line)
+
+
+def t8n_inputs(accounts: int) -> Dict[str, Any]:
+    """
+    Returns synthetic inputs of a state transition with the given number of accounts.
+    """
+    alloc = {
+        f"0x{i:040x}": {
+            "balance": hex(10**18 + i),
+            "nonce": "0x1",
+            "code": "0x" + "60016000" * 8,
+            "storage": {hex(j): hex(j + 1) for j in range(4)},
+        }
+        for i in range(accounts)
+    }
+    env = {
+        "currentCoinbase": "0x" + "ba" * 20,
+        "currentGasLimit": "0x016345785d8a0000",
+        "currentNumber": "0x1",
+        "currentTimestamp": "0x3e8",
+    }
+    return {"alloc": alloc, "env": env, "txs": []}
+
+
+def emulate_tool(directory: str, inputs: Dict[str, Any]) -> None:
+    """
+    Writes the output files a file-based `t8n` tool would write.
+    """
+    for name, contents in (("output_alloc.json", inputs["alloc"]), ("output_result.json", {})):
+        with open(os.path.join(directory, name), "w") as f:
+            json.dump(contents, f)
+
+
+def t8n_io_temporary_directory(inputs: Dict[str, Any]) -> None:
+    """
+    File exchange with a new temporary directory, indented inputs and outputs rewritten in
+    place, as previously done by `EvmOneTransitionTool`.
+    """
+    temp_dir = tempfile.TemporaryDirectory()
+    for key, val in inputs.items():
+        with open(os.path.join(temp_dir.name, f"input_{key}.json"), "w") as f:
+            json.dump(val, f, ensure_ascii=False, indent=4)
+    emulate_tool(temp_dir.name, inputs)
+    for name in ("output_alloc.json", "output_result.json"):
+        with open(os.path.join(temp_dir.name, name), "r+") as file:
+            contents = json.load(file)
+            file.seek(0)
+            json.dump(contents, file, ensure_ascii=False, indent=4)
+            file.truncate()
+    temp_dir.cleanup()
+
+
+def t8n_io_scratch(pool: ScratchDirectoryPool, inputs: Dict[str, Any]) -> None:
+    """
+    File exchange with a reused scratch directory and compact inputs.
+    """
+    with pool.directory() as directory:
+        for key, val in inputs.items():
+            write_json_file(val, os.path.join(directory, f"input_{key}.json"))
+        emulate_tool(directory, inputs)
+        for name in ("output_alloc.json", "output_result.json"):
+            read_json_file(os.path.join(directory, name))
+
+
+def benchmark_t8n_io(iterations: int, accounts: int) -> None:
+    """
+    Compares the file exchange of file-based `t8n` tools.
+    """
+    inputs = t8n_inputs(accounts)
+    pool = ScratchDirectoryPool()
+    try:
+        measurements = {
+            "tempdir": measure(lambda: t8n_io_temporary_directory(inputs), iterations),
+            "scratch": measure(lambda: t8n_io_scratch(pool, inputs), iterations),
+        }
+    finally:
+        pool.close()
+    report(f"t8n-io, {accounts} accounts", measurements, iterations)
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """
+    Returns the peak memory allocated while running the function.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def python_encoder_dump(inputs: Dict[str, Any], stream: Any, chunk_size: int) -> None:
+    """
+    Writes the inputs encoded by the pure-Python `json.JSONEncoder.iterencode` in chunks, as
+    `JSONCodec` previously did.
+    """
+    parts: List[str] = []
+    size = 0
+    for part in json.JSONEncoder(separators=(",", ":")).iterencode(inputs):
+        parts.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            stream.write("".join(parts).encode())
+            parts = []
+            size = 0
+    if parts:
+        stream.write("".join(parts).encode())
+
+
+def benchmark_t8n_stdin(iterations: int, accounts_list: List[int]) -> None:
+    """
+    Compares the encoding of the `t8n` stdin, by the pure-Python or the C JSON encoder.
+    """
+    codec = JSONCodec()
+    with open(os.devnull, "wb") as sink:
+        for accounts in accounts_list:
+            inputs = t8n_inputs(accounts)
+            measurements = {
+                "python": measure(
+                    lambda: python_encoder_dump(inputs, sink, codec.chunk_size), iterations
+                ),
+                "c": measure(lambda: codec.dump(inputs, sink), iterations),
+            }
+            report(f"t8n-stdin, {accounts} accounts", measurements, iterations)
+
+
+class ReflectiveJSONEncoder(JSONEncoder):
+    """
+    JSON encoder walking the fields of every dataclass instance, as `JSONEncoder.default`
+    previously did.
+    """
+
+    def default(self, obj: Any) -> Any:
+        """
+        Encodes dataclass instances field by field, and other objects as `JSONEncoder`.
+        """
+        if callable(getattr(obj, "__json__", False)) or not is_dataclass(obj):
+            return super().default(obj)
+        result: Dict[str, Any] = {}
+        for object_field in fields(obj):
+            field_settings = object_field.metadata.get("json_encoder")
+            assert isinstance(field_settings, self.Field)
+            field_settings.apply(self, result, object_field.name, getattr(obj, object_field.name))
+        return result
+
+
+def fixture_objects(txs: int) -> List[Any]:
+    """
+    Returns the header, environment and transactions of a synthetic block.
+    """
+    header = FixtureHeader(
+        parent_hash=Hash(1),
+        ommers_hash=Hash(2),
+        coinbase=Address(0xBA),
+        state_root=Hash(3),
+        transactions_root=Hash(4),
+        receipt_root=Hash(5),
+        bloom=Bloom(0),
+        difficulty=0,
+        number=1,
+        gas_limit=30_000_000,
+        gas_used=21_000 * txs,
+        timestamp=1000,
+        extra_data=Bytes([0]),
+        mix_digest=Hash(0),
+        nonce=HeaderNonce(0),
+        base_fee=7,
+        withdrawals_root=Hash(6),
+        hash=Hash(7),
+    )
+    env = Environment(number=1, timestamp=1000, base_fee=7, withdrawals=[])
+    transactions = [
+        FixtureTransaction.from_transaction(
+            Transaction(
+                ty=2,
+                nonce=i,
+                to=Address(0x1000 + i),
+                value=10**18,
+                data=Bytes(b"\x01" * 68),
+                gas_limit=100_000,
+                max_fee_per_gas=10,
+                max_priority_fee_per_gas=1,
+                v=0,
+                r=1,
+                s=2,
+            )
+        )
+        for i in range(txs)
+    ]
+    return [header, env, transactions]
+
+
+def benchmark_json_encode(iterations: int, txs: int) -> None:
+    """
+    Compares the encoding of the fixture objects, field by field or by compiled encoders.
+    """
+    objects = fixture_objects(txs)
+    reflective, compiled = ReflectiveJSONEncoder(), JSONEncoder()
+    assert reflective.default(objects) == compiled.default(objects)
+    measurements = {
+        "reflective": measure(lambda: reflective.default(objects), iterations),
+        "compiled": measure(lambda: compiled.default(objects), iterations),
+    }
+    report(f"json-encode, {txs} transactions", measurements, iterations)
+
+
+def reduce_copy(obj: Any, deep: bool) -> Any:
+    """
+    Copies an object through the pickling protocol, as `copy` and `deepcopy` do for objects
+    without `__copy__` and `__deepcopy__` methods.
+    """
+    return copy._reconstruct(obj, {} if deep else None, *obj.__reduce_ex__(4))  # type: ignore
+
+
+def benchmark_dataclass_copy(iterations: int, txs: int) -> None:
+    """
+    Compares the copies of the fixture objects through the pickling protocol and attribute by
+    attribute, and reports the memory used by the objects.
+    """
+    header, env, transactions = fixture_objects(txs)
+    objects = [header, env, *transactions]
+    measurements = {
+        "reduce": measure(lambda: [reduce_copy(o, False) for o in objects], iterations),
+        "slots": measure(lambda: [copy.copy(o) for o in objects], iterations),
+        "deep/reduce": measure(lambda: [reduce_copy(o, True) for o in objects], iterations),
+        "deep/slots": measure(lambda: [copy.deepcopy(o) for o in objects], iterations),
+    }
+    report(f"dataclass-copy, {txs} transactions", measurements, iterations)
+    print(f"  {peak_memory(lambda: fixture_objects(txs)) / txs:.0f} bytes per transaction")
+
+
+class ComparedMemoTransaction(Transaction):
+    """
+    Transaction memoizing its encodings along with the values of its fields, compared and
+    copied on every access, as `Transaction.memoized` previously did.
+    """
+
+    __slots__ = ("compared_memo",)
+    __setattr__ = object.__setattr__  # type: ignore
+
+    def memoized(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the memoized value of `name`, unless the value of a field changed since.
+        """
+        state = attrgetter(*sorted(f.name for f in fields(self) if f.name != "memo"))(self)
+        memo: Optional[Tuple[Any, Dict[str, Any]]] = getattr(self, "compared_memo", None)
+        if memo is None or memo[0] != state:
+            memo = (copy.deepcopy(state), {})
+            object.__setattr__(self, "compared_memo", memo)
+        if name not in memo[1]:
+            memo[1][name] = compute()
+        return memo[1][name]
+
+
+def benchmark_tx_memo(iterations: int) -> None:
+    """
+    Compares the construction of a type-3 transaction followed by the accesses to its
+    encodings made while filling a block, computed on every access, memoized while its fields
+    compare equal, or memoized until one of its fields is assigned.
+    """
+    kwargs: Dict[str, Any] = dict(
+        ty=3,
+        nonce=1,
+        to=Address(0x1000),
+        data=Bytes(b"\x01" * 68),
+        gas_limit=100_000,
+        max_fee_per_gas=10,
+        max_priority_fee_per_gas=1,
+        max_fee_per_blob_gas=30,
+        blob_versioned_hashes=[Hash(i) for i in range(6)],
+        access_list=[AccessList(address=Address(i), storage_keys=[Hash(i)]) for i in range(4)],
+        v=0,
+        r=1,
+        s=2,
+    )
+
+    def computed() -> None:
+        tx = ComparedMemoTransaction(**kwargs)
+        tx.compute_signing_bytes()
+        tx.compute_payload_body()
+        tx.compute_serialized_bytes()
+        tx.compute_serialized_bytes()
+
+    def memoized(cls: Type[Transaction]) -> None:
+        tx = cls(**kwargs)
+        tx.signing_bytes()
+        tx.payload_body()
+        tx.serialized_bytes()
+        tx.serialized_bytes()
+
+    assert (
+        Transaction(**kwargs).serialized_bytes()
+        == ComparedMemoTransaction(**kwargs).serialized_bytes()
+    )
+    measurements = {
+        "compute": measure(computed, iterations),
+        "compared": measure(lambda: memoized(ComparedMemoTransaction), iterations),
+        "assigned": measure(lambda: memoized(Transaction), iterations),
+    }
+    report("tx-memo, type-3 transaction", measurements, iterations)
+
+
+def benchmark_sign(iterations: int, txs: int, workers_list: List[int]) -> None:
+    """
+    Compares the signature of the transactions of a block one by one and by threads and
+    processes, for every number of workers.
+    """
+    transactions = [Transaction(nonce=i, to=Address(0x1000 + i)) for i in range(txs)]
+
+    def sign(workers: int, processes: bool = False) -> None:
+        # Every transaction of the block is signed for the first time.
+        sign_transaction.cache_clear()
+        sign_transactions(transactions, workers=workers, processes=processes)
+
+    measurements = {"serial": measure(lambda: sign(1), iterations)}
+    for workers in workers_list:
+        measurements[f"threads/{workers}"] = measure(lambda: sign(workers), iterations)
+        measurements[f"procs/{workers}"] = measure(lambda: sign(workers, True), iterations)
+    report(f"sign, {txs} transactions, {os.cpu_count()} CPUs", measurements, iterations)
+
+
+def uint_wrapped(value: Any) -> Any:
+    """
+    Wraps the integers of a value in `Uint`, as required by `ethereum.rlp`.
+    """
+    if isinstance(value, list):
+        return [uint_wrapped(v) for v in value]
+    if isinstance(value, int):
+        return Uint(value)
+    return value
+
+
+def eth_rlp_build(header: FixtureHeader, txs: List[Any]) -> Tuple[bytes, bytes]:
+    """
+    Encodes the transactions and the block with `ethereum.rlp`, and the header again for its
+    hash, as `FixtureHeader.build` previously did.
+    """
+    header_list = uint_wrapped(header.to_serializable_list())
+    tx_list = [bytes([tx.ty]) + eth_rlp.encode(uint_wrapped(tx.payload_body())) for tx in txs]
+    block = [header_list, tx_list, [], []]
+    return eth_rlp.encode(block), keccak256(eth_rlp.encode(header_list))
+
+
+def benchmark_rlp(iterations: int, txs: int) -> None:
+    """
+    Compares the encoding of a block with `ethereum.rlp` and with the specialized encoder.
+    """
+    header, _, transactions = fixture_objects(txs)
+
+    def build() -> Tuple[bytes, bytes]:
+        # The memoized encodings of the transactions are not reused across iterations.
+        for tx in transactions:
+            tx.memo = None
+        return header.build(txs=transactions, ommers=[], withdrawals=[])
+
+    assert eth_rlp_build(header, transactions) == build()
+    measurements = {
+        "eth_rlp": measure(lambda: eth_rlp_build(header, transactions), iterations),
+        "rlp": measure(build, iterations),
+    }
+    report(f"rlp, {txs} transactions", measurements, iterations)
+
+
+def benchmark_keccak(iterations: int, count: int, size: int) -> None:
+    """
+    Compares the Keccak-256 backends, hashing byte strings one at a time and in batches.
+    """
+    inputs = [i.to_bytes(8, "big") * (size // 8) for i in range(count)]
+    backends = available_keccak_backends()
+    expected = [bytes(keccak256(data)) for data in inputs]
+    measurements = {}
+    for backend in backends:
+        assert backend.keccak256_many(inputs) == expected, backend.name
+        measurements[backend.name] = measure(
+            lambda: [backend.keccak256(data) for data in inputs], iterations
+        )
+        measurements[f"{backend.name}/many"] = measure(
+            lambda: backend.keccak256_many(inputs), iterations
+        )
+    report(
+        f"keccak, {count} x {size} bytes, selected: {backends[0].name}", measurements, iterations
+    )
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    Main function.
+
+    Returns:
+        None.
+    """
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    t8n_io = subparsers.add_parser("t8n-io", help="File exchange of file-based t8n tools.")
+    t8n_io.add_argument("--iterations", type=int, default=1000)
+    t8n_io.add_argument("--accounts", type=int, default=100)
+
+    t8n_stdin = subparsers.add_parser("t8n-stdin", help="Encoding of the t8n stdin.")
+    t8n_stdin.add_argument("--iterations", type=int, default=100)
+    t8n_stdin.add_argument("--accounts", type=int, nargs="+", default=[100, 1000, 10000])
+
+    json_encode = subparsers.add_parser(
+        "json-encode", help="JSON encoding of the fixture dataclasses."
+    )
+    json_encode.add_argument("--iterations", type=int, default=1000)
+    json_encode.add_argument("--txs", type=int, default=100)
+
+    dataclass_copy = subparsers.add_parser(
+        "dataclass-copy", help="Copies and memory of the fixture dataclasses."
+    )
+    dataclass_copy.add_argument("--iterations", type=int, default=100)
+    dataclass_copy.add_argument("--txs", type=int, default=100)
+
+    sign = subparsers.add_parser("sign", help="Signature of the transactions of a block.")
+    sign.add_argument("--iterations", type=int, default=10)
+    sign.add_argument("--txs", type=int, default=512)
+    sign.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+
+    rlp = subparsers.add_parser("rlp", help="RLP encoding of a block.")
+    rlp.add_argument("--iterations", type=int, default=1000)
+    rlp.add_argument("--txs", type=int, default=100)
+
+    tx_memo = subparsers.add_parser("tx-memo", help="Memoized encodings of a transaction.")
+    tx_memo.add_argument("--iterations", type=int, default=10000)
+
+    keccak = subparsers.add_parser("keccak", help="Keccak-256 hashing backends.")
+    keccak.add_argument("--iterations", type=int, default=100)
+    keccak.add_argument("--count", type=int, default=1000)
+    keccak.add_argument("--size", type=int, default=64)
+
+    parsed = parser.parse_args(args)
+    if parsed.benchmark == "t8n-io":
+        benchmark_t8n_io(parsed.iterations, parsed.accounts)
+    elif parsed.benchmark == "t8n-stdin":
+        benchmark_t8n_stdin(parsed.iterations, parsed.accounts)
+    elif parsed.benchmark == "json-encode":
+        benchmark_json_encode(parsed.iterations, parsed.txs)
+    elif parsed.benchmark == "dataclass-copy":
+        benchmark_dataclass_copy(parsed.iterations, parsed.txs)
+    elif parsed.benchmark == "sign":
+        benchmark_sign(parsed.iterations, parsed.txs, parsed.workers)
+    elif parsed.benchmark == "rlp":
+        benchmark_rlp(parsed.iterations, parsed.txs)
+    elif parsed.benchmark == "tx-memo":
+        benchmark_tx_memo(parsed.iterations)
+    elif parsed.benchmark == "keccak":
+        benchmark_keccak(parsed.iterations, parsed.count, parsed.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Replays a corpus of captured transition tool calls against one or more `t8n` binaries.
+
+example: Usage
+    ```
+    fill --t8n-capture-dir corpus --t8n-capture-threshold 0.5
+    python t8n_replay.py corpus --evm-bin evm --evm-bin evmone-t8n --concurrency 8
+    # or using the entry point
+    t8n_replay corpus --evm-bin evm --evm-bin evmone-t8n --concurrency 8
+    ```
+
+Every call of the corpus is evaluated by every binary, with the given number of calls in
+flight at the same time, and the throughput and latency distribution of each binary are
+reported per fork. Replayed calls bypass any cache, so that the tools are compared on the
+same work.
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from evm_transition_tool import TransitionTool
+from evm_transition_tool.corpus import CorpusEntry, read_corpus
+from evm_transition_tool.metrics import percentiles
+
+
+def replay_entry(t8n: TransitionTool, entry: CorpusEntry) -> Tuple[float, Optional[str]]:
+    """
+    Evaluates a captured call and returns its latency and the error it raised, if any.
+    """
+    start = time.perf_counter()
+    try:
+        t8n.evaluate(**entry.evaluate_arguments())
+        error = None
+    except Exception as e:
+        error = str(e)
+    return time.perf_counter() - start, error
+
+
+def replay(
+    binary: Path, entries: List[CorpusEntry], *, concurrency: int, repeat: int
+) -> Dict[str, Any]:
+    """
+    Replays the calls against a binary and returns its throughput and latencies per fork.
+    """
+    t8n = TransitionTool.from_binary_path(binary_path=binary)
+    calls = entries * repeat
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            results = list(executor.map(lambda entry: replay_entry(t8n, entry), calls))
+        seconds = time.perf_counter() - start
+    finally:
+        t8n.shutdown()
+
+    forks: Dict[str, List[Tuple[float, Optional[str]]]] = {}
+    for entry, result in zip(calls, results):
+        forks.setdefault(entry.fork_name, []).append(result)
+    return {
+        "binary": str(binary),
+        "version": t8n.version(),
+        "calls": len(calls),
+        "errors": sum(1 for _, error in results if error is not None),
+        "seconds": seconds,
+        "throughput": len(calls) / seconds if seconds else 0.0,
+        "forks": {
+            fork: {
+                "errors": sum(1 for _, error in fork_results if error is not None),
+                "latency": percentiles([latency for latency, _ in fork_results]),
+            }
+            for fork, fork_results in sorted(forks.items())
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """
+    Prints the replay results of a binary.
+    """
+    print(f"{report['binary']} ({report['version']})")
+    print(
+        f"  {report['calls']} calls, {report['errors']} errors in {report['seconds']:.2f} s, "
+        f"{report['throughput']:.1f} calls/s"
+    )
+    print(f"  {'fork':<24} {'calls':>7} {'errors':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for fork, stats in report["forks"].items():
+        latency = stats["latency"]
+        columns = "".join(f" {latency[k] * 1000:7.1f}ms" for k in ("p50", "p90", "p99", "max"))
+        print(f"  {fork:<24} {latency['count']:>7} {stats['errors']:>7}{columns}")
+
+
+def main(args: Optional[List[str]] = None):
+    """
+    Main function.
+
+    Returns:
+        None.
+    """
+    parser = argparse.ArgumentParser(description="Replay captured t8n calls.")
+    parser.add_argument(
+        "corpus", type=Path, nargs="+", help="Corpus files or directories to replay."
+    )
+    parser.add_argument(
+        "--evm-bin",
+        dest="evm_bins",
+        type=Path,
+        action="append",
+        required=True,
+        help="Transition tool binary to replay the corpus against; can be repeated.",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Number of calls in flight at the same time."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Number of times every call is replayed."
+    )
+    parser.add_argument(
+        "--json", dest="json_output", type=Path, default=None, help="Also write the report here."
+    )
+    parsed = parser.parse_args(args)
+
+    entries = list(read_corpus(parsed.corpus))
+    if not entries:
+        parser.error("the corpus is empty")
+    print(f"Replaying {len(entries)} captured calls")
+    reports = []
+    for binary in parsed.evm_bins:
+        report = replay(binary, entries, concurrency=parsed.concurrency, repeat=parsed.repeat)
+        print_report(report)
+        reports.append(report)
+    if parsed.json_output is not None:
+        with open(parsed.json_output, "w") as f:
+            json.dump(reports, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
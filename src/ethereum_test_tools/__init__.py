@@ -31,17 +31,19 @@ from .common import (
     copy_opcode_cost,
     cost_memory_bytes,
     eip_2028_transaction_data_cost,
+    sign_transactions,
     to_address,
     to_hash,
     to_hash_bytes,
 )
-from .filling.fill import fill_test
+from .filling.fill import fill_test, fill_test_async
 from .reference_spec import ReferenceSpec, ReferenceSpecTypes
 from .spec import (
     BaseTest,
     BaseTestConfig,
     BlockchainTest,
     BlockchainTestFiller,
+    GenesisCache,
     StateTest,
     StateTestFiller,
 )
@@ -64,6 +66,7 @@ __all__ = (
     "Environment",
     "Fixture",
     "FixtureEngineNewPayload",
+    "GenesisCache",
     "Header",
     "HistoryStorageAddress",
     "Initcode",
@@ -93,6 +96,8 @@ __all__ = (
     "eip_2028_transaction_data_cost",
     "eip_2028_transaction_data_cost",
     "fill_test",
+    "fill_test_async",
+    "sign_transactions",
     "to_address",
     "to_hash_bytes",
     "to_hash",
@@ -10,6 +10,7 @@ from subprocess import PIPE, run
 from typing import Mapping, Optional, Sized, SupportsBytes, Tuple, Type, Union
 
 from ethereum_test_forks import Fork
+from evm_transition_tool.probe import probe
 
 from ..common.conversions import to_bytes
 from .code import Code
@@ -125,12 +126,8 @@ class Yul(SupportsBytes, Sized):
         """
         Return solc's version string
         """
-        result = run(
-            [self.binary, "--version"],
-            stdout=PIPE,
-            stderr=PIPE,
-        )
-        solc_output = result.stdout.decode().split("\n")
+        result = probe([self.binary, "--version"])
+        solc_output = result.stdout.split("\n")
         version_pattern = r"0\.\d+\.\d+\+\S+"
         solc_version_string = None
         for line in solc_output:
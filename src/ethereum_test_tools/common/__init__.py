@@ -25,6 +25,7 @@ from .helpers import (
     to_hash,
     to_hash_bytes,
 )
+from .trie import Trie, state_root, withdrawals_root
 from .types import (
     AccessList,
     Account,
@@ -50,6 +51,7 @@ from .types import (
     ZeroPaddedHexNumber,
     alloc_to_accounts,
     serialize_transactions,
+    sign_transactions,
     str_or_none,
     to_json,
 )
@@ -85,6 +87,7 @@ __all__ = (
     "TestPrivateKey",
     "TestPrivateKey2",
     "Transaction",
+    "Trie",
     "Withdrawal",
     "ZeroPaddedHexNumber",
     "add_kzg_version",
@@ -96,9 +99,12 @@ __all__ = (
     "cost_memory_bytes",
     "eip_2028_transaction_data_cost",
     "serialize_transactions",
+    "sign_transactions",
+    "state_root",
     "str_or_none",
     "to_address",
     "to_hash_bytes",
     "to_hash",
     "to_json",
+    "withdrawals_root",
 )
@@ -0,0 +1,260 @@
+"""
+Keccak-256 and SHA-256 hashing of the addresses, transactions, headers and trie nodes built by
+the framework.
+
+The Keccak-256 backend is selected at import: the first of `KECCAK_BACKENDS`, ordered from
+the fastest, that is installed and hashes a known vector correctly. Every backend produces the
+same digests, which are compared by `micro_benchmarks keccak`; `select_keccak_backend` can be
+used to choose another one.
+
+`keccak256_many` and `sha256_many` hash a batch of byte strings, reusing the same hashing
+state for the whole batch where the backend allows it.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from threading import local
+from typing import Any, Iterable, List, Optional, Tuple, Type
+
+KECCAK256_EMPTY = bytes.fromhex("c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470")
+
+PYCRYPTODOME_RAW_VERSIONS = ((3, 12), (4, 0))
+"""
+Range of `pycryptodome` versions whose private Keccak library interface is used by
+`PycryptodomeRawBackend`, from the first version checked to the first version excluded.
+"""
+
+
+class KeccakBackend(ABC):
+    """
+    Implementation of Keccak-256 by a hashing library.
+
+    Instantiating a backend whose library is not installed raises `ImportError`.
+    """
+
+    name: str
+
+    @abstractmethod
+    def keccak256(self, data: bytes) -> bytes:
+        """
+        Returns the Keccak-256 digest of a byte string.
+        """
+        pass
+
+    def keccak256_many(self, data: Iterable[bytes]) -> List[bytes]:
+        """
+        Returns the Keccak-256 digests of byte strings, in order.
+        """
+        keccak256 = self.keccak256
+        return [keccak256(d) for d in data]
+
+
+class Pysha3Backend(KeccakBackend):
+    """
+    Keccak-256 of `pysha3`, a single C call per digest.
+    """
+
+    name = "pysha3"
+
+    def __init__(self) -> None:
+        from sha3 import keccak_256  # type: ignore
+
+        self.keccak_256 = keccak_256
+
+    def keccak256(self, data: bytes) -> bytes:
+        """
+        Returns the Keccak-256 digest of a byte string.
+        """
+        return self.keccak_256(data).digest()
+
+
+class PycryptodomeRawBackend(KeccakBackend):
+    """
+    Keccak-256 of the C library of `pycryptodome`, called directly with one hashing state per
+    thread, reset between the digests, instead of allocating a hash object for every digest.
+
+    The library is private to `pycryptodome`, so the backend is only available for the
+    versions in `PYCRYPTODOME_RAW_VERSIONS`, and `PycryptodomeBackend` is used otherwise.
+    """
+
+    name = "pycryptodome-raw"
+
+    def __init__(self) -> None:
+        import Crypto  # type: ignore
+
+        first, excluded = PYCRYPTODOME_RAW_VERSIONS
+        if not first <= tuple(Crypto.version_info[:2]) < excluded:
+            raise ImportError(f"unsupported pycryptodome version: {Crypto.__version__}")
+
+        from Crypto.Hash.keccak import _raw_keccak_lib  # type: ignore
+        from Crypto.Util._raw_api import ffi  # type: ignore
+
+        self.lib = _raw_keccak_lib
+        self.ffi = ffi
+        self.states = local()
+
+    def state(self) -> Tuple[Any, Any, Any]:
+        """
+        Returns the hashing state of the current thread, the digest buffer it squeezes into and
+        a view of that buffer.
+        """
+        try:
+            return self.states.state
+        except AttributeError:
+            pointer = self.ffi.new("void **")
+            # Keccak-256: a capacity of 64 bytes and 24 rounds.
+            if self.lib.keccak_init(pointer, 64, 24):
+                raise RuntimeError("failed to initialize the keccak state")
+            digest = self.ffi.new("uint8_t[32]")
+            state = (
+                self.ffi.gc(pointer[0], self.lib.keccak_destroy),
+                digest,
+                self.ffi.buffer(digest),
+            )
+            self.states.state = state
+            return state
+
+    def keccak256(self, data: bytes) -> bytes:
+        """
+        Returns the Keccak-256 digest of a byte string.
+        """
+        state, digest, buffer = self.state()
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self.lib.keccak_reset(state)
+        self.lib.keccak_absorb(state, data, len(data))
+        self.lib.keccak_digest(state, digest, 32, 0x01)
+        return buffer[:]
+
+    def keccak256_many(self, data: Iterable[bytes]) -> List[bytes]:
+        """
+        Returns the Keccak-256 digests of byte strings, in order, all computed with the hashing
+        state of the current thread.
+        """
+        state, digest, buffer = self.state()
+        reset, absorb, squeeze = (
+            self.lib.keccak_reset,
+            self.lib.keccak_absorb,
+            self.lib.keccak_digest,
+        )
+        digests = []
+        for d in data:
+            if not isinstance(d, bytes):
+                d = bytes(d)
+            reset(state)
+            absorb(state, d, len(d))
+            squeeze(state, digest, 32, 0x01)
+            digests.append(buffer[:])
+        return digests
+
+
+class PycryptodomeBackend(KeccakBackend):
+    """
+    Keccak-256 of the public interface of `pycryptodome`.
+    """
+
+    name = "pycryptodome"
+
+    def __init__(self) -> None:
+        from Crypto.Hash import keccak  # type: ignore
+
+        self.new = keccak.new
+
+    def keccak256(self, data: bytes) -> bytes:
+        """
+        Returns the Keccak-256 digest of a byte string.
+        """
+        return self.new(data=data, digest_bits=256).digest()
+
+
+class EthereumBackend(KeccakBackend):
+    """
+    Keccak-256 of the execution specs, `ethereum.crypto.hash.keccak256`.
+    """
+
+    name = "ethereum"
+
+    def __init__(self) -> None:
+        from ethereum.crypto.hash import keccak256
+
+        self.ethereum_keccak256 = keccak256
+
+    def keccak256(self, data: bytes) -> bytes:
+        """
+        Returns the Keccak-256 digest of a byte string.
+        """
+        return bytes(self.ethereum_keccak256(data))
+
+
+KECCAK_BACKENDS: List[Type[KeccakBackend]] = [
+    Pysha3Backend,
+    PycryptodomeRawBackend,
+    PycryptodomeBackend,
+    EthereumBackend,
+]
+
+
+def available_keccak_backends() -> List[KeccakBackend]:
+    """
+    Returns the Keccak-256 backends that are installed and hash a known vector correctly,
+    fastest first.
+    """
+    backends = []
+    for backend_class in KECCAK_BACKENDS:
+        try:
+            backend = backend_class()
+            if backend.keccak256(b"") == KECCAK256_EMPTY:
+                backends.append(backend)
+        except Exception:
+            # Not installed, or an incompatible version of the library.
+            continue
+    return backends
+
+
+def select_keccak_backend(name: Optional[str] = None) -> KeccakBackend:
+    """
+    Selects the Keccak-256 backend used by `keccak256` and `keccak256_many`: the one with the
+    given name, or else the fastest available one.
+    """
+    global keccak_backend
+    backends = available_keccak_backends()
+    if name is not None:
+        backends = [backend for backend in backends if backend.name == name]
+        if not backends:
+            raise ValueError(f"keccak backend not available: {name}")
+    if not backends:
+        raise ImportError("no keccak backend available")
+    keccak_backend = backends[0]
+    return keccak_backend
+
+
+keccak_backend: KeccakBackend = select_keccak_backend()
+
+
+def keccak256(data: bytes) -> bytes:
+    """
+    Returns the Keccak-256 digest of a byte string.
+    """
+    return keccak_backend.keccak256(data)
+
+
+def keccak256_many(data: Iterable[bytes]) -> List[bytes]:
+    """
+    Returns the Keccak-256 digests of byte strings, in order.
+    """
+    return keccak_backend.keccak256_many(data)
+
+
+def sha256(data: bytes) -> bytes:
+    """
+    Returns the SHA-256 digest of a byte string.
+    """
+    return hashlib.sha256(data).digest()
+
+
+def sha256_many(data: Iterable[bytes]) -> List[bytes]:
+    """
+    Returns the SHA-256 digests of byte strings, in order.
+    """
+    new = hashlib.sha256
+    return [new(d).digest() for d in data]
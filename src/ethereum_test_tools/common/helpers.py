@@ -4,10 +4,9 @@ Helper functions/classes used to generate Ethereum tests.
 
 from typing import List, SupportsBytes
 
-from ethereum.crypto.hash import keccak256
-from ethereum.rlp import encode
-
 from .conversions import BytesConvertible, FixedSizeBytesConvertible
+from .hashing import keccak256
+from .rlp import encode
 from .types import Address, Bytes, Hash
 
 """
@@ -6,7 +6,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from dataclasses import field as dataclass_field
 from dataclasses import fields, is_dataclass
-from typing import Any, Callable, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
 
 
 class SupportsJSON(ABC):
@@ -108,18 +109,7 @@ class JSONEncoder(json.JSONEncoder):
             return obj.__json__(encoder=self)
 
         elif is_dataclass(obj):
-            result: Dict[str, Any] = {}
-            for object_field in fields(obj):
-                field_name = object_field.name
-                metadata = object_field.metadata
-                value = getattr(obj, field_name)
-                assert metadata is not None, f"Field {field_name} has no metadata"
-                field_settings = metadata.get("json_encoder")
-                assert isinstance(field_settings, self.Field), (
-                    f"Field {field_name} has invalid json_encoder " f"metadata: {field_settings}"
-                )
-                field_settings.apply(self, result, field_name, value)
-            return result
+            return dataclass_encoder(obj if isinstance(obj, type) else type(obj))(self, obj)
 
         elif isinstance(obj, dict):
             return {self.default(k): self.default(v) for k, v in obj.items()}
@@ -134,6 +124,68 @@ class JSONEncoder(json.JSONEncoder):
             return super().default(obj)
 
 
+@lru_cache(maxsize=None)
+def dataclass_encoder(cls: type) -> Callable[[JSONEncoder, Any], Dict[str, Any]]:
+    """
+    Returns a function encoding the instances of a dataclass as `JSONEncoder.Field.apply`
+    would, field by field, compiled once from the `json_encoder` metadata of its fields.
+
+    The generated code only contains the branches of `JSONEncoder.Field.apply` that the
+    settings of each field can take, and reads the defaults and cast types from constants.
+    """
+    lines: List[str] = ["def encode(encoder, obj):", "    result = {}"]
+    constants: Dict[str, Any] = {}
+    for i, object_field in enumerate(fields(cls)):
+        field_name = object_field.name
+        metadata = object_field.metadata
+        assert metadata is not None, f"Field {field_name} has no metadata"
+        settings = metadata.get("json_encoder")
+        assert isinstance(settings, JSONEncoder.Field), (
+            f"Field {field_name} has invalid json_encoder " f"metadata: {settings}"
+        )
+        if settings.skip:
+            continue
+        key = repr(settings.name or field_name)
+
+        convert: List[str] = []
+        if settings.cast_type is not None:
+            constants[f"cast_{i}"] = settings.cast_type
+            convert.append(f"value = cast_{i}(value)")
+        if settings.to_json:
+            convert.append("value = encoder.default(value)")
+        elif not settings.skip_string_convert:
+            convert.append("value = str(value)")
+
+        lines.append(f"    value = obj.{field_name}")
+        if settings.default_value is not None:
+            constants[f"default_{i}"] = settings.default_value
+            lines.append("    if value is None:")
+            lines.append(f"        value = default_{i}")
+            lines += [f"    {line}" for line in convert]
+            lines.append(f"    result[{key}] = value")
+        elif settings.default_value_skip_cast is not None:
+            constants[f"default_{i}"] = settings.default_value_skip_cast
+            lines.append("    if value is None:")
+            lines.append(f"        result[{key}] = default_{i}")
+            lines.append("    else:")
+            lines += [f"        {line}" for line in convert]
+            lines.append(f"        result[{key}] = value")
+        elif settings.keep_none:
+            if convert:
+                lines.append("    if value is not None:")
+                lines += [f"        {line}" for line in convert]
+            lines.append(f"    result[{key}] = value")
+        else:
+            lines.append("    if value is not None:")
+            lines += [f"        {line}" for line in convert]
+            lines.append(f"        result[{key}] = value")
+    lines.append("    return result")
+
+    namespace: Dict[str, Any] = dict(constants)
+    exec(compile("\n".join(lines), f"<json encoder of {cls.__qualname__}>", "exec"), namespace)
+    return namespace["encode"]
+
+
 def field(*args, json_encoder: Optional[JSONEncoder.Field] = None, **kwargs) -> Any:
     """
     A wrapper around `dataclasses.field` that allows for json configuration info.
@@ -0,0 +1,80 @@
+"""
+Recursive Length Prefix (RLP) encoding of the headers, blocks, transactions and trie nodes
+built by the framework.
+
+Values are encoded as they are, without wrapper objects: integers, including `Number` and
+`ethereum.base_types.Uint`, byte strings, including `Bytes` and the fixed-size byte types,
+and lists and tuples of them. A value that is already encoded, e.g. the header of a block,
+whose hash is computed from its encoding, can be wrapped in `Encoded` to be included as it is
+in the encoding of the lists that contain it.
+
+For the values supported by both, the encoding is identical to `ethereum.rlp.encode`.
+"""
+
+from typing import Any, Sequence
+
+
+class Encoded(bytes):
+    """
+    RLP encoding of a value, included as it is in the encoding of the lists containing it.
+    """
+
+
+def encode_length(length: int, offset: int) -> bytes:
+    """
+    Returns the prefix of a byte string (`offset` 0x80) or of a list (`offset` 0xC0) of the
+    given length.
+    """
+    if length < 56:
+        return bytes((offset + length,))
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((offset + 55 + len(length_bytes),)) + length_bytes
+
+
+def encode_bytes(value: bytes) -> bytes:
+    """
+    Returns the encoding of a byte string.
+    """
+    if len(value) == 1 and value[0] < 0x80:
+        return bytes(value)
+    return encode_length(len(value), 0x80) + value
+
+
+def encode_int(value: int) -> bytes:
+    """
+    Returns the encoding of a non-negative integer, as its big-endian bytes without leading
+    zeros.
+    """
+    if value < 0x80:
+        if value < 0:
+            raise ValueError(f"cannot encode negative integer {value}")
+        return bytes((value,)) if value else b"\x80"
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return encode_length(len(data), 0x80) + data
+
+
+def encode_sequence(values: Sequence[Any]) -> bytes:
+    """
+    Returns the encoding of a list.
+    """
+    payload = b"".join([encode(value) for value in values])
+    return encode_length(len(payload), 0xC0) + payload
+
+
+def encode(value: Any) -> bytes:
+    """
+    Returns the RLP encoding of a value.
+    """
+    if isinstance(value, bytes):
+        if isinstance(value, Encoded):
+            return bytes(value)
+        return encode_bytes(bytes(value))
+    if isinstance(value, int):
+        return encode_int(value)
+    if isinstance(value, (list, tuple)):
+        return encode_sequence(value)
+    if isinstance(value, bytearray):
+        return encode_bytes(bytes(value))
+    if isinstance(value, str):
+        return encode_bytes(value.encode())
+    raise TypeError(f"cannot RLP encode {type(value).__name__}")
@@ -0,0 +1,365 @@
+"""
+Merkle Patricia Trie used to compute the state and withdrawals roots in-process.
+
+Nodes are immutable and memoize their encoding, so updating a trie only re-encodes the nodes
+on the path to the updated key, and copies of a trie share all their untouched nodes.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .constants import EmptyTrieRoot
+from .conversions import FixedSizeBytesConvertible
+from .hashing import keccak256, keccak256_many
+from .rlp import Encoded
+from .rlp import encode as rlp_encode
+from .types import Account, Address, Bytes, Number, Storage, Withdrawal
+
+
+def bytes_to_nibbles(key: bytes) -> bytes:
+    """
+    Splits every byte of the key into its high and low nibbles.
+    """
+    nibbles = bytearray(2 * len(key))
+    nibbles[0::2] = (b >> 4 for b in key)
+    nibbles[1::2] = (b & 0x0F for b in key)
+    return bytes(nibbles)
+
+
+def encode_nibbles(nibbles: bytes, is_leaf: bool) -> bytes:
+    """
+    Compact (hex-prefix) encoding of a node path.
+    """
+    flag = 2 if is_leaf else 0
+    if len(nibbles) % 2:
+        prefixed = bytes([flag + 1]) + nibbles
+    else:
+        prefixed = bytes([flag, 0]) + nibbles
+    return bytes(prefixed[i] << 4 | prefixed[i + 1] for i in range(0, len(prefixed), 2))
+
+
+def common_prefix_length(a: bytes, b: bytes) -> int:
+    """
+    Returns the length of the common prefix of two nibble paths.
+    """
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+class Node(ABC):
+    """
+    Base class of the trie nodes.
+    """
+
+    _encoded: Optional[bytes] = None
+    _hash: Optional[bytes] = None
+
+    @abstractmethod
+    def structure(self) -> List:
+        """
+        Returns the RLP structure of the node.
+        """
+        pass
+
+    def encoded(self) -> bytes:
+        """
+        Returns the RLP encoding of the node.
+        """
+        if self._encoded is None:
+            self._encoded = rlp_encode(self.structure())
+        return self._encoded
+
+    def hash(self) -> bytes:
+        """
+        Returns the hash of the node.
+        """
+        if self._hash is None:
+            self._hash = keccak256(self.encoded())
+        return self._hash
+
+    def reference(self) -> bytes:
+        """
+        Returns how the node is referenced by its parent: nodes whose encoding is shorter than
+        32 bytes are inlined, all others are referenced by their hash.
+        """
+        if len(self.encoded()) < 32:
+            return Encoded(self.encoded())
+        return self.hash()
+
+
+class Leaf(Node):
+    """
+    Node holding the value of the key ending with its path.
+    """
+
+    def __init__(self, path: bytes, value: bytes):
+        self.path = path
+        self.value = value
+
+    def structure(self) -> List:
+        """
+        Returns the RLP structure of the node.
+        """
+        return [encode_nibbles(self.path, True), self.value]
+
+
+class Extension(Node):
+    """
+    Node holding the path shared by all the keys below its child branch.
+    """
+
+    def __init__(self, path: bytes, child: Node):
+        self.path = path
+        self.child = child
+
+    def structure(self) -> List:
+        """
+        Returns the RLP structure of the node.
+        """
+        return [encode_nibbles(self.path, False), self.child.reference()]
+
+
+class Branch(Node):
+    """
+    Node with one child per nibble, and the value of the key ending at the node, if any.
+    """
+
+    def __init__(self, children: Sequence[Optional[Node]], value: bytes = b""):
+        self.children = tuple(children)
+        self.value = value
+
+    def structure(self) -> List:
+        """
+        Returns the RLP structure of the node.
+        """
+        return [b"" if c is None else c.reference() for c in self.children] + [self.value]
+
+
+def prepend_path(path: bytes, node: Optional[Node]) -> Optional[Node]:
+    """
+    Returns the node reached through the given path from its parent.
+    """
+    if node is None or not path:
+        return node
+    if isinstance(node, Leaf):
+        return Leaf(path + node.path, node.value)
+    if isinstance(node, Extension):
+        return Extension(path + node.path, node.child)
+    return Extension(path, node)
+
+
+def normalize_branch(children: List[Optional[Node]], value: bytes) -> Optional[Node]:
+    """
+    Returns the simplest node equivalent to a branch with the given children and value.
+    """
+    indexes = [i for i, c in enumerate(children) if c is not None]
+    if not indexes:
+        return Leaf(b"", value) if value else None
+    if len(indexes) == 1 and not value:
+        return prepend_path(bytes(indexes), children[indexes[0]])
+    return Branch(children, value)
+
+
+def insert(node: Optional[Node], path: bytes, value: bytes) -> Node:
+    """
+    Returns the node resulting of setting the value of the path below the given node.
+    """
+    if node is None:
+        return Leaf(path, value)
+
+    if isinstance(node, Branch):
+        if not path:
+            return Branch(node.children, value)
+        children = list(node.children)
+        children[path[0]] = insert(children[path[0]], path[1:], value)
+        return Branch(children, node.value)
+
+    assert isinstance(node, (Leaf, Extension))
+    common = common_prefix_length(node.path, path)
+    if isinstance(node, Leaf) and common == len(node.path) == len(path):
+        return Leaf(path, value)
+    if isinstance(node, Extension) and common == len(node.path):
+        return Extension(node.path, insert(node.child, path[common:], value))
+
+    # The paths diverge: split the node with a new branch.
+    branch_children: List[Optional[Node]] = [None] * 16
+    branch_value = b""
+    if isinstance(node, Leaf):
+        if common == len(node.path):
+            branch_value = node.value
+        else:
+            branch_children[node.path[common]] = Leaf(node.path[common + 1 :], node.value)
+    else:
+        branch_children[node.path[common]] = prepend_path(node.path[common + 1 :], node.child)
+    if common == len(path):
+        branch_value = value
+    else:
+        branch_children[path[common]] = Leaf(path[common + 1 :], value)
+    return prepend_path(path[:common], Branch(branch_children, branch_value))  # type: ignore
+
+
+def delete(node: Optional[Node], path: bytes) -> Optional[Node]:
+    """
+    Returns the node resulting of removing the path below the given node.
+    """
+    if node is None:
+        return None
+
+    if isinstance(node, Leaf):
+        return None if node.path == path else node
+
+    if isinstance(node, Extension):
+        if path[: len(node.path)] != node.path:
+            return node
+        child = delete(node.child, path[len(node.path) :])
+        if child is node.child:
+            return node
+        return prepend_path(node.path, child)
+
+    assert isinstance(node, Branch)
+    children = list(node.children)
+    value = node.value
+    if not path:
+        if not value:
+            return node
+        value = b""
+    else:
+        child = delete(children[path[0]], path[1:])
+        if child is children[path[0]]:
+            return node
+        children[path[0]] = child
+    return normalize_branch(children, value)
+
+
+class Trie:
+    """
+    Merkle Patricia Trie mapping byte keys to byte values.
+
+    Setting a key to an empty value removes it. If `secured` is set, keys are hashed before
+    insertion, as done for the state and storage tries.
+    """
+
+    root_node: Optional[Node]
+    secured: bool
+
+    def __init__(self, items: Mapping[bytes, bytes] = {}, *, secured: bool = False):
+        self.root_node = None
+        self.secured = secured
+        self.update(items)
+
+    def path(self, key: bytes) -> bytes:
+        """
+        Returns the nibble path of the given key.
+        """
+        return bytes_to_nibbles(keccak256(key) if self.secured else key)
+
+    def __setitem__(self, key: bytes, value: bytes):
+        """
+        Sets the value of the given key, or removes it if the value is empty.
+        """
+        if not value:
+            del self[key]
+            return
+        self.root_node = insert(self.root_node, self.path(key), value)
+
+    def update(self, items: Mapping[bytes, bytes]):
+        """
+        Sets the values of the given keys, hashing all the keys at once if the trie is secured.
+        """
+        keys = list(items)
+        paths = keccak256_many(keys) if self.secured else keys
+        for key, path in zip(keys, paths):
+            if items[key]:
+                self.root_node = insert(self.root_node, bytes_to_nibbles(path), items[key])
+            else:
+                self.root_node = delete(self.root_node, bytes_to_nibbles(path))
+
+    def __delitem__(self, key: bytes):
+        """
+        Removes the given key, if present.
+        """
+        self.root_node = delete(self.root_node, self.path(key))
+
+    def copy(self) -> "Trie":
+        """
+        Returns a copy of the trie that shares all its nodes with this one.
+        """
+        trie = Trie(secured=self.secured)
+        trie.root_node = self.root_node
+        return trie
+
+    def root(self) -> bytes:
+        """
+        Returns the root hash of the trie.
+        """
+        if self.root_node is None:
+            return EmptyTrieRoot
+        return self.root_node.hash()
+
+
+def storage_root(storage: Storage | Storage.StorageDictType | None) -> bytes:
+    """
+    Returns the root of the storage trie of an account; zero values are not stored.
+
+    Negative keys and values, accepted by `Storage`, are stored as their two's complement, as
+    they are passed to the transition tool.
+    """
+    if storage is None:
+        return EmptyTrieRoot
+    if not isinstance(storage, Storage):
+        storage = Storage(storage)
+    trie = Trie(
+        {
+            (key % 2**256).to_bytes(32, "big"): rlp_encode(value % 2**256)
+            for key, value in storage.data.items()
+            if value
+        },
+        secured=True,
+    )
+    return trie.root()
+
+
+def account_rlp(account: Account) -> bytes:
+    """
+    Returns the RLP encoding of an account as stored in the state trie.
+    """
+    return rlp_encode(
+        [
+            Number(account.nonce or 0),
+            Number(account.balance or 0),
+            storage_root(account.storage),
+            keccak256(Bytes(account.code or b"")),
+        ]
+    )
+
+
+def state_trie(alloc: Mapping[FixedSizeBytesConvertible, Account | Dict]) -> Trie:
+    """
+    Returns the state trie of the given allocation.
+    """
+    return Trie(
+        {
+            Address(address): account_rlp(Account.from_dict(account))
+            for address, account in alloc.items()
+        },
+        secured=True,
+    )
+
+
+def state_root(alloc: Mapping[FixedSizeBytesConvertible, Account | Dict]) -> bytes:
+    """
+    Returns the state root of the given allocation.
+    """
+    return state_trie(alloc).root()
+
+
+def withdrawals_root(withdrawals: Iterable[Withdrawal]) -> bytes:
+    """
+    Returns the root of the trie of withdrawals of a block, keyed by their position.
+    """
+    trie = Trie()
+    for i, withdrawal in enumerate(withdrawals):
+        trie[rlp_encode(i)] = rlp_encode(withdrawal.to_serializable_list())
+    return trie.root()
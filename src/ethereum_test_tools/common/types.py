@@ -1,9 +1,12 @@
 """
 Useful types for generating Ethereum tests.
 """
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from copy import copy, deepcopy
 from dataclasses import dataclass, fields, replace
-from itertools import count
+from functools import lru_cache
+from itertools import chain, count
 from typing import (
     Any,
     Callable,
@@ -22,9 +25,6 @@ from typing import (
 )
 
 from coincurve.keys import PrivateKey, PublicKey
-from ethereum import rlp as eth_rlp
-from ethereum.base_types import Uint
-from ethereum.crypto.hash import keccak256
 
 from ethereum_test_forks import Fork
 from evm_transition_tool import TransitionTool
@@ -41,7 +41,10 @@ from .conversions import (
     to_fixed_size_bytes,
     to_number,
 )
+from .hashing import keccak256
 from .json import JSONEncoder, SupportsJSON, field, to_json
+from .rlp import Encoded
+from .rlp import encode as rlp_encode
 
 
 # Sentinel classes
@@ -65,6 +68,49 @@ class Auto:
         return "auto"
 
 
+class StructuralCopy:
+    """
+    Base of the slotted dataclasses, copied attribute by attribute instead of through the
+    pickling protocol used by `copy` and `deepcopy` by default.
+    """
+
+    __slots__ = ()
+
+    def __copy__(self):
+        """
+        Returns a shallow copy of the instance.
+        """
+        cls: type = type(self)
+        new: StructuralCopy = object.__new__(cls)
+        for name in slot_names(cls):
+            object.__setattr__(new, name, getattr(self, name))
+        return new
+
+    def __deepcopy__(self, memo: Dict[int, Any]):
+        """
+        Returns a deep copy of the instance.
+        """
+        cls: type = type(self)
+        new: StructuralCopy = object.__new__(cls)
+        memo[id(self)] = new
+        for name in slot_names(cls):
+            object.__setattr__(new, name, deepcopy(getattr(self, name), memo))
+        return new
+
+
+@lru_cache(maxsize=None)
+def slot_names(cls: type) -> Tuple[str, ...]:
+    """
+    Returns the names of the slots of a class and of its base classes.
+    """
+    return tuple(
+        name
+        for base in reversed(cls.__mro__)
+        for name in base.__dict__.get("__slots__", ())
+        if name not in ("__dict__", "__weakref__")
+    )
+
+
 # Basic Types
 
 
@@ -512,8 +558,8 @@ class Storage(SupportsJSON):
                 raise Storage.KeyValueMismatch(address, key, 0, other.data[key])
 
 
-@dataclass(kw_only=True)
-class Account:
+@dataclass(kw_only=True, slots=True)
+class Account(StructuralCopy):
     """
     State associated with an address.
     """
@@ -772,8 +818,8 @@ def alloc_to_accounts(got_alloc: Dict[str, Any]) -> Mapping[str, Account]:
     return accounts
 
 
-@dataclass(kw_only=True)
-class Withdrawal:
+@dataclass(kw_only=True, slots=True)
+class Withdrawal(StructuralCopy):
     """
     Structure to represent a single withdrawal of a validator's balance from
     the beacon chain.
@@ -807,14 +853,14 @@ class Withdrawal:
         be serialized.
         """
         return [
-            Uint(Number(self.index)),
-            Uint(Number(self.validator)),
+            Number(self.index),
+            Number(self.validator),
             Address(self.address),
-            Uint(Number(self.amount)),
+            Number(self.amount),
         ]
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class FixtureWithdrawal(Withdrawal):
     """
     Structure to represent a single withdrawal of a validator's balance from
@@ -850,8 +896,8 @@ class FixtureWithdrawal(Withdrawal):
 DEFAULT_BASE_FEE = 7
 
 
-@dataclass(kw_only=True)
-class Environment:
+@dataclass(kw_only=True, slots=True)
+class Environment(StructuralCopy):
     """
     Structure used to keep track of the context in which a block
     must be executed.
@@ -1129,8 +1175,14 @@ class AccessList:
         return [Address(self.address), [Hash(k) for k in self.storage_keys]]
 
 
-@dataclass(kw_only=True)
-class Transaction:
+SIGNATURE_CACHE_SIZE = 2**16
+PARALLEL_SIGNING_THRESHOLD = 64
+SIGNING_CHUNK_SIZE = 16
+M = TypeVar("M")
+
+
+@dataclass(kw_only=True, slots=True)
+class Transaction(StructuralCopy):
     """
     Generic object that can represent all Ethereum transaction types.
     """
@@ -1294,6 +1346,18 @@ class Transaction:
             skip=True,
         ),
     )
+    memo: Optional[Dict[str, Any]] = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+        json_encoder=JSONEncoder.Field(
+            skip=True,
+        ),
+    )
+    """
+    Encodings of the transaction, memoized until one of its fields is assigned, see `memoized`.
+    """
 
     class InvalidFeePayment(Exception):
         """
@@ -1357,6 +1421,14 @@ class Transaction:
         if self.ty >= 2 and self.max_priority_fee_per_gas is None:
             self.max_priority_fee_per_gas = 0
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Sets a field of the transaction, discarding its memoized encodings.
+        """
+        object.__setattr__(self, name, value)
+        if name != "memo":
+            object.__setattr__(self, "memo", None)
+
     def with_error(self, error: str) -> "Transaction":
         """
         Create a copy of the transaction with an added error.
@@ -1385,10 +1457,31 @@ class Transaction:
                 raise ValueError(f"Invalid field '{key}' for Transaction")
         return tx
 
+    def memoized(self, name: str, compute: Callable[[], M]) -> M:
+        """
+        Returns the value computed by `compute` the last time the method `name` was called,
+        unless a field of the transaction was assigned since.
+
+        The memoized encodings are carried over to copies of the transaction. Fields modified
+        in place, such as a list appended to, are not detected: assign the field instead.
+        """
+        if self.memo is None:
+            self.memo = {}
+        values = self.memo
+        if name not in values:
+            values[name] = compute()
+        return values[name]
+
     def payload_body(self) -> List[Any]:
         """
         Returns the list of values included in the transaction body.
         """
+        return list(self.memoized("payload_body", self.compute_payload_body))
+
+    def compute_payload_body(self) -> List[Any]:
+        """
+        Computes the list of values included in the transaction body.
+        """
         if self.v is None or self.r is None or self.s is None:
             raise ValueError("signature must be set before serializing any tx type")
 
@@ -1423,20 +1516,20 @@ class Transaction:
 
                 return [
                     [
-                        Uint(self.chain_id),
-                        Uint(self.nonce),
-                        Uint(self.max_priority_fee_per_gas),
-                        Uint(self.max_fee_per_gas),
-                        Uint(self.gas_limit),
+                        self.chain_id,
+                        self.nonce,
+                        self.max_priority_fee_per_gas,
+                        self.max_fee_per_gas,
+                        self.gas_limit,
                         to,
-                        Uint(self.value),
+                        self.value,
                         Bytes(self.data),
                         [a.to_list() for a in self.access_list],
-                        Uint(self.max_fee_per_blob_gas),
+                        self.max_fee_per_blob_gas,
                         [Hash(h) for h in self.blob_versioned_hashes],
-                        Uint(self.v),
-                        Uint(self.r),
-                        Uint(self.s),
+                        self.v,
+                        self.r,
+                        self.s,
                     ],
                     self.blobs,
                     self.blob_kzg_commitments,
@@ -1444,20 +1537,20 @@ class Transaction:
                 ]
             else:
                 return [
-                    Uint(self.chain_id),
-                    Uint(self.nonce),
-                    Uint(self.max_priority_fee_per_gas),
-                    Uint(self.max_fee_per_gas),
-                    Uint(self.gas_limit),
+                    self.chain_id,
+                    self.nonce,
+                    self.max_priority_fee_per_gas,
+                    self.max_fee_per_gas,
+                    self.gas_limit,
                     to,
-                    Uint(self.value),
+                    self.value,
                     Bytes(self.data),
                     [a.to_list() for a in self.access_list],
-                    Uint(self.max_fee_per_blob_gas),
+                    self.max_fee_per_blob_gas,
                     [Hash(h) for h in self.blob_versioned_hashes],
-                    Uint(self.v),
-                    Uint(self.r),
-                    Uint(self.s),
+                    self.v,
+                    self.r,
+                    self.s,
                 ]
         elif self.ty == 2:
             # EIP-1559: https://eips.ethereum.org/EIPS/eip-1559
@@ -1468,18 +1561,18 @@ class Transaction:
             if self.access_list is None:
                 raise ValueError("access_list must be set for type 2 tx")
             return [
-                Uint(self.chain_id),
-                Uint(self.nonce),
-                Uint(self.max_priority_fee_per_gas),
-                Uint(self.max_fee_per_gas),
-                Uint(self.gas_limit),
+                self.chain_id,
+                self.nonce,
+                self.max_priority_fee_per_gas,
+                self.max_fee_per_gas,
+                self.gas_limit,
                 to,
-                Uint(self.value),
+                self.value,
                 Bytes(self.data),
                 [a.to_list() for a in self.access_list],
-                Uint(self.v),
-                Uint(self.r),
-                Uint(self.s),
+                self.v,
+                self.r,
+                self.s,
             ]
         elif self.ty == 1:
             # EIP-2930: https://eips.ethereum.org/EIPS/eip-2930
@@ -1489,32 +1582,32 @@ class Transaction:
                 raise ValueError("access_list must be set for type 1 tx")
 
             return [
-                Uint(self.chain_id),
-                Uint(self.nonce),
-                Uint(self.gas_price),
-                Uint(self.gas_limit),
+                self.chain_id,
+                self.nonce,
+                self.gas_price,
+                self.gas_limit,
                 to,
-                Uint(self.value),
+                self.value,
                 Bytes(self.data),
                 [a.to_list() for a in self.access_list],
-                Uint(self.v),
-                Uint(self.r),
-                Uint(self.s),
+                self.v,
+                self.r,
+                self.s,
             ]
         elif self.ty == 0:
             if self.gas_price is None:
                 raise ValueError("gas_price must be set for type 0 tx")
             # EIP-155: https://eips.ethereum.org/EIPS/eip-155
             return [
-                Uint(self.nonce),
-                Uint(self.gas_price),
-                Uint(self.gas_limit),
+                self.nonce,
+                self.gas_price,
+                self.gas_limit,
                 to,
-                Uint(self.value),
+                self.value,
                 Bytes(self.data),
-                Uint(self.v),
-                Uint(self.r),
-                Uint(self.s),
+                self.v,
+                self.r,
+                self.s,
             ]
 
         raise NotImplementedError(f"serialized_bytes not implemented for tx type {self.ty}")
@@ -1524,13 +1617,19 @@ class Transaction:
         Returns bytes of the serialized representation of the transaction,
         which is almost always RLP encoding.
         """
+        return self.memoized("serialized_bytes", self.compute_serialized_bytes)
+
+    def compute_serialized_bytes(self) -> bytes:
+        """
+        Computes the serialized representation of the transaction.
+        """
         if self.ty is None:
             raise ValueError("ty must be set for all tx types")
 
         if self.ty > 0:
-            return bytes([self.ty]) + eth_rlp.encode(self.payload_body())
+            return bytes([self.ty]) + rlp_encode(self.payload_body())
         else:
-            return eth_rlp.encode(self.payload_body())
+            return rlp_encode(self.payload_body())
 
     def signing_envelope(self) -> List[Any]:
         """
@@ -1551,16 +1650,16 @@ class Transaction:
             if self.blob_versioned_hashes is None:
                 raise ValueError("blob_versioned_hashes must be set for type 3 tx")
             return [
-                Uint(self.chain_id),
-                Uint(self.nonce),
-                Uint(self.max_priority_fee_per_gas),
-                Uint(self.max_fee_per_gas),
-                Uint(self.gas_limit),
+                self.chain_id,
+                self.nonce,
+                self.max_priority_fee_per_gas,
+                self.max_fee_per_gas,
+                self.gas_limit,
                 to,
-                Uint(self.value),
+                self.value,
                 Bytes(self.data),
                 [a.to_list() for a in self.access_list] if self.access_list is not None else [],
-                Uint(self.max_fee_per_blob_gas),
+                self.max_fee_per_blob_gas,
                 [Hash(h) for h in self.blob_versioned_hashes],
             ]
         elif self.ty == 2:
@@ -1570,13 +1669,13 @@ class Transaction:
             if self.max_fee_per_gas is None:
                 raise ValueError("max_fee_per_gas must be set for type 2 tx")
             return [
-                Uint(self.chain_id),
-                Uint(self.nonce),
-                Uint(self.max_priority_fee_per_gas),
-                Uint(self.max_fee_per_gas),
-                Uint(self.gas_limit),
+                self.chain_id,
+                self.nonce,
+                self.max_priority_fee_per_gas,
+                self.max_fee_per_gas,
+                self.gas_limit,
                 to,
-                Uint(self.value),
+                self.value,
                 Bytes(self.data),
                 [a.to_list() for a in self.access_list] if self.access_list is not None else [],
             ]
@@ -1586,12 +1685,12 @@ class Transaction:
                 raise ValueError("gas_price must be set for type 1 tx")
 
             return [
-                Uint(self.chain_id),
-                Uint(self.nonce),
-                Uint(self.gas_price),
-                Uint(self.gas_limit),
+                self.chain_id,
+                self.nonce,
+                self.gas_price,
+                self.gas_limit,
                 to,
-                Uint(self.value),
+                self.value,
                 Bytes(self.data),
                 [a.to_list() for a in self.access_list] if self.access_list is not None else [],
             ]
@@ -1602,23 +1701,23 @@ class Transaction:
             if self.protected:
                 # EIP-155: https://eips.ethereum.org/EIPS/eip-155
                 return [
-                    Uint(self.nonce),
-                    Uint(self.gas_price),
-                    Uint(self.gas_limit),
+                    self.nonce,
+                    self.gas_price,
+                    self.gas_limit,
                     to,
-                    Uint(self.value),
+                    self.value,
                     Bytes(self.data),
-                    Uint(self.chain_id),
-                    Uint(0),
-                    Uint(0),
+                    self.chain_id,
+                    0,
+                    0,
                 ]
             else:
                 return [
-                    Uint(self.nonce),
-                    Uint(self.gas_price),
-                    Uint(self.gas_limit),
+                    self.nonce,
+                    self.gas_price,
+                    self.gas_limit,
                     to,
-                    Uint(self.value),
+                    self.value,
                     Bytes(self.data),
                 ]
         raise NotImplementedError("signing for transaction type {self.ty} not implemented")
@@ -1627,17 +1726,37 @@ class Transaction:
         """
         Returns the serialized bytes of the transaction used for signing.
         """
+        return self.memoized("signing_bytes", self.compute_signing_bytes)
+
+    def compute_signing_bytes(self) -> bytes:
+        """
+        Computes the serialized bytes of the transaction used for signing.
+        """
         if self.ty is None:
             raise ValueError("ty must be set for all tx types")
 
         if self.ty > 0:
-            return bytes([self.ty]) + eth_rlp.encode(self.signing_envelope())
+            return bytes([self.ty]) + rlp_encode(self.signing_envelope())
         else:
-            return eth_rlp.encode(self.signing_envelope())
+            return rlp_encode(self.signing_envelope())
 
-    def with_signature_and_sender(self) -> "Transaction":
+    def signing_request(self) -> Tuple[bytes, bytes]:
+        """
+        Returns the serialized bytes of the transaction used for signing and the secret key
+        to sign them with, the arguments of `sign_transaction`.
+        """
+        if self.secret_key is None:
+            raise ValueError("secret_key must be set to sign a transaction")
+        return self.signing_bytes(), bytes(Hash(self.secret_key))
+
+    def with_signature_and_sender(
+        self, signature: Optional[Tuple[int, int, int, bytes]] = None
+    ) -> "Transaction":
         """
         Returns a signed version of the transaction using the private key.
+
+        The `signature` returned by `sign_transaction` for the signing request of the
+        transaction can be given if it was already computed, see `sign_transactions`.
         """
         tx = copy(self)
 
@@ -1648,28 +1767,9 @@ class Transaction:
                 raise NotImplementedError("recovering sender from signature not implemented")
             return tx
 
-        if tx.secret_key is None:
-            raise ValueError("secret_key must be set to sign a transaction")
-
-        # Get the signing bytes
-        signing_hash = keccak256(tx.signing_bytes())
-
-        # Sign the bytes
-
-        private_key = PrivateKey(
-            secret=Hash(tx.secret_key) if tx.secret_key is not None else bytes(32)
-        )
-        signature_bytes = private_key.sign_recoverable(signing_hash, hasher=None)
-        public_key = PublicKey.from_signature_and_message(
-            signature_bytes, signing_hash, hasher=None
-        )
-        tx.sender = keccak256(public_key.format(compressed=False)[1:])[32 - 20 :]
-
-        tx.v, tx.r, tx.s = (
-            signature_bytes[64],
-            int.from_bytes(signature_bytes[0:32], byteorder="big"),
-            int.from_bytes(signature_bytes[32:64], byteorder="big"),
-        )
+        if signature is None:
+            signature = sign_transaction(*tx.signing_request())
+        tx.v, tx.r, tx.s, tx.sender = signature
         if tx.ty == 0:
             if tx.protected:
                 tx.v += 35 + (tx.chain_id * 2)
@@ -1681,9 +1781,75 @@ class Transaction:
         return tx
 
 
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def sign_transaction(signing_bytes: bytes, secret_key: bytes) -> Tuple[int, int, int, bytes]:
+    """
+    Signs the signing bytes of a transaction and returns the recovery id, `r` and `s` of the
+    signature and the address of the signer.
+
+    Signatures are deterministic, so they are cached for the whole process, keyed by the
+    signing bytes and the secret key: the same transactions are usually signed once for every
+    fork a test is filled for.
+    """
+    signing_hash = keccak256(signing_bytes)
+    private_key = PrivateKey(secret=secret_key)
+    signature_bytes = private_key.sign_recoverable(signing_hash, hasher=None)
+    public_key = PublicKey.from_signature_and_message(signature_bytes, signing_hash, hasher=None)
+    return (
+        signature_bytes[64],
+        int.from_bytes(signature_bytes[0:32], byteorder="big"),
+        int.from_bytes(signature_bytes[32:64], byteorder="big"),
+        keccak256(public_key.format(compressed=False)[1:])[32 - 20 :],
+    )
+
+
+def sign_transaction_chunk(
+    requests: List[Tuple[bytes, bytes]]
+) -> List[Tuple[int, int, int, bytes]]:
+    """
+    Signs a chunk of signing requests, see `sign_transaction`.
+    """
+    return [sign_transaction(*request) for request in requests]
+
+
+def sign_transactions(
+    txs: Sequence[Transaction], *, workers: Optional[int] = None, processes: bool = False
+) -> List[Transaction]:
+    """
+    Returns signed versions of the transactions, in order, as `with_signature_and_sender`.
+
+    When at least `PARALLEL_SIGNING_THRESHOLD` of the transactions must be signed, they are
+    signed in chunks of `SIGNING_CHUNK_SIZE` by up to `workers` threads, one per CPU by
+    default, or processes if `processes` is true. The hashing and signing libraries release
+    the GIL, so threads are usually enough and avoid starting the processes; the signing
+    bytes are always encoded by the caller.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    unsigned = [tx for tx in txs if tx.v is None]
+    if workers <= 1 or len(unsigned) < PARALLEL_SIGNING_THRESHOLD:
+        return [tx.with_signature_and_sender() for tx in txs]
+
+    requests = [tx.signing_request() for tx in unsigned]
+    chunks = [
+        requests[i : i + SIGNING_CHUNK_SIZE] for i in range(0, len(requests), SIGNING_CHUNK_SIZE)
+    ]
+    executor: Executor
+    if processes:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+    else:
+        executor = ThreadPoolExecutor(max_workers=min(workers, len(chunks)))
+    with executor:
+        signatures = chain.from_iterable(list(executor.map(sign_transaction_chunk, chunks)))
+    return [tx.with_signature_and_sender(next(signatures) if tx.v is None else None) for tx in txs]
+
+
 def transaction_list_to_serializable_list(input_txs: List[Transaction] | None) -> List[Any]:
     """
     Returns the transaction list as a list of serializable objects.
+
+    Typed transactions are serialized as byte strings and legacy transactions as their
+    encoded list, so the memoized encodings of both are reused.
     """
     if input_txs is None:
         return []
@@ -1696,7 +1862,7 @@ def transaction_list_to_serializable_list(input_txs: List[Transaction] | None) -
         if tx.ty > 0:
             txs.append(tx.serialized_bytes())
         else:
-            txs.append(tx.payload_body())
+            txs.append(Encoded(tx.serialized_bytes()))
     return txs
 
 
@@ -1704,7 +1870,7 @@ def serialize_transactions(input_txs: List[Transaction] | None) -> bytes:
     """
     Serialize a list of transactions into a single byte string, usually RLP encoded.
     """
-    return eth_rlp.encode(transaction_list_to_serializable_list(input_txs))
+    return rlp_encode(transaction_list_to_serializable_list(input_txs))
 
 
 def blob_versioned_hashes_from_transactions(
@@ -1725,7 +1891,7 @@ def blob_versioned_hashes_from_transactions(
     return versioned_hashes
 
 
-@dataclass
+@dataclass(slots=True)
 class FixtureTransaction(Transaction):
     """
     Representation of an Ethereum transaction within a test Fixture.
@@ -1832,8 +1998,11 @@ class FixtureTransaction(Transaction):
         """
         Returns a FixtureTransaction from a Transaction.
         """
-        kwargs = {field.name: getattr(tx, field.name) for field in fields(tx)}
-        return cls(**kwargs)
+        kwargs = {field.name: getattr(tx, field.name) for field in fields(tx) if field.init}
+        fixture_tx = cls(**kwargs)
+        # The encodings of the transaction are the same, see `Transaction.memoized`.
+        fixture_tx.memo = tx.memo
+        return fixture_tx
 
 
 @dataclass(kw_only=True)
@@ -1967,8 +2136,8 @@ def header_field(*args, source: Optional[HeaderFieldSource] = None, **kwargs) ->
     return field(*args, **kwargs)
 
 
-@dataclass(kw_only=True)
-class FixtureHeader:
+@dataclass(kw_only=True, slots=True)
+class FixtureHeader(StructuralCopy):
     """
     Representation of an Ethereum header within a test Fixture.
     """
@@ -2221,6 +2390,25 @@ class FixtureHeader:
         """
         Returns the serialized version of the block and its hash.
         """
+        # The header is encoded once, for the hash and for the block.
+        header_rlp = Encoded(rlp_encode(self.to_serializable_list()))
+        block = [
+            header_rlp,
+            Encoded(serialize_transactions(txs)),
+            ommers,  # TODO: This is incorrect, and we probably need to serialize the ommers
+        ]
+
+        if withdrawals is not None:
+            block.append([w.to_serializable_list() for w in withdrawals])
+
+        serialized_bytes = Bytes(rlp_encode(block))
+
+        return serialized_bytes, Hash(keccak256(header_rlp))
+
+    def to_serializable_list(self) -> List[Any]:
+        """
+        Returns a list of the header's attributes in the order they should be serialized.
+        """
         header = [
             self.parent_hash,
             self.ommers_hash,
@@ -2229,38 +2417,26 @@ class FixtureHeader:
             self.transactions_root,
             self.receipt_root,
             self.bloom,
-            Uint(int(self.difficulty)),
-            Uint(int(self.number)),
-            Uint(int(self.gas_limit)),
-            Uint(int(self.gas_used)),
-            Uint(int(self.timestamp)),
+            int(self.difficulty),
+            int(self.number),
+            int(self.gas_limit),
+            int(self.gas_used),
+            int(self.timestamp),
             self.extra_data,
             self.mix_digest,
             self.nonce,
         ]
         if self.base_fee is not None:
-            header.append(Uint(int(self.base_fee)))
+            header.append(int(self.base_fee))
         if self.withdrawals_root is not None:
             header.append(self.withdrawals_root)
         if self.blob_gas_used is not None:
-            header.append(Uint(int(self.blob_gas_used)))
+            header.append(int(self.blob_gas_used))
         if self.excess_blob_gas is not None:
-            header.append(Uint(self.excess_blob_gas))
+            header.append(self.excess_blob_gas)
         if self.beacon_root is not None:
             header.append(self.beacon_root)
-
-        block = [
-            header,
-            transaction_list_to_serializable_list(txs),
-            ommers,  # TODO: This is incorrect, and we probably need to serialize the ommers
-        ]
-
-        if withdrawals is not None:
-            block.append([w.to_serializable_list() for w in withdrawals])
-
-        serialized_bytes = Bytes(eth_rlp.encode(block))
-
-        return serialized_bytes, Hash(keccak256(eth_rlp.encode(header)))
+        return header
 
 
 @dataclass(kw_only=True)
@@ -2361,7 +2537,7 @@ class Block(Header):
         return new_block
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class FixtureExecutionPayload(FixtureHeader):
     """
     Representation of the execution payload of a block within a test fixture.
@@ -2553,8 +2729,8 @@ class FixtureEngineNewPayload:
         return new_payload
 
 
-@dataclass(kw_only=True)
-class FixtureBlock:
+@dataclass(kw_only=True, slots=True)
+class FixtureBlock(StructuralCopy):
     """
     Representation of an Ethereum block within a test Fixture.
     """
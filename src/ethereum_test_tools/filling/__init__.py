@@ -1,6 +1,6 @@
 """
 Test filling methods.
 """
-from .fill import fill_test
+from .fill import fill_test, fill_test_async
 
-__all__ = ("fill_test",)
+__all__ = ("fill_test", "fill_test_async")
@@ -1,6 +1,7 @@
 """
 Filler object definitions.
 """
+import asyncio
 from typing import List, Optional
 
 from ethereum_test_forks import Fork
@@ -9,6 +10,7 @@ from evm_transition_tool import TransitionTool
 from ..common import Fixture, alloc_to_accounts
 from ..reference_spec.reference_spec import ReferenceSpec
 from ..spec import BaseTest
+from ..spec.base_test import Transitions, evaluate_transitions, evaluate_transitions_async
 
 
 def fill_test(
@@ -22,11 +24,48 @@ def fill_test(
     """
     Fills fixtures for the specified fork.
     """
+    return evaluate_transitions(
+        t8n, fill_test_transitions(t8n, test_spec, fork, engine, spec, eips)
+    )
+
+
+async def fill_test_async(
+    t8n: TransitionTool,
+    test_spec: BaseTest,
+    fork: Fork,
+    engine: str,
+    spec: ReferenceSpec | None,
+    eips: Optional[List[int]] = None,
+    in_flight: Optional[asyncio.Semaphore] = None,
+) -> Fixture:
+    """
+    Fills fixtures for the specified fork from an asyncio event loop, so that many tests can
+    be filled concurrently within a single process.
+
+    The blocks of a test are still produced one after the other; `in_flight` limits the
+    number of transitions evaluated at the same time across all the tests sharing it.
+    """
+    return await evaluate_transitions_async(
+        t8n, fill_test_transitions(t8n, test_spec, fork, engine, spec, eips), in_flight
+    )
+
+
+def fill_test_transitions(
+    t8n: TransitionTool,
+    test_spec: BaseTest,
+    fork: Fork,
+    engine: str,
+    spec: ReferenceSpec | None,
+    eips: Optional[List[int]] = None,
+) -> Transitions[Fixture]:
+    """
+    Fills fixtures for the specified fork, yielding every state transition to be evaluated.
+    """
     t8n.reset_traces()
 
     pre, genesis_rlp, genesis = test_spec.make_genesis(t8n, fork)
 
-    (blocks, head, alloc) = test_spec.make_blocks(
+    (blocks, head, alloc) = yield from test_spec.make_blocks_transitions(
         t8n,
         genesis,
         pre,
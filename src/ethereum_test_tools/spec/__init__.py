@@ -3,6 +3,7 @@ Test spec definitions and utilities.
 """
 from .base_test import BaseTest, BaseTestConfig, TestSpec, verify_post_alloc
 from .blockchain_test import BlockchainTest, BlockchainTestFiller, BlockchainTestSpec
+from .genesis_cache import GenesisCache
 from .state_test import StateTest, StateTestFiller, StateTestSpec
 
 __all__ = (
@@ -11,6 +12,7 @@ __all__ = (
     "BlockchainTest",
     "BlockchainTestFiller",
     "BlockchainTestSpec",
+    "GenesisCache",
     "StateTest",
     "StateTestFiller",
     "StateTestSpec",
@@ -1,16 +1,43 @@
 """
 Generic Ethereum test base class
 """
+import asyncio
 from abc import abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from itertools import count
 from os import path
-from typing import Any, Callable, Dict, Generator, Iterator, List, Mapping, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 from ethereum_test_forks import Fork
-from evm_transition_tool import TransitionTool
+from evm_transition_tool import TransitionTool, TransitionToolRequest
 
-from ..common import Account, Address, Alloc, Bytes, FixtureBlock, FixtureHeader, Hash, Transaction
+from ..common import (
+    Account,
+    Address,
+    Alloc,
+    Bytes,
+    Environment,
+    FixtureBlock,
+    FixtureHeader,
+    Hash,
+    Storage,
+    Transaction,
+    Withdrawal,
+    to_json,
+)
+from ..common.trie import state_root, withdrawals_root
+from .genesis_cache import GenesisCache
 
 
 def verify_transactions(txs: List[Transaction] | None, result) -> List[int]:
@@ -59,6 +86,63 @@ def verify_post_alloc(expected_post: Mapping, got_alloc: Mapping):
                     raise Exception(f"expected account not found: {address}")
 
 
+T = TypeVar("T")
+
+Transitions = Generator[TransitionToolRequest, Tuple[Dict[str, Any], Dict[str, Any]], T]
+"""
+Generator yielding the state transitions a test needs evaluated, receiving the output alloc
+and result of each, and finally returning its own result.
+
+Tests are written this way so that the same code can be driven either synchronously or
+from an asyncio event loop, see `evaluate_transitions` and `evaluate_transitions_async`.
+"""
+
+
+def evaluate_transitions(t8n: TransitionTool, transitions: Transitions[T]) -> T:
+    """
+    Evaluates the transitions yielded by the generator one after the other and returns the
+    generator's result.
+    """
+    try:
+        request = next(transitions)
+        while True:
+            request = transitions.send(t8n.evaluate(**request_arguments(request)))
+    except StopIteration as e:
+        return e.value
+
+
+async def evaluate_transitions_async(
+    t8n: TransitionTool,
+    transitions: Transitions[T],
+    in_flight: Optional[asyncio.Semaphore] = None,
+) -> T:
+    """
+    Evaluates the transitions yielded by the generator one after the other, without blocking
+    the event loop, and returns the generator's result.
+
+    The `in_flight` semaphore, if given, limits the number of transitions evaluated at the same
+    time by all the generators sharing it.
+    """
+    try:
+        request = next(transitions)
+        while True:
+            if in_flight is None:
+                output = await t8n.evaluate_async(**request_arguments(request))
+            else:
+                async with in_flight:
+                    output = await t8n.evaluate_async(**request_arguments(request))
+            request = transitions.send(output)
+    except StopIteration as e:
+        return e.value
+
+
+def request_arguments(request: TransitionToolRequest) -> Dict[str, Any]:
+    """
+    Returns the keyword arguments of `TransitionTool.evaluate` for the given request.
+    """
+    return {f.name: getattr(request, f.name) for f in fields(request)}
+
+
 @dataclass(kw_only=True)
 class BaseTestConfig:
     """
@@ -70,6 +154,23 @@ class BaseTestConfig:
     Disable any hive-related properties that the output could contain.
     """
 
+    verify_genesis_roots: bool = False
+    """
+    Verify the genesis state and withdrawals roots computed in-process against the roots
+    computed by the transition tool.
+    """
+
+    genesis_cache: Optional[GenesisCache] = None
+    """
+    Cache of the genesis blocks built by the tests, shared by all the tests of the session.
+    """
+
+    signing_workers: Optional[int] = None
+    """
+    Number of threads signing the transactions of a block that carries many of them, see
+    `sign_transactions`; one per CPU if None.
+    """
+
 
 @dataclass(kw_only=True)
 class BaseTest:
@@ -97,7 +198,23 @@ class BaseTest:
         """
         pass
 
-    @abstractmethod
+    def cached_genesis(
+        self,
+        fork: Fork,
+        env: Environment,
+        alloc: Alloc,
+        build: Callable[[], Tuple[Alloc, Bytes, FixtureHeader]],
+    ) -> Tuple[Alloc, Bytes, FixtureHeader]:
+        """
+        Returns the genesis built by `build` from the given genesis environment and merged
+        pre-allocation, from the genesis cache if it was already built by another test.
+        """
+        cache = self.base_test_config.genesis_cache
+        if cache is None:
+            return build()
+        key = cache.key(self.pytest_parameter_name(), fork.name(), to_json(env), to_json(alloc))
+        return cache.get_or_build(key, build)
+
     def make_blocks(
         self,
         t8n: TransitionTool,
@@ -110,6 +227,24 @@ class BaseTest:
         """
         Generate the blockchain that must be executed sequentially during test.
         """
+        return evaluate_transitions(
+            t8n, self.make_blocks_transitions(t8n, genesis, pre, fork, chain_id, eips)
+        )
+
+    @abstractmethod
+    def make_blocks_transitions(
+        self,
+        t8n: TransitionTool,
+        genesis: FixtureHeader,
+        pre: Alloc,
+        fork: Fork,
+        chain_id: int = 1,
+        eips: Optional[List[int]] = None,
+    ) -> Transitions[Tuple[List[FixtureBlock], Hash, Dict[str, Any]]]:
+        """
+        Generate the blockchain, yielding every state transition to be evaluated by the
+        transition tool and receiving its output, in the order the blocks depend on each other.
+        """
         pass
 
     @classmethod
@@ -121,6 +256,56 @@ class BaseTest:
         """
         pass
 
+    def genesis_state(self, t8n: TransitionTool, fork: Fork, alloc: Alloc) -> Tuple[Alloc, Hash]:
+        """
+        Returns the genesis allocation, without the storage slots set to zero as the transition
+        tool would output it, and its state root.
+        """
+        root = Hash(state_root(alloc))
+        if self.base_test_config.verify_genesis_roots:
+            _, t8n_root = t8n.calc_state_root(
+                alloc=to_json(alloc),
+                fork=fork,
+                debug_output_path=self.get_next_transition_tool_output_path(),
+            )
+            if root != t8n_root:
+                raise Exception(
+                    f"genesis state root mismatch: in-process {root.hex()}, "
+                    + f"transition tool 0x{t8n_root.hex()}"
+                )
+        genesis_alloc = Alloc(
+            {
+                address: Account.merge(
+                    account,
+                    {"storage": {k: v for k, v in Storage(account.storage).data.items() if v}},
+                )
+                if account.storage
+                else account
+                for address, account in alloc.items()
+            }
+        )
+        return genesis_alloc, root
+
+    def genesis_withdrawals_root(
+        self, t8n: TransitionTool, fork: Fork, withdrawals: List[Withdrawal]
+    ) -> Hash:
+        """
+        Returns the withdrawals root of the genesis block.
+        """
+        root = Hash(withdrawals_root(withdrawals))
+        if self.base_test_config.verify_genesis_roots:
+            t8n_root = t8n.calc_withdrawals_root(
+                withdrawals=to_json(withdrawals),
+                fork=fork,
+                debug_output_path=self.get_next_transition_tool_output_path(),
+            )
+            if root != t8n_root:
+                raise Exception(
+                    f"genesis withdrawals root mismatch: in-process {root.hex()}, "
+                    + f"transition tool 0x{t8n_root.hex()}"
+                )
+        return root
+
     def get_next_transition_tool_output_path(self) -> str:
         """
         Returns the path to the next transition tool output file.
@@ -3,11 +3,12 @@ Blockchain test filler.
 """
 
 from dataclasses import dataclass, field
+from functools import partial
 from pprint import pprint
 from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Tuple, Type
 
 from ethereum_test_forks import Fork
-from evm_transition_tool import TransitionTool
+from evm_transition_tool import TransitionTool, TransitionToolRequest
 
 from ..common import (
     Address,
@@ -24,10 +25,11 @@ from ..common import (
     HeaderNonce,
     Number,
     ZeroPaddedHexNumber,
+    sign_transactions,
     to_json,
 )
 from ..common.constants import EmptyOmmersRoot
-from .base_test import BaseTest, verify_post_alloc, verify_transactions
+from .base_test import BaseTest, Transitions, verify_post_alloc, verify_transactions
 from .debugging import print_traces
 
 
@@ -61,11 +63,18 @@ class BlockchainTest(BaseTest):
         env = self.genesis_environment.set_fork_requirements(fork)
 
         pre_alloc = Alloc(fork.pre_allocation(block_number=0, timestamp=Number(env.timestamp)))
-        new_alloc, state_root = t8n.calc_state_root(
-            alloc=to_json(Alloc.merge(pre_alloc, Alloc(self.pre))),
-            fork=fork,
-            debug_output_path=self.get_next_transition_tool_output_path(),
+        alloc = Alloc.merge(pre_alloc, Alloc(self.pre))
+        return self.cached_genesis(
+            fork, env, alloc, partial(self.build_genesis, t8n, fork, env, alloc)
         )
+
+    def build_genesis(
+        self, t8n: TransitionTool, fork: Fork, env: Environment, alloc: Alloc
+    ) -> Tuple[Alloc, Bytes, FixtureHeader]:
+        """
+        Builds the genesis block from the genesis environment and merged pre-allocation.
+        """
+        new_alloc, state_root = self.genesis_state(t8n, fork, alloc)
         genesis = FixtureHeader(
             parent_hash=Hash(0),
             ommers_hash=Hash(EmptyOmmersRoot),
@@ -86,11 +95,7 @@ class BlockchainTest(BaseTest):
             blob_gas_used=ZeroPaddedHexNumber.or_none(env.blob_gas_used),
             excess_blob_gas=ZeroPaddedHexNumber.or_none(env.excess_blob_gas),
             withdrawals_root=Hash.or_none(
-                t8n.calc_withdrawals_root(
-                    withdrawals=env.withdrawals,
-                    fork=fork,
-                    debug_output_path=self.get_next_transition_tool_output_path(),
-                )
+                self.genesis_withdrawals_root(t8n, fork, env.withdrawals)
                 if env.withdrawals is not None
                 else None
             ),
@@ -103,9 +108,9 @@ class BlockchainTest(BaseTest):
             withdrawals=env.withdrawals,
         )
 
-        return Alloc(new_alloc), genesis_rlp, genesis
+        return new_alloc, genesis_rlp, genesis
 
-    def make_block(
+    def make_block_transitions(
         self,
         t8n: TransitionTool,
         fork: Fork,
@@ -115,7 +120,7 @@ class BlockchainTest(BaseTest):
         previous_head: Hash,
         chain_id=1,
         eips: Optional[List[int]] = None,
-    ) -> Tuple[FixtureBlock, Environment, Dict[str, Any], Hash]:
+    ) -> Transitions[Tuple[FixtureBlock, Environment, Dict[str, Any], Hash]]:
         """
         Produces a block based on the previous environment and allocation.
         If the block is an invalid block, the environment and allocation
@@ -150,12 +155,12 @@ class BlockchainTest(BaseTest):
             env = env.set_fork_requirements(fork)
 
             txs = (
-                [tx.with_signature_and_sender() for tx in block.txs]
+                sign_transactions(block.txs, workers=self.base_test_config.signing_workers)
                 if block.txs is not None
                 else []
             )
 
-            next_alloc, result = t8n.evaluate(
+            next_alloc, result = yield TransitionToolRequest(
                 alloc=previous_alloc,
                 txs=to_json(txs),
                 env=to_json(env),
@@ -252,7 +257,7 @@ class BlockchainTest(BaseTest):
                 previous_head,
             )
 
-    def make_blocks(
+    def make_blocks_transitions(
         self,
         t8n: TransitionTool,
         genesis: FixtureHeader,
@@ -260,7 +265,7 @@ class BlockchainTest(BaseTest):
         fork: Fork,
         chain_id=1,
         eips: Optional[List[int]] = None,
-    ) -> Tuple[List[FixtureBlock], Hash, Dict[str, Any]]:
+    ) -> Transitions[Tuple[List[FixtureBlock], Hash, Dict[str, Any]]]:
         """
         Create a block list from the blockchain test definition.
         Performs checks against the expected behavior of the test.
@@ -271,7 +276,7 @@ class BlockchainTest(BaseTest):
         blocks: List[FixtureBlock] = []
         head = genesis.hash if genesis.hash is not None else Hash(0)
         for block in self.blocks:
-            fixture_block, env, alloc, head = self.make_block(
+            fixture_block, env, alloc, head = yield from self.make_block_transitions(
                 t8n=t8n,
                 fork=fork,
                 block=block,
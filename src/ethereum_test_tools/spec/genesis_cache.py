@@ -0,0 +1,139 @@
+"""
+Cache of the genesis blocks built by the test specs.
+
+Parametrized tests often define the same pre-allocation and genesis environment for every
+variant, so the genesis allocation, RLP and header of a spec are memoized, keyed by the fork
+and the canonical JSON encoding of the merged pre-allocation and genesis environment.
+
+The entries are kept in a bounded in-memory LRU and, optionally, pickled to a directory so
+that they can be shared by the workers of `pytest-xdist` and between sessions. Entries are
+written atomically; the `version` of the cache, e.g. a digest of the framework's sources, is
+part of every key, so that entries built by different code are never mixed.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from copy import deepcopy
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Optional, TypeVar
+
+DEFAULT_MAX_ENTRIES = 256
+ENTRY_SUFFIX = ".pickle"
+
+T = TypeVar("T")
+
+
+class GenesisCache:
+    """
+    In-memory LRU of the genesis blocks built by the test specs, optionally persisted to disk.
+
+    Values are deep-copied when stored and when returned, so that the specs can modify the
+    genesis they receive. The entries and the hit and miss counts are guarded by `lock`, so the
+    cache can be shared by threads filling specs concurrently.
+    """
+
+    max_entries: int
+    directory: Optional[Path]
+    version: str
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        directory: Optional[Path] = None,
+        version: str = "",
+    ):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.entries: OrderedDict[str, Any] = OrderedDict()
+        self.lock = Lock()
+
+    def key(self, *parts: Any) -> str:
+        """
+        Returns the key of the given parts, canonically encoded as JSON.
+        """
+        canonical = json.dumps(
+            {"version": self.version, "parts": parts}, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """
+        Returns the path of the file of an entry.
+        """
+        assert self.directory is not None
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns a copy of the value stored for a key, or None.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return deepcopy(self.entries[key])
+        if self.directory is None:
+            return None
+        try:
+            with open(self.path(key), "rb") as f:
+                value = pickle.load(f)
+        except Exception:
+            # Missing, or written by an older version of the framework.
+            return None
+        self.remember(key, value)
+        return deepcopy(value)
+
+    def remember(self, key: str, value: Any) -> None:
+        """
+        Stores a value in memory, evicting the least recently used entries past the limit.
+        """
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Stores a copy of a value, in memory and on disk.
+        """
+        value = deepcopy(value)
+        self.remember(key, value)
+        if self.directory is None:
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f)
+            os.replace(temp_path, self.path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def get_or_build(self, key: str, build: Callable[[], T]) -> T:
+        """
+        Returns the value stored for a key, building and storing it on a miss.
+        """
+        value = self.get(key)
+        with self.lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if value is not None:
+            return value
+        value = build()
+        self.put(key, value)
+        return value
@@ -3,10 +3,11 @@ State test filler.
 """
 from copy import copy
 from dataclasses import dataclass
+from functools import partial
 from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Tuple, Type
 
 from ethereum_test_forks import Fork
-from evm_transition_tool import TransitionTool
+from evm_transition_tool import TransitionTool, TransitionToolRequest
 
 from ..common import (
     Address,
@@ -23,10 +24,11 @@ from ..common import (
     Number,
     Transaction,
     ZeroPaddedHexNumber,
+    sign_transactions,
     to_json,
 )
 from ..common.constants import EmptyOmmersRoot, EngineAPIError
-from .base_test import BaseTest, verify_post_alloc, verify_transactions
+from .base_test import BaseTest, Transitions, verify_post_alloc, verify_transactions
 from .debugging import print_traces
 
 
@@ -67,13 +69,20 @@ class StateTest(BaseTest):
         env = env.set_fork_requirements(fork)
 
         pre_alloc = Alloc(fork.pre_allocation(block_number=0, timestamp=Number(env.timestamp)))
+        alloc = Alloc.merge(pre_alloc, Alloc(self.pre))
 
-        new_alloc, state_root = t8n.calc_state_root(
-            alloc=to_json(Alloc.merge(pre_alloc, Alloc(self.pre))),
-            fork=fork,
-            debug_output_path=self.get_next_transition_tool_output_path(),
+        return self.cached_genesis(
+            fork, env, alloc, partial(self.build_genesis, t8n, fork, env, alloc)
         )
 
+    def build_genesis(
+        self, t8n: TransitionTool, fork: Fork, env: Environment, alloc: Alloc
+    ) -> Tuple[Alloc, Bytes, FixtureHeader]:
+        """
+        Builds the genesis block from the genesis environment and merged pre-allocation.
+        """
+        new_alloc, state_root = self.genesis_state(t8n, fork, alloc)
+
         genesis = FixtureHeader(
             parent_hash=Hash(0),
             ommers_hash=Hash(EmptyOmmersRoot),
@@ -94,11 +103,7 @@ class StateTest(BaseTest):
             blob_gas_used=ZeroPaddedHexNumber.or_none(env.blob_gas_used),
             excess_blob_gas=ZeroPaddedHexNumber.or_none(env.excess_blob_gas),
             withdrawals_root=Hash.or_none(
-                t8n.calc_withdrawals_root(
-                    withdrawals=env.withdrawals,
-                    fork=fork,
-                    debug_output_path=self.get_next_transition_tool_output_path(),
-                )
+                self.genesis_withdrawals_root(t8n, fork, env.withdrawals)
                 if env.withdrawals is not None
                 else None
             ),
@@ -111,9 +116,9 @@ class StateTest(BaseTest):
             withdrawals=env.withdrawals,
         )
 
-        return Alloc(new_alloc), genesis_rlp, genesis
+        return new_alloc, genesis_rlp, genesis
 
-    def make_blocks(
+    def make_blocks_transitions(
         self,
         t8n: TransitionTool,
         genesis: FixtureHeader,
@@ -121,7 +126,7 @@ class StateTest(BaseTest):
         fork: Fork,
         chain_id=1,
         eips: Optional[List[int]] = None,
-    ) -> Tuple[List[FixtureBlock], Hash, Dict[str, Any]]:
+    ) -> Transitions[Tuple[List[FixtureBlock], Hash, Dict[str, Any]]]:
         """
         Create a block from the state test definition.
         Performs checks against the expected behavior of the test.
@@ -130,9 +135,13 @@ class StateTest(BaseTest):
         env = self.env.apply_new_parent(genesis)
         env = env.set_fork_requirements(fork)
 
-        txs = [tx.with_signature_and_sender() for tx in self.txs] if self.txs is not None else []
+        txs = (
+            sign_transactions(self.txs, workers=self.base_test_config.signing_workers)
+            if self.txs is not None
+            else []
+        )
 
-        alloc, result = t8n.evaluate(
+        alloc, result = yield TransitionToolRequest(
             alloc=to_json(pre),
             txs=to_json(txs),
             env=to_json(env),
@@ -0,0 +1,95 @@
+"""
+Test suite for the cache of the genesis blocks built by the test specs.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ethereum_test_forks import Shanghai
+
+from ..common import Account, Environment, TestAddress
+from ..spec import BaseTest, BaseTestConfig, BlockchainTest, GenesisCache, StateTest
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used entries are evicted past the limit.
+    """
+    cache = GenesisCache(max_entries=2)
+    keys = [cache.key(i) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, i)
+    assert cache.get(keys[0]) == 0
+    cache.put(keys[2], 2)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 0
+    assert cache.get(keys[2]) == 2
+
+
+def test_copies():
+    """
+    Test that modifying a returned value does not modify the cached value.
+    """
+    cache = GenesisCache()
+    key = cache.key("genesis")
+    value = cache.get_or_build(key, lambda: {"alloc": {}})
+    value["alloc"]["modified"] = True
+    assert cache.get_or_build(key, lambda: {"alloc": None}) == {"alloc": {}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_statistics():
+    """
+    Test that every lookup of a cache shared by threads is counted as a hit or a miss.
+    """
+    cache = GenesisCache(max_entries=4)
+    keys = [cache.key(i % 8) for i in range(4000)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda key: cache.get_or_build(key, lambda: key), keys))
+    assert values == keys
+    assert cache.hits + cache.misses == len(keys)
+    assert cache.misses >= 8
+
+
+def test_persistence(tmp_path: Path):
+    """
+    Test that the entries persisted by a cache are found by another cache of the same version
+    only.
+    """
+    cache = GenesisCache(directory=tmp_path, version="1")
+    cache.put(cache.key("genesis"), "value")
+    assert GenesisCache(directory=tmp_path, version="1").get(cache.key("genesis")) == "value"
+    other_version = GenesisCache(directory=tmp_path, version="2")
+    assert other_version.get(other_version.key("genesis")) is None
+
+
+@pytest.mark.parametrize("spec_type", [StateTest, BlockchainTest])
+def test_make_genesis_cached(spec_type):
+    """
+    Test that the specs with the same fork, pre-allocation and genesis environment share the
+    same genesis, and that a different pre-allocation builds another one.
+    """
+    base_test_config = BaseTestConfig(genesis_cache=GenesisCache())
+
+    def make_genesis(balance: int):
+        pre = {TestAddress: Account(balance=balance)}
+        spec: BaseTest
+        if spec_type == StateTest:
+            spec = StateTest(
+                env=Environment(), pre=pre, post={}, txs=[], base_test_config=base_test_config
+            )
+        else:
+            spec = BlockchainTest(pre=pre, post={}, blocks=[], base_test_config=base_test_config)
+        return spec.make_genesis(None, Shanghai)  # type: ignore
+
+    _, genesis_rlp, genesis = make_genesis(10**18)
+    _, cached_genesis_rlp, cached_genesis = make_genesis(10**18)
+    assert cached_genesis_rlp == genesis_rlp
+    assert cached_genesis.hash == genesis.hash
+    assert cached_genesis is not genesis
+    _, _, other_genesis = make_genesis(10**19)
+    assert other_genesis.hash != genesis.hash
+    assert base_test_config.genesis_cache is not None
+    assert (base_test_config.genesis_cache.hits, base_test_config.genesis_cache.misses) == (1, 2)
@@ -0,0 +1,117 @@
+"""
+Test suite for the hashing backends of `ethereum_test_tools.common.hashing`.
+"""
+
+import hashlib
+import random
+from typing import List
+
+import pytest
+from ethereum.crypto.hash import keccak256 as ethereum_keccak256
+
+from ..common import hashing
+from ..common.hashing import (
+    KeccakBackend,
+    PycryptodomeRawBackend,
+    available_keccak_backends,
+    keccak256,
+    keccak256_many,
+    select_keccak_backend,
+    sha256_many,
+)
+from ..common.types import Address, Bytes
+
+BACKENDS = available_keccak_backends()
+
+
+def random_inputs() -> List[bytes]:
+    """
+    Returns byte strings of lengths around the Keccak-256 block size of 136 bytes.
+    """
+    rng = random.Random(1)
+    return [
+        bytes(rng.randrange(256) for _ in range(length))
+        for length in [0, 1, 20, 32, 64, 135, 136, 137, 272, 1000]
+        for _ in range(3)
+    ]
+
+
+@pytest.fixture
+def restore_keccak_backend():
+    """
+    Restores the selected Keccak-256 backend after the test.
+    """
+    backend = hashing.keccak_backend
+    yield
+    hashing.keccak_backend = backend
+
+
+def test_backend_selected():
+    """
+    Test that the fastest available backend is selected, and that the execution specs are
+    always available as a backend.
+    """
+    assert hashing.keccak_backend.name == BACKENDS[0].name
+    assert "ethereum" in [backend.name for backend in BACKENDS]
+
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+def test_backend_equivalence(backend: KeccakBackend):
+    """
+    Test that every backend produces the digests of the execution specs, one at a time and in
+    batches, for byte strings of any type.
+    """
+    inputs = random_inputs()
+    expected = [bytes(ethereum_keccak256(data)) for data in inputs]
+    assert [backend.keccak256(data) for data in inputs] == expected
+    assert backend.keccak256_many(inputs) == expected
+    assert backend.keccak256_many(iter(inputs)) == expected
+    assert backend.keccak256_many([]) == []
+    for data in [Address(0x100), Bytes(b"\x01\x02"), bytearray(b"\x03"), memoryview(b"\x04")]:
+        assert backend.keccak256(data) == bytes(ethereum_keccak256(bytes(data)))
+
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+def test_select_keccak_backend(backend: KeccakBackend, restore_keccak_backend):
+    """
+    Test that the backend used by `keccak256` and `keccak256_many` can be selected by name.
+    """
+    assert select_keccak_backend(backend.name).name == backend.name
+    assert hashing.keccak_backend.name == backend.name
+    inputs = random_inputs()
+    assert keccak256_many(inputs) == [keccak256(data) for data in inputs]
+
+
+def test_select_unknown_keccak_backend(restore_keccak_backend):
+    """
+    Test that selecting a backend that is not available fails.
+    """
+    with pytest.raises(ValueError):
+        select_keccak_backend("unknown")
+
+
+@pytest.mark.parametrize("version_info", [(3, 11, 0), (4, 0, 0)])
+def test_pycryptodome_raw_unsupported_version(
+    monkeypatch: pytest.MonkeyPatch, version_info, restore_keccak_backend
+):
+    """
+    Test that the backend calling the private library of `pycryptodome` is not available for
+    the versions it was not checked against, falling back to its public interface.
+    """
+    Crypto = pytest.importorskip("Crypto")
+    monkeypatch.setattr(Crypto, "version_info", version_info)
+    with pytest.raises(ImportError, match="unsupported pycryptodome version"):
+        PycryptodomeRawBackend()
+    names = [backend.name for backend in available_keccak_backends()]
+    assert "pycryptodome-raw" not in names
+    assert "pycryptodome" in names
+    assert select_keccak_backend().name != "pycryptodome-raw"
+    assert keccak256(b"") == bytes(ethereum_keccak256(b""))
+
+
+def test_sha256_many():
+    """
+    Test the batch SHA-256 digests.
+    """
+    inputs = random_inputs()
+    assert sha256_many(inputs) == [hashlib.sha256(data).digest() for data in inputs]
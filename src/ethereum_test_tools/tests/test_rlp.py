@@ -0,0 +1,96 @@
+"""
+Test suite for the RLP encoder of `ethereum_test_tools.common.rlp`.
+"""
+
+import random
+from typing import Any
+
+import pytest
+from ethereum import rlp as eth_rlp
+from ethereum.base_types import Uint
+
+from ..common import Address, Hash
+from ..common.rlp import Encoded, encode
+from ..common.types import Bytes, Number
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (b"", "80"),
+        (b"\x00", "00"),
+        (b"\x7f", "7f"),
+        (b"\x80", "8180"),
+        (b"dog", "83646f67"),
+        (b"a" * 56, "b838" + "61" * 56),
+        (b"a" * 1024, "b90400" + "61" * 1024),
+        (0, "80"),
+        (15, "0f"),
+        (0x80, "8180"),
+        (1024, "820400"),
+        (2**256 - 1, "a0" + "ff" * 32),
+        ([], "c0"),
+        ([b"cat", b"dog"], "c88363617483646f67"),
+        ([[], [[]], [[], [[]]]], "c7c0c1c0c3c0c1c0"),
+        ([b"a" * 60], "f83eb83c" + "61" * 60),
+        (Encoded(bytes.fromhex("c88363617483646f67")), "c88363617483646f67"),
+        ([Encoded(bytes.fromhex("c0")), b""], "c2c080"),
+    ],
+)
+def test_encode(value: Any, expected: str):
+    """
+    Test the encoding of known vectors.
+    """
+    assert encode(value).hex() == expected
+
+
+@pytest.mark.parametrize("value", [-1, None, {}, 1.0])
+def test_encode_invalid(value: Any):
+    """
+    Test that values that cannot be encoded are rejected.
+    """
+    with pytest.raises((TypeError, ValueError)):
+        encode(value)
+
+
+def random_value(rng: random.Random, depth: int = 0) -> Any:
+    """
+    Returns a random value of the types found in headers, blocks and transactions.
+    """
+    kind = rng.randrange(6 if depth < 3 else 5)
+    if kind == 0:
+        return rng.randrange(2 ** rng.choice([0, 7, 8, 64, 256]) + 1)
+    if kind == 1:
+        return Number(rng.randrange(2**64))
+    if kind == 2:
+        return bytes(rng.randrange(256) for _ in range(rng.choice([0, 1, 1, 20, 55, 56, 300])))
+    if kind == 3:
+        return Address(rng.randrange(2**160))
+    if kind == 4:
+        return Bytes(bytes(rng.randrange(256) for _ in range(rng.randrange(80))))
+    return [random_value(rng, depth + 1) for _ in range(rng.choice([0, 1, 3, 17]))]
+
+
+def to_eth_rlp(value: Any) -> Any:
+    """
+    Wraps the integers of a value in `Uint`, as required by `ethereum.rlp`.
+    """
+    if isinstance(value, list):
+        return [to_eth_rlp(v) for v in value]
+    if isinstance(value, int):
+        return Uint(value)
+    return value
+
+
+def test_encode_matches_ethereum_rlp():
+    """
+    Test that random values are encoded exactly as by `ethereum.rlp`, including when parts of
+    them are already encoded.
+    """
+    rng = random.Random(1)
+    for _ in range(500):
+        value = random_value(rng)
+        expected = eth_rlp.encode(to_eth_rlp(value))
+        assert encode(value) == expected
+        assert encode(Encoded(expected)) == expected
+        assert encode([Encoded(expected), Hash(1)]) == eth_rlp.encode([to_eth_rlp(value), Hash(1)])
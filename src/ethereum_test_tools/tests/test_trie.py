@@ -0,0 +1,151 @@
+"""
+Test suite for the in-process Merkle Patricia Trie.
+"""
+
+import random
+from typing import Dict
+
+import pytest
+
+from ..common import EmptyTrieRoot, Trie, Withdrawal, state_root, withdrawals_root
+
+
+@pytest.mark.parametrize(
+    "items,root",
+    [
+        ({}, EmptyTrieRoot.hex()),
+        (
+            {b"A": b"a" * 50},
+            "d23786fb4a010da3ce639d66d5e904a11dbc02746d1ce25029e53290cabf28ab",
+        ),
+        (
+            {b"doe": b"reindeer", b"dog": b"puppy", b"dogglesworth": b"cat"},
+            "8aad789dff2f538bca5d8ea56e8abe10f4c7ba3a5dea95fea4cd6e7c3a1168d3",
+        ),
+        (
+            {b"do": b"verb", b"horse": b"stallion", b"doge": b"coin", b"dog": b"puppy"},
+            "5991bb8c6514148a29db676a14ac506cd2cd5775ace63c30a4fe457715e9ac84",
+        ),
+    ],
+)
+def test_trie_root(items: Dict[bytes, bytes], root: str):
+    """
+    Test the root of tries built from known vectors.
+    """
+    assert Trie(items).root().hex() == root
+
+
+def test_trie_updates():
+    """
+    Test that a trie updated incrementally has the same root as one built from scratch, and
+    that copies are not affected by updates.
+    """
+    rng = random.Random(1)
+    trie = Trie()
+    items: Dict[bytes, bytes] = {}
+    for _ in range(500):
+        key = bytes(rng.randrange(4) for _ in range(rng.randrange(4)))
+        if items and rng.random() < 0.3:
+            key = rng.choice(list(items))
+            del items[key]
+            del trie[key]
+        else:
+            items[key] = bytes([rng.randrange(1, 256)]) * rng.randrange(1, 40)
+            trie[key] = items[key]
+        assert trie.root() == Trie(items).root()
+
+    copy = trie.copy()
+    copy_root = copy.root()
+    for key in list(items):
+        del trie[key]
+    assert trie.root() == EmptyTrieRoot
+    assert copy.root() == copy_root
+
+
+@pytest.mark.parametrize("secured", [False, True])
+def test_trie_update(secured: bool):
+    """
+    Test that a trie updated with a batch of items has the same root as one updated key by
+    key.
+    """
+    rng = random.Random(2)
+    items = {
+        rng.randbytes(rng.randrange(1, 33)): rng.randbytes(rng.randrange(40)) for _ in range(200)
+    }
+    trie = Trie(secured=secured)
+    for key, value in items.items():
+        trie[key] = value
+    batch = Trie(secured=secured)
+    batch.update(items)
+    assert batch.root() == trie.root() == Trie(items, secured=secured).root()
+
+    removed = {key: b"" for key in list(items)[::2]}
+    for key in removed:
+        del trie[key]
+    batch.update(removed)
+    assert batch.root() == trie.root()
+
+
+@pytest.mark.parametrize(
+    "alloc,root",
+    [
+        (
+            {
+                "0x1000000000000000000000000000000000000000": {
+                    "balance": "0x0BA1A9CE0BA1A9CE",
+                    "code": "0x",
+                    "nonce": "0",
+                    "storage": {},
+                },
+            },
+            "51e7c7508e76dca0",
+        ),
+        (
+            {
+                "0x1000000000000000000000000000000000000000": {
+                    "balance": "0x0BA1A9CE0BA1A9CE",
+                    "code": "0x",
+                    "nonce": "1",
+                    "storage": {},
+                },
+            },
+            "37c2dedbdea6b3af",
+        ),
+        (
+            {
+                "0x1000000000000000000000000000000000000000": {
+                    "balance": "0",
+                    "storage": {"0x01": "0x01", "0x02": "0x00"},
+                },
+            },
+            "096122e88929baec",
+        ),
+    ],
+)
+def test_state_root(alloc: Dict, root: str):
+    """
+    Test the state root of an allocation, the expected roots were computed by `evm t8n`.
+    """
+    assert state_root(alloc).hex().startswith(root)
+
+
+def test_withdrawals_root():
+    """
+    Test the withdrawals root of a block.
+    """
+    assert withdrawals_root([]) == EmptyTrieRoot
+    assert (
+        withdrawals_root([Withdrawal(index=0, validator=0, address=0, amount=1)]).hex()
+        == "6d549e8e6690f1ac4c2f7ce5bebda761342c8932bec083d1d3b011e9210909c0"
+    )
+
+
+def test_state_root_negative_storage():
+    """
+    Test that negative storage keys and values are stored as their two's complement.
+    """
+    address = "0x1000000000000000000000000000000000000000"
+    negative = {address: {"storage": {-1: -1, 1: -(2**255)}}}
+    complement = {address: {"storage": {2**256 - 1: 2**256 - 1, 1: 2**255}}}
+    assert state_root(negative) == state_root(complement)
+    assert state_root(negative) != state_root({address: {}})
@@ -2,6 +2,9 @@
 Test suite for `ethereum_test` module.
 """
 
+from copy import copy, deepcopy
+from dataclasses import dataclass, fields
+from itertools import product
 from typing import Any, Dict
 
 import pytest
@@ -16,8 +19,10 @@ from ..common import (
     Withdrawal,
     to_json,
 )
-from ..common.constants import TestPrivateKey
+from ..common.constants import TestPrivateKey, TestPrivateKey2
+from ..common.json import JSONEncoder, field
 from ..common.types import (
+    PARALLEL_SIGNING_THRESHOLD,
     Address,
     Alloc,
     Bloom,
@@ -29,6 +34,8 @@ from ..common.types import (
     Hash,
     HeaderNonce,
     ZeroPaddedHexNumber,
+    sign_transaction,
+    sign_transactions,
 )
 
 
@@ -1090,6 +1097,80 @@ def test_json_conversions(obj: Any, expected_json: str | Dict[str, Any]):
     assert to_json(obj) == expected_json
 
 
+@pytest.mark.parametrize("value", [None, 3, [1, 2]])
+def test_compiled_json_encoder(value: Any):
+    """
+    Test that the compiled dataclass encoders match `JSONEncoder.Field.apply` for every
+    combination of field settings.
+    """
+    for (
+        name,
+        cast_type,
+        skip_string_convert,
+        to_json_,
+        default,
+        default_skip_cast,
+        keep_none,
+    ) in product(
+        [None, "renamed"],
+        [None, str, lambda _: None],
+        [False, True],
+        [False, True],
+        [None, 5],
+        [None, "0x"],
+        [False, True],
+    ):
+        settings = JSONEncoder.Field(
+            name=name,
+            cast_type=cast_type,
+            skip_string_convert=skip_string_convert,
+            to_json=to_json_,
+            default_value=default,
+            default_value_skip_cast=default_skip_cast,
+            keep_none=keep_none,
+        )
+
+        @dataclass
+        class Encoded:
+            value: Any = field(json_encoder=settings)
+
+        expected: Dict[str, Any] = {}
+        encoder = JSONEncoder()
+        settings.apply(encoder, expected, fields(Encoded)[0].name, value)
+        assert to_json(Encoded(value)) == expected, settings
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        Account(nonce=1, storage={1: 2}),
+        Environment(withdrawals=[Withdrawal(index=0, validator=1, address=0x100, amount=2)]),
+        Transaction(to=0x100, access_list=[AccessList(address=0x100, storage_keys=[1])]),
+        FixtureTransaction.from_transaction(
+            Transaction(to=0x100, access_list=[]).with_signature_and_sender()
+        ),
+    ],
+    ids=lambda obj: type(obj).__name__,
+)
+def test_slotted_dataclass_copies(obj: Any):
+    """
+    Test that the slotted dataclasses have no instance dictionary, and that their copies are
+    equal to the original, sharing its attributes only for shallow copies.
+    """
+    assert not hasattr(obj, "__dict__")
+    shallow, deep = copy(obj), deepcopy(obj)
+    assert type(shallow) is type(deep) is type(obj)
+    assert shallow == obj and deep == obj
+    assert to_json(shallow) == to_json(deep) == to_json(obj)
+    mutable_fields = [
+        f.name for f in fields(obj) if isinstance(getattr(obj, f.name), (list, dict, Storage))
+    ]
+    assert mutable_fields
+    for name in mutable_fields:
+        assert getattr(shallow, name) is getattr(obj, name)
+        assert getattr(deep, name) is not getattr(obj, name)
+
+
 @pytest.mark.parametrize(
     ["invalid_tx_args", "expected_exception", "expected_exception_substring"],
     [
@@ -1194,3 +1275,67 @@ def test_transaction_post_init_defaults(tx_args, expected_attributes_and_values)
     for attr, val in expected_attributes_and_values:
         assert hasattr(tx, attr)
         assert getattr(tx, attr) == val
+
+
+def test_transaction_memoized_encodings():
+    """
+    Test that the memoized encodings of a transaction are recomputed when one of its fields
+    is assigned, and carried over to its unmodified copies.
+    """
+    tx = Transaction(ty=1, to=0x100, access_list=[]).with_signature_and_sender()
+    serialized = tx.serialized_bytes()
+    assert tx.serialized_bytes() is serialized
+    assert copy(tx).serialized_bytes() is serialized
+    assert FixtureTransaction.from_transaction(tx).serialized_bytes() is serialized
+
+    tx.nonce = 1
+    assert tx.serialized_bytes() != serialized
+    assert (
+        tx.serialized_bytes()
+        == Transaction(
+            ty=1, to=0x100, access_list=[], nonce=1, v=tx.v, r=tx.r, s=tx.s
+        ).serialized_bytes()
+    )
+
+    signing_bytes = tx.signing_bytes()
+    tx.access_list = tx.access_list + [AccessList(address=0x100, storage_keys=[1])]
+    assert tx.signing_bytes() != signing_bytes
+
+    modified = copy(tx)
+    modified.chain_id = 2
+    assert modified.signing_bytes() != tx.signing_bytes()
+    assert tx.signing_bytes() is tx.signing_bytes()
+
+
+def test_transaction_signature_cache():
+    """
+    Test that a transaction signed again with the same key reuses the cached signature.
+    """
+    tx = Transaction(to=0x100, nonce=7)
+    signed = tx.with_signature_and_sender()
+    hits = sign_transaction.cache_info().hits
+    signed_again = deepcopy(tx).with_signature_and_sender()
+    assert sign_transaction.cache_info().hits == hits + 1
+    assert signed_again == signed
+    assert signed_again.sender == signed.sender
+
+    other = Transaction(to=0x100, nonce=7, secret_key=TestPrivateKey2)
+    assert other.with_signature_and_sender().sender != signed.sender
+
+
+@pytest.mark.parametrize("processes", [False, True], ids=["threads", "processes"])
+def test_sign_transactions(processes: bool):
+    """
+    Test that transactions signed in parallel are the same, in the same order, as those
+    signed one by one.
+    """
+    txs = [
+        Transaction(to=0x100, nonce=i, secret_key=TestPrivateKey2 if i % 2 else None)
+        for i in range(PARALLEL_SIGNING_THRESHOLD + 3)
+    ]
+    txs[1] = txs[1].with_signature_and_sender()
+    sign_transaction.cache_clear()
+    signed = sign_transactions(txs, workers=2, processes=processes)
+    assert signed == [tx.with_signature_and_sender() for tx in txs]
+    assert [tx.sender for tx in signed] == [tx.with_signature_and_sender().sender for tx in txs]
+    assert all(tx.v is None for tx in txs if tx is not txs[1])
@@ -4,20 +4,31 @@ Library of Python wrappers for the different implementations of transition tools
 
 from .besu import BesuTransitionTool
 from .evmone import EvmOneTransitionTool
-from .execution_specs import ExecutionSpecsTransitionTool
+from .execution_specs import ExecutionSpecsInProcessTransitionTool, ExecutionSpecsTransitionTool
 from .geth import GethTransitionTool
+from .json_codec import JSONCodec
 from .nimbus import NimbusTransitionTool
-from .transition_tool import TransitionTool, TransitionToolNotFoundInPath, UnknownTransitionTool
+from .transition_tool import (
+    TransitionTool,
+    TransitionToolNotFoundInPath,
+    TransitionToolOutput,
+    TransitionToolRequest,
+    UnknownTransitionTool,
+)
 
 TransitionTool.set_default_tool(GethTransitionTool)
 
 __all__ = (
     "BesuTransitionTool",
     "EvmOneTransitionTool",
+    "ExecutionSpecsInProcessTransitionTool",
     "ExecutionSpecsTransitionTool",
     "GethTransitionTool",
+    "JSONCodec",
     "NimbusTransitionTool",
     "TransitionTool",
     "TransitionToolNotFoundInPath",
+    "TransitionToolOutput",
+    "TransitionToolRequest",
     "UnknownTransitionTool",
 )
@@ -3,21 +3,218 @@ Hyperledger Besu Transition tool frontend.
 """
 
 import re
+import socket
 import subprocess
+import time
 from pathlib import Path
+from queue import Empty, Queue
 from re import compile
-from typing import Any, Dict, List, Optional, Tuple
+from threading import Event, Thread
+from typing import IO, Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ethereum_test_forks import Fork
 
+from .metrics import phase
+from .probe import probe
 from .transition_tool import TransitionTool, dump_files_to_directory
 
+DEFAULT_REQUEST_TIMEOUT = 5.0
+DEFAULT_STARTUP_TIMEOUT = 30.0
+
+
+class BesuServerError(Exception):
+    """Exception raised when a Besu `t8n-server` fails to start or to serve a request"""
+
+    pass
+
+
+class BesuServer:
+    """
+    A single `t8n-server` process, listening on a port assigned by the OS, and the keep-alive
+    HTTP session used to talk to it.
+
+    The process is (re)started lazily, so a server that crashed is transparently replaced on
+    the next request.
+    """
+
+    binary: Path
+    process: Optional[subprocess.Popen] = None
+    session: Optional[requests.Session] = None
+    port: Optional[int] = None
+
+    def __init__(self, *, binary: Path, startup_timeout: float = DEFAULT_STARTUP_TIMEOUT):
+        self.binary = binary
+        self.startup_timeout = startup_timeout
+
+    @property
+    def url(self) -> str:
+        """
+        Returns the URL the server is listening on.
+        """
+        return f"http://localhost:{self.port}/"
+
+    def is_alive(self) -> bool:
+        """
+        Returns True if the server process is running.
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def is_healthy(self) -> bool:
+        """
+        Returns True if the server process is running and accepting connections.
+        """
+        if not self.is_alive() or self.port is None:
+            return False
+        try:
+            socket.create_connection(("localhost", self.port), timeout=1).close()
+        except OSError:
+            return False
+        return True
+
+    def start(self) -> None:
+        """
+        Starts the server process and waits until it reports the port it listens on.
+        """
+        self.process = subprocess.Popen(
+            args=[
+                str(self.binary),
+                "t8n-server",
+                "--port=0",  # OS assigned server port
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        assert self.process.stdout is not None
+        lines: "Queue[str]" = Queue()
+        started = Event()
+
+        def read_output(stream: IO[bytes]) -> None:
+            # Once started, the server output is discarded, so it must not fill up the pipe.
+            try:
+                for line in stream:
+                    if not started.is_set():
+                        lines.put(line.decode(errors="replace"))
+            except (OSError, ValueError):
+                pass
+            lines.put("")
+
+        Thread(target=read_output, args=(self.process.stdout,), daemon=True).start()
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                line = lines.get(timeout=max(0.0, deadline - time.monotonic()))
+            except Empty:
+                self.stop()
+                raise BesuServerError("Timed out waiting for the Besu `t8n-server` to start")
+            if not line or "Failed to start transition server" in line:
+                self.stop()
+                raise BesuServerError("Failed starting Besu subprocess\n" + line)
+            if match := re.search("Transition server listening on ([0-9]+)", line):
+                self.port = int(match.group(1))
+                started.set()
+                break
+        while not self.is_healthy():
+            if not self.is_alive() or time.monotonic() > deadline:
+                self.stop()
+                raise BesuServerError("Besu `t8n-server` is not accepting connections")
+            time.sleep(0.01)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+        self.session.mount("http://", adapter)
+
+    def request(self, message: Dict[str, Any], *, timeout: float) -> Dict[str, Any]:
+        """
+        Sends a request to the server and returns its response, restarting the server first if
+        it is not running.
+        """
+        if not self.is_alive():
+            self.stop()
+            self.start()
+        assert self.session is not None
+        try:
+            response = self.session.post(self.url, json=message, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # The server is in an unknown state, replace it on the next request.
+            self.stop()
+            raise BesuServerError(f"Besu `t8n-server` request failed: {e}") from e
+        response.raise_for_status()  # exception visible in pytest failure output
+        return response.json()
+
+    def stop(self) -> None:
+        """
+        Stops the server process and closes its session.
+        """
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            if self.process.stdout is not None:
+                self.process.stdout.close()
+            self.process = None
+        self.port = None
+
+
+class BesuServerPool:
+    """
+    Keeps a fixed number of Besu `t8n-server` processes and dispatches requests to the first
+    idle one.
+
+    A request that fails because its server crashed or stopped responding is retried once on
+    a restarted server. The pool is safe to use from multiple threads.
+    """
+
+    servers: List[BesuServer]
+    idle_servers: "Queue[BesuServer]"
+
+    def __init__(
+        self,
+        *,
+        binary: Path,
+        servers: int,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+    ):
+        if servers < 1:
+            raise ValueError("a server pool requires at least one server")
+        self.servers = [
+            BesuServer(binary=binary, startup_timeout=startup_timeout) for _ in range(servers)
+        ]
+        self.idle_servers = Queue()
+        for server in self.servers:
+            self.idle_servers.put(server)
+
+    def request(self, message: Dict[str, Any], *, timeout: float) -> Dict[str, Any]:
+        """
+        Sends a request to an idle server and returns its response.
+        """
+        server = self.idle_servers.get()
+        try:
+            try:
+                return server.request(message, timeout=timeout)
+            except BesuServerError:
+                return server.request(message, timeout=timeout)
+        finally:
+            self.idle_servers.put(server)
+
+    def shutdown(self) -> None:
+        """
+        Stops all server processes.
+        """
+        for server in self.servers:
+            server.stop()
+
 
 class BesuTransitionTool(TransitionTool):
     """
     Besu EvmTool Transition tool frontend wrapper class.
+
+    State transitions are served by long-lived `t8n-server` processes: a single one by default,
+    or one per worker started with `start_worker_pool`.
     """
 
     default_binary = Path("evm")
@@ -26,8 +223,8 @@ class BesuTransitionTool(TransitionTool):
     binary: Path
     cached_version: Optional[str] = None
     trace: bool
-    process: Optional[subprocess.Popen] = None
-    server_url: str
+    server_pool: Optional[BesuServerPool] = None
+    request_timeout: float = DEFAULT_REQUEST_TIMEOUT
 
     def __init__(
         self,
@@ -38,63 +235,68 @@ class BesuTransitionTool(TransitionTool):
         super().__init__(binary=binary, trace=trace)
         args = [str(self.binary), "t8n", "--help"]
         try:
-            result = subprocess.run(args, capture_output=True, text=True)
+            result = probe(args)
         except subprocess.CalledProcessError as e:
             raise Exception("evm process unexpectedly returned a non-zero status code: " f"{e}.")
         except Exception as e:
             raise Exception(f"Unexpected exception calling evm tool: {e}.")
         self.help_string = result.stdout
 
-    def start_server(self):
+    def start_server(self, *, servers: int = 1):
         """
-        Starts the t8n-server process, extracts the port, and leaves it running for future re-use.
+        Starts a pool of `servers` t8n-server processes, left running for future re-use.
+
+        Every process listens on a port assigned by the OS, so independent pools, e.g. one per
+        xdist worker, can run side by side.
         """
-        self.process = subprocess.Popen(
-            args=[
-                str(self.binary),
-                "t8n-server",
-                "--port=0",  # OS assigned server port
-            ],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-        )
+        if self.server_pool is not None:
+            self.server_pool.shutdown()
+        self.server_pool = BesuServerPool(binary=self.binary, servers=servers)
 
-        while True:
-            line = str(self.process.stdout.readline())
+    def start_worker_pool(self, *, workers: int, command: Optional[List[str]] = None):
+        """
+        Starts `workers` t8n-server processes, unless a custom worker `command` is given.
+        """
+        if command is not None:
+            return super().start_worker_pool(workers=workers, command=command)
+        self.start_server(servers=workers)
 
-            if not line or "Failed to start transition server" in line:
-                raise Exception("Failed starting Besu subprocess\n" + line)
-            if "Transition server listening on" in line:
-                port = re.search("Transition server listening on ([0-9]+)", line).group(1)
-                self.server_url = f"http://localhost:{port}/"
-                break
+    def batch_concurrency(self) -> int:
+        """
+        A batch is spread over the `t8n-server` processes, each with its own keep-alive session.
+        """
+        if self.worker_pool is not None:
+            return super().batch_concurrency()
+        if self.server_pool is not None:
+            return len(self.server_pool.servers)
+        return 1
 
     def shutdown(self):
         """
-        Stops the t8n-server process if it was started
+        Stops the t8n-server processes if they were started
         """
-        if self.process:
-            self.process.kill()
+        if self.server_pool is not None:
+            self.server_pool.shutdown()
+            self.server_pool = None
+        super().shutdown()
 
-    def evaluate(
+    def _evaluate(
         self,
+        *,
         alloc: Any,
         txs: Any,
         env: Any,
         fork_name: str,
-        chain_id: int = 1,
-        reward: int = 0,
-        eips: Optional[List[int]] = None,
-        debug_output_path: str = "",
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Executes `evm t8n` with the specified arguments.
         """
-        if not self.process:
+        if self.server_pool is None:
             self.start_server()
-
-        if eips is not None:
-            fork_name = "+".join([fork_name] + [str(eip) for eip in eips])
+        assert self.server_pool is not None
 
         if self.trace:
             raise Exception("Besu `t8n-server` does not support tracing.")
@@ -118,16 +320,14 @@ class BesuTransitionTool(TransitionTool):
                 },
             )
 
-        response = requests.post(
-            self.server_url,
-            json={
-                "state": state_json,
-                "input": input_json,
-            },
-            timeout=5,
-        )
-        response.raise_for_status()  # exception visible in pytest failure output
-        output = response.json()
+        with phase("execute"):
+            output = self.server_pool.request(
+                {
+                    "state": state_json,
+                    "input": input_json,
+                },
+                timeout=self.request_timeout,
+            )
 
         if debug_output_path:
             dump_files_to_directory(
@@ -140,6 +340,12 @@ class BesuTransitionTool(TransitionTool):
 
         return output["alloc"], output["result"]
 
+    async def _evaluate_async(self, **kwargs: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Requests to the `t8n-server` are sent from a thread.
+        """
+        return await self._evaluate_in_executor(**kwargs)
+
     def is_fork_supported(self, fork: Fork) -> bool:
         """
         Returns True if the fork is supported by the tool
@@ -0,0 +1,167 @@
+"""
+Content-addressed on-disk cache of transition tool results.
+
+Every entry is stored in its own file, named after the SHA-256 hash of the canonical JSON
+encoding of the transition inputs and the version of the tool that produced it. Entries are
+written atomically, so the same directory can be shared by concurrent processes, e.g. the
+workers of `pytest-xdist`, and between sessions.
+
+The least recently used entries are evicted once the total size of the cache exceeds its
+limit; the modification time of an entry is updated every time it is read.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+ENTRY_SUFFIX = ".json"
+
+
+@dataclass(kw_only=True)
+class TransitionToolCacheStats:
+    """
+    Hit/miss counters of a transition tool cache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    def update(self, other: "TransitionToolCacheStats") -> None:
+        """
+        Adds the counters of another instance to this one.
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Fraction of the cache requests that were hits.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TransitionToolCache:
+    """
+    On-disk cache of transition tool results, bounded in size with LRU eviction.
+
+    The statistics and the size accounting are shared by the threads using the cache.
+    """
+
+    directory: Path
+    max_size: int
+    stats: TransitionToolCacheStats
+    lock: Lock
+
+    def __init__(self, *, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.stats = TransitionToolCacheStats()
+        self.lock = Lock()
+        self.size = self.disk_usage()
+
+    @staticmethod
+    def key(*, version: str, request: Dict[str, Any]) -> str:
+        """
+        Returns the key of a request to a tool of the given version.
+
+        The request is encoded canonically, so keys do not depend on the order in which the
+        dictionaries were built.
+        """
+        canonical = json.dumps(
+            {"version": version, "request": request}, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """
+        Returns the path of the entry of the given key.
+        """
+        return self.directory / key[:2] / (key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached value of the given key, or None if it is not cached.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            # Never written, or evicted by another process in the meantime.
+            value = None
+        except json.JSONDecodeError:
+            path.unlink(missing_ok=True)
+            value = None
+        with self.lock:
+            if value is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Stores the value of the given key, evicting old entries if the cache is full.
+        """
+        path = self.path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f, separators=(",", ":"))
+                size = f.tell()
+            # An overwritten entry no longer counts towards the size of the cache.
+            try:
+                replaced_size = path.stat().st_size
+            except FileNotFoundError:
+                replaced_size = 0
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        with self.lock:
+            self.size += size - replaced_size
+            if self.size > self.max_size:
+                self.evict()
+
+    def entries(self) -> Iterator[Tuple[Path, os.stat_result]]:
+        """
+        Yields the path and stat result of every entry in the cache.
+        """
+        for path in self.directory.glob("*/*" + ENTRY_SUFFIX):
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:
+                continue
+
+    def disk_usage(self) -> int:
+        """
+        Returns the total size of the entries in the cache.
+        """
+        return sum(stat.st_size for _, stat in self.entries())
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache is below 90% of its maximum
+        size, leaving room for new entries before the next eviction.
+
+        Must be called with the lock held.
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry[1].st_mtime)
+        self.size = sum(stat.st_size for _, stat in entries)
+        target = self.max_size * 9 // 10
+        for path, stat in entries:
+            if self.size <= target:
+                break
+            path.unlink(missing_ok=True)
+            self.size -= stat.st_size
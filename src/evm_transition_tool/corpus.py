@@ -0,0 +1,134 @@
+"""
+Replay corpus of transition tool calls.
+
+When capture is enabled on a transition tool, the full inputs of every call slower than a
+latency threshold, or of a random sample of the calls, are appended to a compressed JSON
+lines file in the corpus directory. Every process writes its own file and every record is
+written as a separate gzip member, so the corpus can be shared by the workers of
+`pytest-xdist` and stays readable if a session is interrupted.
+
+The corpus can be replayed against other transition tool binaries with the `t8n_replay`
+entry point, to compare their throughput and latencies offline.
+"""
+
+import gzip
+import json
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional
+
+from .metrics import current_labels
+
+CORPUS_SUFFIX = ".jsonl.gz"
+
+
+@dataclass(kw_only=True)
+class CorpusEntry:
+    """
+    Inputs of a captured state transition, along with the latency it was captured with.
+    """
+
+    alloc: Any
+    txs: Any
+    env: Any
+    fork_name: str
+    chain_id: int = 1
+    reward: int = 0
+    wall_time: float = 0.0
+    labels: Dict[str, str] = field(default_factory=dict)
+
+    def evaluate_arguments(self) -> Dict[str, Any]:
+        """
+        Returns the arguments to replay the transition with `TransitionTool.evaluate`.
+        """
+        return {
+            "alloc": self.alloc,
+            "txs": self.txs,
+            "env": self.env,
+            "fork_name": self.fork_name,
+            "chain_id": self.chain_id,
+            "reward": self.reward,
+        }
+
+
+class TransitionToolCorpus:
+    """
+    Appends the inputs of slow or sampled transition tool calls to a replay corpus.
+    """
+
+    directory: Path
+    threshold: Optional[float]
+    sample_rate: float
+    captured: int
+
+    def __init__(
+        self, *, directory: Path, threshold: Optional[float] = None, sample_rate: float = 0.0
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.captured = 0
+        self.lock = Lock()
+        self.random = random.Random()
+
+    @property
+    def path(self) -> Path:
+        """
+        Returns the corpus file of the current process.
+        """
+        return self.directory / f"t8n-{os.getpid()}{CORPUS_SUFFIX}"
+
+    def should_capture(self, wall_time: float) -> bool:
+        """
+        Returns whether a call that took the given time must be captured.
+        """
+        if self.threshold is not None and wall_time >= self.threshold:
+            return True
+        return self.sample_rate > 0 and self.random.random() < self.sample_rate
+
+    def capture(self, *, wall_time: float, **kwargs: Any) -> bool:
+        """
+        Appends the inputs of a call to the corpus if it is slow enough or sampled, and
+        returns whether it was captured.
+        """
+        if not self.should_capture(wall_time):
+            return False
+        entry = CorpusEntry(wall_time=wall_time, labels=current_labels.get(), **kwargs)
+        line = json.dumps(asdict(entry), separators=(",", ":")) + "\n"
+        with self.lock:
+            with gzip.open(self.path, "at") as f:
+                f.write(line)
+            self.captured += 1
+        return True
+
+
+def corpus_files(paths: List[Path]) -> List[Path]:
+    """
+    Returns the corpus files of the given files or directories.
+    """
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(path.glob(f"*{CORPUS_SUFFIX}"))
+        else:
+            files.append(path)
+    return files
+
+
+def read_corpus(paths: List[Path]) -> Iterator[CorpusEntry]:
+    """
+    Yields the entries of the corpus files of the given files or directories.
+    """
+    for path in corpus_files(paths):
+        with gzip.open(path, "rt") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        yield CorpusEntry(**json.loads(line))
+            except (EOFError, ValueError):
+                # The last record of an interrupted session may be incomplete.
+                pass
@@ -3,24 +3,31 @@ Evmone Transition tool interface.
 """
 import json
 import os
-import shutil
 import subprocess
-import tempfile
 from pathlib import Path
 from re import compile
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from ethereum_test_forks import Fork
 
+from .metrics import phase
 from .transition_tool import TransitionTool, dump_files_to_directory
 
 
 def write_json_file(data: Dict[str, Any], file_path: str) -> None:
     """
-    Write a JSON file to the given path.
+    Write a compact JSON file to the given path.
     """
     with open(file_path, "w") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_json_file(file_path: str) -> Any:
+    """
+    Read a JSON file from the given path.
+    """
+    with open(file_path, "r") as f:
+        return json.load(f)
 
 
 class EvmOneTransitionTool(TransitionTool):
@@ -43,120 +50,94 @@ class EvmOneTransitionTool(TransitionTool):
     ):
         super().__init__(binary=binary, trace=trace)
 
-    def evaluate(
+    def _evaluate(
         self,
         *,
         alloc: Any,
         txs: Any,
         env: Any,
         fork_name: str,
-        chain_id: int = 1,
-        reward: int = 0,
-        eips: Optional[List[int]] = None,
-        debug_output_path: str = "",
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Executes `evmone-t8n` with the specified arguments.
         """
-        if eips is not None:
-            fork_name = "+".join([fork_name] + [str(eip) for eip in eips])
-
-        temp_dir = tempfile.TemporaryDirectory()
-
-        input_contents = {
-            "alloc": alloc,
-            "env": env,
-            "txs": txs,
-        }
-        input_paths = {
-            k: os.path.join(temp_dir.name, f"input_{k}.json") for k in input_contents.keys()
-        }
-        for key, val in input_contents.items():
-            file_path = os.path.join(temp_dir.name, f"input_{key}.json")
-            write_json_file(val, file_path)
-
-        # Construct args for evmone-t8n binary
-        args = [
-            str(self.binary),
-            "--state.fork",
-            fork_name,
-            "--input.alloc",
-            input_paths["alloc"],
-            "--input.env",
-            input_paths["env"],
-            "--input.txs",
-            input_paths["txs"],
-            "--output.basedir",
-            temp_dir.name,
-            "--output.result",
-            "output_result.json",
-            "--output.alloc",
-            "output_alloc.json",
-            "--output.body",
-            "txs.rlp",
-            "--state.reward",
-            str(reward),
-            "--state.chainid",
-            str(chain_id),
-        ]
-
-        if self.trace:
-            args.append("--trace")
-
-        result = subprocess.run(
-            args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        if debug_output_path:
-            dump_files_to_directory(
-                debug_output_path,
-                input_contents
-                | {
-                    "args": args,
-                    "stdout": result.stdout.decode(),
-                    "stderr": result.stderr.decode(),
-                    "returncode": result.returncode,
-                },
-            )
-
-        if result.returncode != 0:
-            raise Exception("failed to evaluate: " + result.stderr.decode())
-
-        output_paths = {
-            "alloc": os.path.join(temp_dir.name, "output_alloc.json"),
-            "result": os.path.join(temp_dir.name, "output_result.json"),
-        }
-
-        output_contents = {}
-        for key, file_path in output_paths.items():
-            with open(file_path, "r+") as file:
-                contents = json.load(file)
-                file.seek(0)
-                json.dump(contents, file, ensure_ascii=False, indent=4)
-                file.truncate()
-                output_contents[key] = contents
-
-        if self.trace:
-            receipts: List[Any] = output_contents["result"]["receipts"]
-            traces: List[List[Dict]] = []
-            for i, r in enumerate(receipts):
-                h = r["transactionHash"]
-                trace_file_name = f"trace-{i}-{h}.jsonl"
-                if debug_output_path:
-                    shutil.copy(
-                        os.path.join(temp_dir.name, trace_file_name),
-                        os.path.join(debug_output_path, trace_file_name),
+        with self.scratch.directory() as temp_dir:
+            input_contents = {
+                "alloc": alloc,
+                "env": env,
+                "txs": txs,
+            }
+            input_paths = {
+                k: os.path.join(temp_dir, f"input_{k}.json") for k in input_contents.keys()
+            }
+            with phase("encode"):
+                for key, val in input_contents.items():
+                    write_json_file(val, input_paths[key])
+
+            # Construct args for evmone-t8n binary
+            args = [
+                str(self.binary),
+                "--state.fork",
+                fork_name,
+                "--input.alloc",
+                input_paths["alloc"],
+                "--input.env",
+                input_paths["env"],
+                "--input.txs",
+                input_paths["txs"],
+                "--output.basedir",
+                temp_dir,
+                "--output.result",
+                "output_result.json",
+                "--output.alloc",
+                "output_alloc.json",
+                "--output.body",
+                "txs.rlp",
+                "--state.reward",
+                str(reward),
+                "--state.chainid",
+                str(chain_id),
+            ]
+
+            if self.trace:
+                args.append("--trace")
+
+            with phase("execute"):
+                result = subprocess.run(
+                    args,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+
+            if debug_output_path:
+                dump_files_to_directory(
+                    debug_output_path,
+                    input_contents
+                    | {
+                        "args": args,
+                        "stdout": result.stdout.decode(),
+                        "stderr": result.stderr.decode(),
+                        "returncode": result.returncode,
+                    },
+                )
+
+            if result.returncode != 0:
+                raise Exception("failed to evaluate: " + result.stderr.decode())
+
+            with phase("decode"):
+                output_contents = {
+                    "alloc": read_json_file(os.path.join(temp_dir, "output_alloc.json")),
+                    "result": read_json_file(os.path.join(temp_dir, "output_result.json")),
+                }
+
+            if self.trace:
+                with phase("traces"):
+                    self.collect_traces(
+                        output_contents["result"]["receipts"], temp_dir, debug_output_path
                     )
-                with open(os.path.join(temp_dir.name, trace_file_name), "r") as trace_file:
-                    tx_traces: List[Dict] = []
-                    for trace_line in trace_file.readlines():
-                        tx_traces.append(json.loads(trace_line))
-                    traces.append(tx_traces)
-            self.append_traces(traces)
-
-        temp_dir.cleanup()
 
         if debug_output_path:
             dump_files_to_directory(
@@ -169,6 +150,13 @@ class EvmOneTransitionTool(TransitionTool):
 
         return output_contents["alloc"], output_contents["result"]
 
+    async def _evaluate_async(self, **kwargs: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        `evmone-t8n` exchanges its inputs and outputs through files, so transitions are
+        evaluated in a thread.
+        """
+        return await self._evaluate_in_executor(**kwargs)
+
     def is_fork_supported(self, fork: Fork) -> bool:
         """
         Returns True if the fork is supported by the tool.
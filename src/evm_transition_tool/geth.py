@@ -9,6 +9,7 @@ from typing import Optional
 
 from ethereum_test_forks import Fork
 
+from .probe import probe
 from .transition_tool import TransitionTool
 
 
@@ -34,7 +35,7 @@ class GethTransitionTool(TransitionTool):
         super().__init__(binary=binary, trace=trace)
         args = [str(self.binary), str(self.t8n_subcommand), "--help"]
         try:
-            result = subprocess.run(args, capture_output=True, text=True)
+            result = probe(args)
         except subprocess.CalledProcessError as e:
             raise Exception("evm process unexpectedly returned a non-zero status code: " f"{e}.")
         except Exception as e:
@@ -0,0 +1,53 @@
+"""
+JSON codec used to exchange the inputs and outputs of the transition tools over pipes.
+
+The default codec encodes the inputs at once with the C encoder of the standard library, and
+writes them to the pipe in fixed-size chunks, so that the tool can start reading them while the
+rest is written. Faster JSON libraries can be plugged in by assigning an instance of a subclass
+to `TransitionTool.json_codec`.
+"""
+
+import json
+from typing import IO, Any, Iterator
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class JSONCodec:
+    """
+    Standard library JSON codec writing its output in chunks.
+    """
+
+    chunk_size: int
+
+    def __init__(self, *, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def encode(self, obj: Any) -> bytes:
+        """
+        Returns the encoding of the object.
+        """
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def chunks(self, data: bytes) -> Iterator[bytes]:
+        """
+        Yields the encoded data in chunks of `chunk_size` bytes.
+        """
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start : start + self.chunk_size]
+
+    def dump(self, obj: Any, stream: IO[bytes]) -> int:
+        """
+        Writes the encoding of the object to the stream, one chunk at a time, and returns the
+        number of bytes written.
+        """
+        data = self.encode(obj)
+        for chunk in self.chunks(data):
+            stream.write(chunk)
+        return len(data)
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decodes a single document.
+        """
+        return json.loads(data)
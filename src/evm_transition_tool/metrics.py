@@ -0,0 +1,222 @@
+"""
+Per-call instrumentation of the transition tools.
+
+When metrics are enabled on a transition tool, every call to `evaluate` records its wall time,
+the time spent in each of its phases (e.g. spawning the tool, executing it, decoding its
+output, loading traces), the size of the encoded input and output, the fork, and the labels
+set by the caller with `metric_labels`, such as the id of the test being filled.
+
+Calls are aggregated into a report with latency percentiles per fork and label, rendered as
+JSON or as a Prometheus textfile.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass(kw_only=True)
+class TransitionToolCall:
+    """
+    Metrics of a single state transition.
+    """
+
+    fork: str
+    labels: Dict[str, str]
+    wall_time: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    stdin_bytes: int = 0
+    stdout_bytes: int = 0
+    cached: bool = False
+
+
+current_labels: ContextVar[Dict[str, str]] = ContextVar("t8n_metric_labels", default={})
+current_call: ContextVar[Optional[TransitionToolCall]] = ContextVar("t8n_call", default=None)
+
+
+@contextmanager
+def metric_labels(**labels: str) -> Iterator[None]:
+    """
+    Adds labels to the calls evaluated within the context, in the current thread or task.
+    """
+    token = current_labels.set(current_labels.get() | labels)
+    try:
+        yield
+    finally:
+        current_labels.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Adds the time spent within the context to the given phase of the current call, if any.
+    """
+    call = current_call.get()
+    if call is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        call.phases[name] = call.phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def count_bytes(*, stdin: int = 0, stdout: int = 0) -> None:
+    """
+    Adds to the input and output sizes of the current call, if any.
+    """
+    call = current_call.get()
+    if call is not None:
+        call.stdin_bytes += stdin
+        call.stdout_bytes += stdout
+
+
+def mark_cached() -> None:
+    """
+    Marks the current call, if any, as served from the cache.
+    """
+    call = current_call.get()
+    if call is not None:
+        call.cached = True
+
+
+class TransitionToolMetrics:
+    """
+    Collects the metrics of the calls of a transition tool; safe to use from multiple threads.
+    """
+
+    calls: List[TransitionToolCall]
+
+    def __init__(self):
+        self.calls = []
+        self.lock = Lock()
+
+    @contextmanager
+    def call(self, *, fork: str) -> Iterator[TransitionToolCall]:
+        """
+        Records a call evaluated within the context.
+        """
+        call = TransitionToolCall(fork=fork, labels=current_labels.get())
+        token = current_call.set(call)
+        start = time.perf_counter()
+        try:
+            yield call
+        finally:
+            call.wall_time = time.perf_counter() - start
+            current_call.reset(token)
+            with self.lock:
+                self.calls.append(call)
+
+    def to_json(self) -> List[Dict[str, Any]]:
+        """
+        Returns the recorded calls as JSON serializable dictionaries.
+        """
+        with self.lock:
+            return [asdict(call) for call in self.calls]
+
+
+def percentiles(values: Sequence[float]) -> Dict[str, float]:
+    """
+    Returns the nearest-rank percentiles, sum, count and maximum of the values.
+    """
+    ordered = sorted(values)
+    summary: Dict[str, float] = {"count": len(ordered), "sum": sum(ordered)}
+    if not ordered:
+        return summary
+    for q in QUANTILES:
+        summary[f"p{q * 100:g}"] = ordered[max(0, -(-round(q * 100) * len(ordered) // 100) - 1)]
+    summary["max"] = ordered[-1]
+    return summary
+
+
+def summarize(
+    calls: Sequence[Dict[str, Any]], *, group_by: Sequence[str] = ("spec",), slowest: int = 20
+) -> Dict[str, Any]:
+    """
+    Aggregates the calls, as returned by `TransitionToolMetrics.to_json`, per fork and per
+    value of the given labels.
+
+    Latencies and sizes only account for the calls that invoked the tool, calls served from
+    the cache are only counted.
+    """
+    groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for call in calls:
+        key = (call["fork"],) + tuple(call["labels"].get(label, "") for label in group_by)
+        groups.setdefault(key, []).append(call)
+
+    summary_groups = []
+    for key, group_calls in sorted(groups.items()):
+        evaluated = [c for c in group_calls if not c["cached"]]
+        phases = sorted({name for c in evaluated for name in c["phases"]})
+        summary_groups.append(
+            {
+                "fork": key[0],
+                "labels": dict(zip(group_by, key[1:])),
+                "calls": len(group_calls),
+                "cached_calls": len(group_calls) - len(evaluated),
+                "wall_time": percentiles([c["wall_time"] for c in evaluated]),
+                "phases": {
+                    name: percentiles([c["phases"].get(name, 0.0) for c in evaluated])
+                    for name in phases
+                },
+                "stdin_bytes": percentiles([c["stdin_bytes"] for c in evaluated]),
+                "stdout_bytes": percentiles([c["stdout_bytes"] for c in evaluated]),
+            }
+        )
+    return {
+        "calls": len(calls),
+        "groups": summary_groups,
+        "slowest_calls": sorted(calls, key=lambda c: c["wall_time"], reverse=True)[:slowest],
+    }
+
+
+def prometheus_textfile(summary: Dict[str, Any], *, prefix: str = "t8n") -> str:
+    """
+    Renders a summary as Prometheus summaries in the text exposition format.
+    """
+    metrics = {
+        "call_duration_seconds": "Wall time of the transition tool calls.",
+        "phase_duration_seconds": "Time spent in each phase of the transition tool calls.",
+        "stdin_bytes": "Size of the encoded inputs of the transition tool calls.",
+        "stdout_bytes": "Size of the encoded outputs of the transition tool calls.",
+        "cached_calls_total": "Number of transition tool calls served from the cache.",
+    }
+    samples: Dict[str, List[str]] = {name: [] for name in metrics}
+
+    def labels(group: Dict[str, Any], **extra: str) -> str:
+        pairs = {"fork": group["fork"]} | group["labels"] | extra
+        return ",".join(f'{k}="{v}"' for k, v in pairs.items())
+
+    def add_summary(name: str, stats: Dict[str, float], group: Dict[str, Any], **extra: str):
+        for q in QUANTILES:
+            if (value := stats.get(f"p{q * 100:g}")) is not None:
+                samples[name].append(
+                    f"{prefix}_{name}{{{labels(group, **extra, quantile=f'{q:g}')}}} {value:g}"
+                )
+        samples[name].append(f"{prefix}_{name}_sum{{{labels(group, **extra)}}} {stats['sum']:g}")
+        samples[name].append(
+            f"{prefix}_{name}_count{{{labels(group, **extra)}}} {stats['count']:g}"
+        )
+
+    for group in summary["groups"]:
+        add_summary("call_duration_seconds", group["wall_time"], group)
+        for phase_name, stats in group["phases"].items():
+            add_summary("phase_duration_seconds", stats, group, phase=phase_name)
+        add_summary("stdin_bytes", group["stdin_bytes"], group)
+        add_summary("stdout_bytes", group["stdout_bytes"], group)
+        samples["cached_calls_total"].append(
+            f"{prefix}_cached_calls_total{{{labels(group)}}} {group['cached_calls']}"
+        )
+
+    lines = []
+    for name, help_text in metrics.items():
+        kind = "counter" if name.endswith("_total") else "summary"
+        lines += [f"# HELP {prefix}_{name} {help_text}", f"# TYPE {prefix}_{name} {kind}"]
+        lines += samples[name]
+    return "\n".join(lines) + "\n"
@@ -10,6 +10,7 @@ from typing import Optional
 
 from ethereum_test_forks import Fork
 
+from .probe import probe
 from .transition_tool import TransitionTool
 
 
@@ -35,7 +36,7 @@ class NimbusTransitionTool(TransitionTool):
         super().__init__(binary=binary, trace=trace)
         args = [str(self.binary), "--help"]
         try:
-            result = subprocess.run(args, capture_output=True, text=True)
+            result = probe(args)
         except subprocess.CalledProcessError as e:
             raise Exception("evm process unexpectedly returned a non-zero status code: " f"{e}.")
         except Exception as e:
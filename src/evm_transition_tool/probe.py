@@ -0,0 +1,135 @@
+"""
+Session-wide registry of the commands run to identify tools and their capabilities, e.g.
+`evm -v` or `evm t8n --help`.
+
+The output of a probe only depends on the binary, so it is recorded under the binary's path,
+modification time and size along with the probe's arguments, and every probe runs at most
+once per session. If persistence is enabled, the results of the successful probes are also
+stored in a JSON file, so that later sessions and the xdist workers do not run them at all;
+failed probes are run again by the next session.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Sequence
+
+
+@dataclass(kw_only=True)
+class ProbeResult:
+    """
+    Outputs of a probe.
+    """
+
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+class ToolProbes:
+    """
+    Results of the probes run against tool binaries.
+    """
+
+    results: Dict[str, ProbeResult]
+    path: Optional[Path] = None
+    runs: int
+
+    def __init__(self):
+        self.results = {}
+        self.lock = Lock()
+        self.runs = 0
+
+    def enable_persistence(self, path: Path) -> None:
+        """
+        Loads the results stored in the given file, and stores all new results in it.
+        """
+        self.path = Path(path)
+        with self.lock:
+            self.results.update(self.load())
+
+    def load(self) -> Dict[str, ProbeResult]:
+        """
+        Returns the results stored in the persistence file.
+        """
+        if self.path is None:
+            return {}
+        try:
+            with open(self.path) as f:
+                return {key: ProbeResult(**value) for key, value in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save(self) -> None:
+        """
+        Merges the results of the successful probes into the persistence file, which may be
+        shared by concurrent processes.
+        """
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        results = self.load() | {
+            key: result for key, result in self.results.items() if result.returncode == 0
+        }
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({key: asdict(value) for key, value in results.items()}, f, indent=1)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def key(args: Sequence[str | Path]) -> Optional[str]:
+        """
+        Returns the key of a probe, or None if its binary cannot be found.
+        """
+        binary = shutil.which(str(args[0]))
+        if binary is None:
+            return None
+        binary = os.path.realpath(binary)
+        try:
+            stat = os.stat(binary)
+        except OSError:
+            return None
+        return json.dumps([binary, stat.st_mtime_ns, stat.st_size] + [str(a) for a in args[1:]])
+
+    def run(self, args: Sequence[str | Path]) -> ProbeResult:
+        """
+        Returns the outputs of the given command, running it only if it was never run
+        against the same binary.
+        """
+        key = self.key(args)
+        if key is not None:
+            with self.lock:
+                if key in self.results:
+                    return self.results[key]
+        result = subprocess.run(args, capture_output=True)
+        self.runs += 1
+        probe_result = ProbeResult(
+            returncode=result.returncode,
+            stdout=(result.stdout or b"").decode(errors="replace"),
+            stderr=(result.stderr or b"").decode(errors="replace"),
+        )
+        if key is not None:
+            with self.lock:
+                self.results[key] = probe_result
+                if probe_result.returncode == 0:
+                    self.save()
+        return probe_result
+
+
+tool_probes = ToolProbes()
+
+
+def probe(args: Sequence[str | Path]) -> ProbeResult:
+    """
+    Runs a probe through the session-wide registry.
+    """
+    return tool_probes.run(args)
@@ -0,0 +1,125 @@
+"""
+Pure-Python reference server for the framed transition tool worker protocol.
+
+The server reads requests from stdin and writes responses to stdout until stdin is closed, see
+`evm_transition_tool.worker_pool` for the description of the protocol.
+
+The server only hosts the execution-specs transition tool, which stays loaded in its process
+between requests. Tools only available as a binary would still be started for every request,
+gaining nothing over evaluating the transitions directly.
+
+example: Usage
+    ```
+    # Serve requests using the execution-specs transition tool within the server process
+    python -m evm_transition_tool.reference_server --in-process
+    # Serve requests without any transition tool, returning the input allocation unchanged
+    python -m evm_transition_tool.reference_server --loopback
+    ```
+"""
+
+import argparse
+import sys
+from typing import IO, Any, Callable, Dict, Optional
+
+from .execution_specs import ExecutionSpecsInProcessTransitionTool
+from .transition_tool import TransitionTool
+from .worker_pool import read_frame, write_frame
+
+RequestHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def serve(handler: RequestHandler, in_stream: IO[bytes], out_stream: IO[bytes]) -> None:
+    """
+    Serves requests read from `in_stream` until it is closed.
+
+    Exceptions raised by the handler are sent back to the client as an error response instead
+    of terminating the server.
+    """
+    while (request := read_frame(in_stream)) is not None:
+        try:
+            response = handler(request)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        write_frame(out_stream, response)
+
+
+def loopback_handler(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the input allocation unchanged along with an empty result.
+
+    Useful to measure the overhead of the protocol itself and to exercise the worker pool
+    without any transition tool installed.
+    """
+    return {"alloc": request["input"]["alloc"], "result": {}}
+
+
+def transition_tool_handler(t8n: TransitionTool) -> RequestHandler:
+    """
+    Returns a handler that evaluates every request using the given transition tool.
+    """
+
+    def handler(request: Dict[str, Any]) -> Dict[str, Any]:
+        state = request["state"]
+        input = request["input"]
+        t8n.reset_traces()
+        alloc, result = t8n.evaluate(
+            alloc=input["alloc"],
+            txs=input["txs"],
+            env=input["env"],
+            fork_name=state["fork"],
+            chain_id=state.get("chainid", 1),
+            reward=state.get("reward", 0),
+        )
+        response: Dict[str, Any] = {"alloc": alloc, "result": result}
+        if (traces := t8n.get_traces()) is not None:
+            response["traces"] = traces
+        return response
+
+    return handler
+
+
+def main():
+    """
+    Main function.
+    """
+    parser = argparse.ArgumentParser(description="Transition tool worker reference server.")
+    tool_group = parser.add_mutually_exclusive_group(required=True)
+    tool_group.add_argument(
+        "--in-process",
+        action="store_true",
+        default=False,
+        help="Serve requests using the execution-specs transition tool in the server process.",
+    )
+    tool_group.add_argument(
+        "--loopback",
+        action="store_true",
+        default=False,
+        help="Serve requests without a transition tool, returning the input alloc unchanged.",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        default=False,
+        help="Collect and return the traces of every transition.",
+    )
+    args = parser.parse_args()
+
+    # The protocol owns stdout, anything else printed by the tool goes to stderr.
+    out_stream = sys.stdout.buffer
+    sys.stdout = sys.stderr
+
+    t8n: Optional[TransitionTool] = None
+    if args.loopback:
+        handler = loopback_handler
+    else:
+        t8n = ExecutionSpecsInProcessTransitionTool(trace=args.trace)
+        handler = transition_tool_handler(t8n)
+    try:
+        serve(handler, sys.stdin.buffer, out_stream)
+    finally:
+        if t8n is not None:
+            t8n.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Reusable scratch directories for the files exchanged with the transition tools.
+
+Creating and removing a temporary directory for every state transition costs several
+syscalls and, on most systems, disk writes. Instead, every transition borrows an empty
+directory from a pool, placed on a memory-backed filesystem when one is available with
+enough free space, and returns it emptied once done, so that only the files themselves are
+ever created.
+"""
+
+import os
+import shutil
+import tempfile
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Iterator, List, Optional
+
+MEMORY_BACKED_DIRECTORY = Path("/dev/shm")
+# Containers commonly mount a `/dev/shm` of only 64 MiB, which the outputs and traces of
+# concurrent transitions can fill up.
+MEMORY_BACKED_MIN_FREE_SPACE = 1024 * 1024 * 1024
+
+
+def default_scratch_root() -> str:
+    """
+    Returns the directory the scratch directories are created in: `/dev/shm` if it is
+    writable and has at least `MEMORY_BACKED_MIN_FREE_SPACE` bytes free, the system's
+    temporary directory otherwise.
+    """
+    if MEMORY_BACKED_DIRECTORY.is_dir() and os.access(MEMORY_BACKED_DIRECTORY, os.W_OK | os.X_OK):
+        try:
+            free_space = shutil.disk_usage(MEMORY_BACKED_DIRECTORY).free
+        except OSError:
+            free_space = 0
+        if free_space >= MEMORY_BACKED_MIN_FREE_SPACE:
+            return str(MEMORY_BACKED_DIRECTORY)
+    return tempfile.gettempdir()
+
+
+def empty_directory(path: str) -> None:
+    """
+    Removes everything in the given directory, but not the directory itself.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
+
+
+class ScratchDirectoryPool:
+    """
+    Pool of empty directories, each lent to a single state transition at a time.
+
+    A new directory is only created when all the existing ones are in use, so the pool grows
+    up to the number of transitions evaluated concurrently. The pool is safe to use from
+    multiple threads and from concurrent coroutines, and all its directories are removed
+    once it is closed or garbage collected.
+    """
+
+    root: Optional[str]
+    free: List[str]
+
+    def __init__(self, *, root: Optional[str] = None):
+        self.root = root
+        self.base: Optional[str] = None
+        self.free = []
+        self.lock = Lock()
+
+    def base_directory(self) -> str:
+        """
+        Returns the private directory holding the scratch directories, creating it if needed.
+        """
+        if self.base is None:
+            self.base = tempfile.mkdtemp(
+                prefix="t8n-scratch-", dir=self.root or default_scratch_root()
+            )
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self.base, True)
+        return self.base
+
+    @contextmanager
+    def directory(self) -> Iterator[str]:
+        """
+        Lends an empty directory, emptied and returned to the pool on exit.
+        """
+        with self.lock:
+            path = self.free.pop() if self.free else tempfile.mkdtemp(dir=self.base_directory())
+        try:
+            yield path
+        finally:
+            try:
+                empty_directory(path)
+            except OSError:
+                # Never lend a directory that could not be emptied.
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                with self.lock:
+                    self.free.append(path)
+
+    def close(self) -> None:
+        """
+        Removes all the scratch directories.
+        """
+        with self.lock:
+            if self.base is not None:
+                self._finalizer()
+                self.base = None
+            self.free = []
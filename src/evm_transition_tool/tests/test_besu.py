@@ -0,0 +1,142 @@
+"""
+Test the Besu `t8n-server` pool against a mock server.
+"""
+
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from evm_transition_tool import BesuTransitionTool, TransitionToolRequest
+from evm_transition_tool.besu import BesuServer, BesuServerError
+
+MOCK_SERVER = f"""\
+#!{sys.executable}
+import json, os, sys, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+if sys.argv[1] != "t8n-server":
+    print("Usage: evm t8n")
+    sys.exit(0)
+if os.environ.get("MOCK_SERVER_HANG"):
+    # Started, but never reports its port.
+    time.sleep(60)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        env = request["input"]["env"]
+        if env.get("crash"):
+            os._exit(1)
+        time.sleep(env.get("sleep", 0))
+        body = json.dumps(
+            {{"alloc": request["input"]["alloc"], "result": {{"pid": os.getpid()}}}}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(("localhost", 0), Handler)
+print(f"Transition server listening on {{server.server_address[1]}}", flush=True)
+server.serve_forever()
+"""
+
+
+@pytest.fixture
+def besu(tmp_path: Path):
+    """
+    Returns a Besu transition tool whose binary is a mock `t8n-server`.
+    """
+    binary = tmp_path / "evm"
+    binary.write_text(textwrap.dedent(MOCK_SERVER))
+    binary.chmod(0o755)
+    t8n = BesuTransitionTool(binary=binary)
+    yield t8n
+    t8n.shutdown()
+
+
+def evaluate(t8n: BesuTransitionTool, index: int, **env):
+    """
+    Evaluates a transition whose alloc identifies it.
+    """
+    return t8n.evaluate(alloc={"index": index}, txs=[], env=env, fork_name="Shanghai")
+
+
+def test_server_pool(besu: BesuTransitionTool):
+    """
+    Test that a batch is spread over the servers of the pool, with the outputs in order.
+    """
+    besu.start_worker_pool(workers=2)
+    assert besu.batch_concurrency() == 2
+    outputs = besu.evaluate_many(
+        [
+            TransitionToolRequest(
+                alloc={"index": i}, txs=[], env={"sleep": 0.1}, fork_name="Shanghai"
+            )
+            for i in range(8)
+        ]
+    )
+    assert [output.error for output in outputs] == [None] * 8
+    assert [output.alloc for output in outputs] == [{"index": i} for i in range(8)]
+    assert len({output.result["pid"] for output in outputs if output.result}) == 2
+
+
+def test_server_restart(besu: BesuTransitionTool):
+    """
+    Test that a server that died is restarted, and that a request crashing the server fails
+    without affecting later requests.
+    """
+    _, result = evaluate(besu, 0)
+    assert besu.server_pool is not None
+    server = besu.server_pool.servers[0]
+    assert server.is_healthy()
+    assert server.process is not None
+    server.process.kill()
+    server.process.wait()
+    assert not server.is_healthy()
+
+    alloc, restarted_result = evaluate(besu, 1)
+    assert alloc == {"index": 1}
+    assert restarted_result["pid"] != result["pid"]
+
+    with pytest.raises(BesuServerError):
+        evaluate(besu, 2, crash=True)
+    alloc, _ = evaluate(besu, 3)
+    assert alloc == {"index": 3}
+
+
+def test_request_timeout(besu: BesuTransitionTool):
+    """
+    Test that a request to a server that does not respond in time fails.
+    """
+    besu.request_timeout = 0.2
+    with pytest.raises(BesuServerError):
+        evaluate(besu, 0, sleep=1)
+    besu.request_timeout = 5
+    alloc, _ = evaluate(besu, 1)
+    assert alloc == {"index": 1}
+
+
+def test_startup_timeout(besu: BesuTransitionTool, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that a server that never reports its port fails to start once the startup timeout
+    elapses, even though it produces no output.
+    """
+    monkeypatch.setenv("MOCK_SERVER_HANG", "1")
+    server = BesuServer(binary=besu.binary, startup_timeout=0.5)
+    start = time.monotonic()
+    with pytest.raises(BesuServerError, match="Timed out"):
+        server.start()
+    assert time.monotonic() - start < 5
+    assert server.process is None
@@ -0,0 +1,110 @@
+"""
+Test the on-disk transition tool result cache.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
+
+from evm_transition_tool import EvmOneTransitionTool
+from evm_transition_tool.cache import TransitionToolCache
+
+LOOPBACK_SERVER = [sys.executable, "-m", "evm_transition_tool.reference_server", "--loopback"]
+
+
+def test_cache_key_is_canonical():
+    """
+    Test that the key does not depend on the order of the dictionary keys, but does depend on
+    the tool version.
+    """
+    key = TransitionToolCache.key(version="v1", request={"a": 1, "b": {"c": 2, "d": 3}})
+    assert key == TransitionToolCache.key(version="v1", request={"b": {"d": 3, "c": 2}, "a": 1})
+    assert key != TransitionToolCache.key(version="v2", request={"a": 1, "b": {"c": 2, "d": 3}})
+
+
+def test_cache_get_put(tmp_path: Path):
+    """
+    Test that stored values are returned, also by other instances using the same directory.
+    """
+    cache = TransitionToolCache(directory=tmp_path)
+    key = cache.key(version="v1", request={})
+    assert cache.get(key) is None
+    cache.put(key, {"alloc": {}, "result": {"stateRoot": "0x00"}})
+    assert cache.get(key) == {"alloc": {}, "result": {"stateRoot": "0x00"}}
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    other_cache = TransitionToolCache(directory=tmp_path)
+    assert other_cache.get(key) == {"alloc": {}, "result": {"stateRoot": "0x00"}}
+    assert other_cache.size == cache.size
+
+
+def test_cache_overwrite(tmp_path: Path):
+    """
+    Test that overwriting an entry replaces its size instead of adding to it.
+    """
+    cache = TransitionToolCache(directory=tmp_path, max_size=1000)
+    key = cache.key(version="v1", request={})
+    for _ in range(20):
+        cache.put(key, {"alloc": {}, "result": {"data": "0" * 100}})
+    assert cache.size == cache.disk_usage()
+    cache.put(key, {})
+    assert cache.size == cache.disk_usage() == 2
+    assert cache.get(key) == {}
+
+
+def test_cache_stats_threads(tmp_path: Path):
+    """
+    Test that the hits and misses of concurrent threads are all counted.
+    """
+    cache = TransitionToolCache(directory=tmp_path)
+    keys = [cache.key(version="v1", request={"index": i}) for i in range(2)]
+    cache.put(keys[0], {})
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cache.get, keys * 500))
+    assert (cache.stats.hits, cache.stats.misses) == (500, 500)
+
+
+def test_cache_lru_eviction(tmp_path: Path):
+    """
+    Test that the least recently used entries are evicted once the cache is full.
+    """
+    value = {"alloc": {}, "result": {"data": "0" * 100}}
+    entry_size = len('{"alloc":{},"result":{"data":""}}') + 100
+    cache = TransitionToolCache(directory=tmp_path, max_size=3 * entry_size)
+    keys = [cache.key(version="v1", request={"index": i}) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, value)
+        os.utime(cache.path(key), (i, i))
+    # Reading the oldest entry makes it the most recently used one.
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[3], value)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[3]) is not None
+    assert cache.disk_usage() <= cache.max_size
+
+
+def test_transition_tool_uses_cache(tmp_path: Path):
+    """
+    Test that a repeated `evaluate` call is served from the cache.
+    """
+    t8n = EvmOneTransitionTool(binary=Path(sys.executable))
+    t8n.cached_version = "test"
+    t8n.enable_cache(directory=tmp_path)
+    t8n.start_worker_pool(workers=1, command=LOOPBACK_SERVER)
+    kwargs: Dict[str, Any] = {
+        "alloc": {"0x01": {"balance": "0x01"}},
+        "txs": [],
+        "env": {"currentNumber": "1"},
+        "fork_name": "Shanghai",
+    }
+    try:
+        first = t8n.evaluate(**kwargs)
+    finally:
+        t8n.shutdown()
+    # The worker pool is gone, so only the cache can serve the request.
+    assert t8n.evaluate(**kwargs) == first
+    assert t8n.cache is not None
+    assert (t8n.cache.stats.hits, t8n.cache.stats.misses) == (1, 1)
@@ -0,0 +1,63 @@
+"""
+Test the replay corpus of transition tool calls.
+"""
+
+from pathlib import Path
+
+from evm_transition_tool.corpus import TransitionToolCorpus, read_corpus
+from evm_transition_tool.metrics import metric_labels
+
+
+def capture(corpus: TransitionToolCorpus, wall_time: float, index: int) -> bool:
+    """
+    Captures a call with a distinct input.
+    """
+    return corpus.capture(
+        wall_time=wall_time,
+        alloc={"index": index},
+        txs=[],
+        env={"currentNumber": "0x1"},
+        fork_name="Shanghai+1153",
+    )
+
+
+def test_capture_threshold(tmp_path: Path):
+    """
+    Test that only the calls slower than the threshold are captured, with their labels, and
+    read back in order.
+    """
+    corpus = TransitionToolCorpus(directory=tmp_path, threshold=0.5)
+    with metric_labels(test="test_slow"):
+        assert capture(corpus, 0.6, 0)
+    assert not capture(corpus, 0.1, 1)
+    assert capture(corpus, 0.5, 2)
+    assert corpus.captured == 2
+
+    entries = list(read_corpus([tmp_path]))
+    assert [e.alloc for e in entries] == [{"index": 0}, {"index": 2}]
+    assert entries[0].labels == {"test": "test_slow"}
+    assert entries[0].evaluate_arguments() == {
+        "alloc": {"index": 0},
+        "txs": [],
+        "env": {"currentNumber": "0x1"},
+        "fork_name": "Shanghai+1153",
+        "chain_id": 1,
+        "reward": 0,
+    }
+
+
+def test_capture_sample(tmp_path: Path):
+    """
+    Test that a fraction of the calls is sampled, and that an interrupted record does not
+    prevent reading the rest of the corpus.
+    """
+    corpus = TransitionToolCorpus(directory=tmp_path, threshold=1.0, sample_rate=0.25)
+    corpus.random.seed(0)
+    captured = sum(capture(corpus, 0.0, i) for i in range(400))
+    assert 60 < captured < 140
+    assert not TransitionToolCorpus(directory=tmp_path / "none").should_capture(10.0)
+
+    complete = corpus.path.read_bytes()
+    capture(corpus, 1.0, 400)
+    corpus.path.write_bytes(corpus.path.read_bytes()[: len(complete) + 30])
+    assert len(list(read_corpus([corpus.path]))) == captured
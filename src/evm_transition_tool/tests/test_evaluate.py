@@ -7,12 +7,16 @@ from typing import Dict
 import pytest
 
 from ethereum_test_forks import Berlin, Fork, Istanbul, London
-from evm_transition_tool import GethTransitionTool, TransitionTool
+from evm_transition_tool import (
+    ExecutionSpecsInProcessTransitionTool,
+    GethTransitionTool,
+    TransitionTool,
+)
 
 FIXTURES_ROOT = Path(os.path.join("src", "evm_transition_tool", "tests", "fixtures"))
 
 
-@pytest.mark.parametrize("t8n", [GethTransitionTool()])
+@pytest.mark.parametrize("t8n", [GethTransitionTool(), ExecutionSpecsInProcessTransitionTool()])
 @pytest.mark.parametrize("fork", [London, Istanbul])
 @pytest.mark.parametrize(
     "alloc,base_fee,hash",
@@ -98,7 +102,7 @@ def test_evm_tool_binary_arg(evm_tool, binary_arg):  # noqa: D103
     raise Exception("unknown test parameter")
 
 
-@pytest.mark.parametrize("t8n", [GethTransitionTool()])
+@pytest.mark.parametrize("t8n", [GethTransitionTool(), ExecutionSpecsInProcessTransitionTool()])
 @pytest.mark.parametrize("test_dir", os.listdir(path=FIXTURES_ROOT))
 def test_evm_t8n(t8n: TransitionTool, test_dir: str) -> None:  # noqa: D103
     alloc_path = Path(FIXTURES_ROOT, test_dir, "alloc.json")
@@ -0,0 +1,68 @@
+"""
+Test the aggregation of the transition tool metrics.
+"""
+
+from evm_transition_tool.metrics import percentiles, prometheus_textfile, summarize
+
+
+def call(fork: str, spec: str, wall_time: float, cached: bool = False):
+    """
+    Returns a recorded call as produced by `TransitionToolMetrics.to_json`.
+    """
+    return {
+        "fork": fork,
+        "labels": {"test": f"test_{wall_time}", "spec": spec},
+        "wall_time": wall_time,
+        "phases": {"execute": wall_time / 2},
+        "stdin_bytes": 100,
+        "stdout_bytes": 200,
+        "cached": cached,
+    }
+
+
+def test_percentiles():
+    """
+    Test the nearest-rank percentiles.
+    """
+    summary = percentiles([float(v) for v in range(100, 0, -1)])
+    assert summary == {"count": 100, "sum": 5050, "p50": 50, "p90": 90, "p99": 99, "max": 100}
+    assert percentiles([]) == {"count": 0, "sum": 0}
+
+
+def test_summarize():
+    """
+    Test that calls are grouped per fork and spec, that cached calls are only counted, and
+    that the summary is rendered as a Prometheus textfile.
+    """
+    calls = [
+        call("Shanghai", "state_test", 1.0),
+        call("Shanghai", "state_test", 3.0),
+        call("Shanghai", "state_test", 0.001, cached=True),
+        call("Shanghai", "blockchain_test", 2.0),
+        call("Cancun", "state_test", 4.0),
+    ]
+    summary = summarize(calls, slowest=2)
+    assert summary["calls"] == 5
+    assert [(g["fork"], g["labels"]["spec"], g["calls"]) for g in summary["groups"]] == [
+        ("Cancun", "state_test", 1),
+        ("Shanghai", "blockchain_test", 1),
+        ("Shanghai", "state_test", 3),
+    ]
+    state_tests = summary["groups"][2]
+    assert state_tests["cached_calls"] == 1
+    assert state_tests["wall_time"]["count"] == 2
+    assert state_tests["wall_time"]["max"] == 3.0
+    assert state_tests["phases"]["execute"]["sum"] == 2.0
+    assert [c["wall_time"] for c in summary["slowest_calls"]] == [4.0, 3.0]
+
+    textfile = prometheus_textfile(summary)
+    assert "# TYPE t8n_call_duration_seconds summary" in textfile
+    assert (
+        't8n_call_duration_seconds{fork="Shanghai",spec="state_test",quantile="0.99"} 3'
+        in textfile
+    )
+    assert (
+        't8n_phase_duration_seconds_count{fork="Cancun",spec="state_test",phase="execute"} 1'
+        in textfile
+    )
+    assert 't8n_cached_calls_total{fork="Shanghai",spec="state_test"} 1' in textfile
@@ -0,0 +1,71 @@
+"""
+Test the registry of tool probes.
+"""
+
+import sys
+from pathlib import Path
+
+from evm_transition_tool.probe import ToolProbes
+
+FAKE_TOOL = f"""\
+#!{sys.executable}
+import sys
+with open(sys.argv[0] + ".runs", "a") as f:
+    f.write("x")
+print("fake-tool 1.0.0", sys.argv[1:])
+sys.exit(1 if "--fail" in sys.argv else 0)
+"""
+
+
+def test_tool_probes(tmp_path: Path):
+    """
+    Test that a probe runs once per binary, that its results are reused by later sessions,
+    and that they are invalidated when the binary changes.
+    """
+    binary = tmp_path / "tool"
+    binary.write_text(FAKE_TOOL)
+    binary.chmod(0o755)
+    runs = tmp_path / "tool.runs"
+    cache_file = tmp_path / "cache" / "tool-probes.json"
+
+    probes = ToolProbes()
+    probes.enable_persistence(cache_file)
+    result = probes.run([binary, "-v"])
+    assert result.returncode == 0
+    assert result.stdout == "fake-tool 1.0.0 ['-v']\n"
+    assert probes.run([binary, "-v"]) == result
+    assert probes.run([binary, "--help"]).stdout == "fake-tool 1.0.0 ['--help']\n"
+    assert runs.read_text() == "xx"
+
+    later_session = ToolProbes()
+    later_session.enable_persistence(cache_file)
+    assert later_session.run([binary, "-v"]) == result
+    assert later_session.runs == 0
+
+    binary.write_text(FAKE_TOOL.replace("1.0.0", "1.0.1"))
+    assert later_session.run([binary, "-v"]).stdout == "fake-tool 1.0.1 ['-v']\n"
+    assert runs.read_text() == "xxx"
+
+
+def test_failed_tool_probes(tmp_path: Path):
+    """
+    Test that a failed probe is only reused within its session, and run again by the next.
+    """
+    binary = tmp_path / "tool"
+    binary.write_text(FAKE_TOOL)
+    binary.chmod(0o755)
+    runs = tmp_path / "tool.runs"
+    cache_file = tmp_path / "cache" / "tool-probes.json"
+
+    probes = ToolProbes()
+    probes.enable_persistence(cache_file)
+    assert probes.run([binary, "--fail"]).returncode == 1
+    assert probes.run([binary, "--fail"]).returncode == 1
+    assert probes.run([binary, "-v"]).returncode == 0
+    assert runs.read_text() == "xx"
+
+    later_session = ToolProbes()
+    later_session.enable_persistence(cache_file)
+    assert later_session.run([binary, "-v"]).returncode == 0
+    assert later_session.run([binary, "--fail"]).returncode == 1
+    assert later_session.runs == 1
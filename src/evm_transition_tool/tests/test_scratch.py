@@ -0,0 +1,46 @@
+"""
+Test the pool of scratch directories.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from evm_transition_tool import scratch
+from evm_transition_tool.scratch import ScratchDirectoryPool, default_scratch_root
+
+
+def test_scratch_directories(tmp_path: Path):
+    """
+    Test that directories are lent empty, reused once returned, and all removed when the pool
+    is closed.
+    """
+    pool = ScratchDirectoryPool(root=str(tmp_path))
+    with pool.directory() as first:
+        Path(first, "output.json").write_text("{}")
+        os.mkdir(os.path.join(first, "traces"))
+        with pool.directory() as second:
+            assert second != first
+    with pool.directory() as reused:
+        assert reused in (first, second)
+        assert os.listdir(reused) == []
+    assert len(list(tmp_path.glob("*/*"))) == 2
+
+    pool.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_default_scratch_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test that the memory-backed directory is only used if it has enough free space.
+    """
+    monkeypatch.setattr(scratch, "MEMORY_BACKED_DIRECTORY", tmp_path)
+    monkeypatch.setattr(scratch, "MEMORY_BACKED_MIN_FREE_SPACE", 0)
+    assert default_scratch_root() == str(tmp_path)
+    monkeypatch.setattr(scratch, "MEMORY_BACKED_MIN_FREE_SPACE", 2**80)
+    assert default_scratch_root() == tempfile.gettempdir()
+    monkeypatch.setattr(scratch, "MEMORY_BACKED_DIRECTORY", tmp_path / "missing")
+    monkeypatch.setattr(scratch, "MEMORY_BACKED_MIN_FREE_SPACE", 0)
+    assert default_scratch_root() == tempfile.gettempdir()
@@ -2,20 +2,26 @@
 Test the transition tool and subclasses.
 """
 
+import asyncio
+import json
 import shutil
 import subprocess
+import sys
 from pathlib import Path
-from typing import Type
+from typing import Any, Dict, Type
 
 import pytest
 
 from evm_transition_tool import (
     EvmOneTransitionTool,
     GethTransitionTool,
+    JSONCodec,
     NimbusTransitionTool,
     TransitionTool,
     TransitionToolNotFoundInPath,
 )
+from evm_transition_tool.corpus import read_corpus
+from evm_transition_tool.metrics import metric_labels
 
 
 def test_default_tool():
@@ -90,3 +96,147 @@ def test_unknown_binary_path():
     """
     with pytest.raises(TransitionToolNotFoundInPath):
         TransitionTool.from_binary_path(binary_path=Path("unknown_binary_path"))
+
+
+FAKE_EVM = f"""\
+#!{sys.executable}
+import json, sys
+if "--help" in sys.argv:
+    sys.exit(0)
+stdin = json.load(sys.stdin)
+if "fail" in stdin["env"]:
+    sys.exit("failed on purpose")
+reward = [a for a in sys.argv if a.startswith("--state.reward=")][0]
+json.dump({{"alloc": stdin["alloc"], "result": {{"reward": reward}}}}, sys.stdout)
+"""
+
+
+@pytest.fixture
+def fake_evm(tmp_path: Path) -> GethTransitionTool:
+    """
+    Returns a geth-style transition tool whose binary echoes the input alloc.
+    """
+    binary = tmp_path / "evm"
+    binary.write_text(FAKE_EVM)
+    binary.chmod(0o755)
+    return GethTransitionTool(binary=binary)
+
+
+def test_evaluate_async(fake_evm: GethTransitionTool):
+    """
+    Test that concurrent `evaluate_async` calls each get the output of their own transition,
+    the same as `evaluate`.
+    """
+    t8n = fake_evm
+
+    def request(i: int):
+        return dict(
+            alloc={"index": i},
+            txs=[],
+            env={"currentNumber": str(i % 2)},
+            fork_name="Shanghai",
+        )
+
+    async def evaluate_all():
+        return await asyncio.gather(*(t8n.evaluate_async(**request(i)) for i in range(8)))
+
+    outputs = asyncio.run(evaluate_all())
+    for i, output in enumerate(outputs):
+        assert output == t8n.evaluate(**request(i))
+        assert output[0] == {"index": i}
+        assert output[1] == {"reward": "--state.reward=-1" if i % 2 == 0 else "--state.reward=0"}
+
+
+def test_evaluate_streaming(fake_evm: GethTransitionTool):
+    """
+    Test that large inputs are streamed to the tool in chunks through the JSON codec, and
+    that the errors of a tool exiting early are reported.
+    """
+    chunks = []
+
+    class RecordingCodec(JSONCodec):
+        def chunks(self, data):
+            for chunk in super().chunks(data):
+                chunks.append(len(chunk))
+                yield chunk
+
+    fake_evm.json_codec = RecordingCodec(chunk_size=1024)
+    alloc = {f"0x{i:040x}": {"balance": hex(i), "storage": {"0x01": "0x01"}} for i in range(2000)}
+    output_alloc, _ = fake_evm.evaluate(
+        alloc=alloc, txs=[], env={"currentNumber": "1"}, fork_name="Shanghai"
+    )
+    assert output_alloc == alloc
+    assert len(chunks) > 10 and max(chunks) < 2048
+
+    with pytest.raises(Exception, match="failed on purpose"):
+        fake_evm.evaluate(
+            alloc=alloc, txs=[], env={"currentNumber": "1", "fail": 1}, fork_name="Shanghai"
+        )
+
+
+def test_evaluate_encoding_error(fake_evm: GethTransitionTool):
+    """
+    Test that inputs that cannot be encoded raise in the caller, sync or async, instead of
+    leaving the tool waiting for its inputs.
+    """
+    request: Dict[str, Any] = dict(
+        alloc={"a": object()}, txs=[], env={"currentNumber": "1"}, fork_name="Shanghai"
+    )
+    with pytest.raises(TypeError):
+        fake_evm.evaluate(**request)
+    with pytest.raises(TypeError):
+        asyncio.run(fake_evm.evaluate_async(**request))
+
+
+def test_evaluate_metrics(fake_evm: GethTransitionTool):
+    """
+    Test that the metrics of every call, sync or async, are recorded with the caller's labels.
+    """
+    metrics = fake_evm.enable_metrics()
+    alloc = {"0x01": {"balance": "0x01"}}
+    with metric_labels(test="test_sync"):
+        fake_evm.evaluate(alloc=alloc, txs=[], env={"currentNumber": "1"}, fork_name="Shanghai")
+
+    async def evaluate():
+        with metric_labels(test="test_async"):
+            await fake_evm.evaluate_async(
+                alloc=alloc, txs=[], env={"currentNumber": "1"}, fork_name="Paris"
+            )
+
+    asyncio.run(evaluate())
+
+    calls = metrics.to_json()
+    assert [(c["fork"], c["labels"]) for c in calls] == [
+        ("Shanghai", {"test": "test_sync"}),
+        ("Paris", {"test": "test_async"}),
+    ]
+    for call in calls:
+        phases = call["phases"]
+        assert set(phases) == {"spawn", "encode", "execute", "decode"}
+        # The inputs are encoded by a writer thread while the tool executes.
+        assert phases["encode"] <= phases["execute"]
+        assert 0 < sum(phases.values()) - phases["encode"] <= call["wall_time"]
+        assert call["stdin_bytes"] > len(json.dumps(alloc))
+        assert call["stdout_bytes"] > len(json.dumps(alloc))
+        assert not call["cached"]
+
+
+def test_evaluate_capture(fake_evm: GethTransitionTool, tmp_path: Path):
+    """
+    Test that the inputs of the captured calls can be replayed to the same output.
+    """
+    corpus = fake_evm.enable_capture(directory=tmp_path / "corpus", threshold=0.0)
+    alloc = {"0x01": {"balance": "0x01"}}
+    output = fake_evm.evaluate(
+        alloc=alloc, txs=[], env={"currentNumber": "1"}, fork_name="Shanghai", eips=[1153]
+    )
+    asyncio.run(
+        fake_evm.evaluate_async(alloc=alloc, txs=[], env={"currentNumber": "0"}, fork_name="Paris")
+    )
+    assert corpus.captured == 2
+
+    entries = list(read_corpus([tmp_path / "corpus"]))
+    assert [e.fork_name for e in entries] == ["Shanghai+1153", "Paris"]
+    assert all(e.wall_time > 0 for e in entries)
+    fake_evm.corpus = None
+    assert fake_evm.evaluate(**entries[0].evaluate_arguments()) == output
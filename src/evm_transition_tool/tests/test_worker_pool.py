@@ -0,0 +1,156 @@
+"""
+Test the transition tool worker pool and its framed protocol.
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from evm_transition_tool import EvmOneTransitionTool, TransitionToolRequest
+from evm_transition_tool.worker_pool import (
+    TransitionToolWorkerError,
+    TransitionToolWorkerPool,
+    read_frame,
+    write_frame,
+)
+
+LOOPBACK_SERVER = [sys.executable, "-m", "evm_transition_tool.reference_server", "--loopback"]
+
+
+def loopback_request(index: int):
+    """
+    Returns a request whose alloc identifies it.
+    """
+    return {
+        "state": {"fork": "Shanghai", "chainid": 1, "reward": 0},
+        "input": {"alloc": {"index": index}, "txs": [], "env": {}},
+    }
+
+
+def test_frame_round_trip():
+    """
+    Test that frames written to a stream are read back unchanged and in order.
+    """
+    stream = BytesIO()
+    write_frame(stream, {"a": 1})
+    write_frame(stream, {"b": [2, 3]})
+    stream.seek(0)
+    assert read_frame(stream) == {"a": 1}
+    assert read_frame(stream) == {"b": [2, 3]}
+    assert read_frame(stream) is None
+
+
+def test_truncated_frame():
+    """
+    Test that an incomplete frame raises an error instead of returning partial data.
+    """
+    stream = BytesIO()
+    write_frame(stream, {"a": 1})
+    stream = BytesIO(stream.getvalue()[:-1])
+    with pytest.raises(TransitionToolWorkerError):
+        read_frame(stream)
+
+
+def test_worker_pool_concurrent_requests():
+    """
+    Test that concurrent requests are all served and each response matches its request.
+    """
+    pool = TransitionToolWorkerPool(command=LOOPBACK_SERVER, workers=2)
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(pool.request, [loopback_request(i) for i in range(16)]))
+    finally:
+        pool.shutdown()
+    assert [r["alloc"]["index"] for r in responses] == list(range(16))
+
+
+def test_worker_pool_error_response():
+    """
+    Test that errors raised while serving a request are reported to the client and the
+    worker keeps serving requests afterwards.
+    """
+    pool = TransitionToolWorkerPool(command=LOOPBACK_SERVER, workers=1)
+    try:
+        with pytest.raises(TransitionToolWorkerError, match="KeyError"):
+            pool.request({"state": {}})
+        assert pool.request(loopback_request(1))["alloc"] == {"index": 1}
+    finally:
+        pool.shutdown()
+
+
+def test_worker_crash():
+    """
+    Test that a worker exiting without a response raises an error.
+    """
+    pool = TransitionToolWorkerPool(
+        command=[sys.executable, "-c", "import sys; sys.exit(1)"], workers=1
+    )
+    try:
+        with pytest.raises(TransitionToolWorkerError):
+            pool.request(loopback_request(0))
+    finally:
+        pool.shutdown()
+
+
+def test_transition_tool_uses_worker_pool():
+    """
+    Test that `evaluate` is served by the worker pool once it has been started.
+    """
+    t8n = EvmOneTransitionTool(binary=Path(sys.executable))
+    t8n.start_worker_pool(workers=1, command=LOOPBACK_SERVER)
+    try:
+        alloc, result = t8n.evaluate(
+            alloc={"0x01": {"balance": "0x01"}},
+            txs=[],
+            env={"currentNumber": "1"},
+            fork_name="Shanghai",
+        )
+    finally:
+        t8n.shutdown()
+    assert alloc == {"0x01": {"balance": "0x01"}}
+    assert result == {}
+    assert t8n.worker_pool is None
+
+
+def test_worker_pool_requires_warm_tool():
+    """
+    Test that a tool binary that would still be started for every transition cannot be hosted
+    by the reference server without a worker command.
+    """
+    t8n = EvmOneTransitionTool(binary=Path(sys.executable))
+    with pytest.raises(Exception, match="worker command is required"):
+        t8n.start_worker_pool(workers=1)
+    assert t8n.worker_pool is None
+
+
+def test_evaluate_many():
+    """
+    Test that a batch is spread over the workers, with the outputs in order and errors
+    reported per request.
+    """
+    t8n = EvmOneTransitionTool(binary=Path(sys.executable))
+    t8n.start_worker_pool(workers=2, command=LOOPBACK_SERVER)
+    requests = [
+        TransitionToolRequest(
+            alloc={"index": i} if i != 3 else object(),
+            txs=[],
+            env={"currentNumber": "1"},
+            fork_name="Shanghai",
+        )
+        for i in range(8)
+    ]
+    try:
+        outputs = t8n.evaluate_many(requests)
+    finally:
+        t8n.shutdown()
+    assert len(outputs) == 8
+    for i, output in enumerate(outputs):
+        if i == 3:
+            assert isinstance(output.error, TypeError)
+            assert output.alloc is None
+        else:
+            assert output.error is None
+            assert output.alloc == {"index": i}
@@ -2,22 +2,38 @@
 Transition tool abstract class.
 """
 
+import asyncio
 import json
 import os
 import shutil
 import stat
 import subprocess
-import tempfile
+import sys
 import textwrap
+import threading
+import time
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import copy_context
+from dataclasses import dataclass
+from functools import partial
 from itertools import groupby
 from json import dump
 from pathlib import Path
 from re import Pattern
-from typing import Any, Dict, List, Optional, Tuple, Type
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Tuple, Type
 
 from ethereum_test_forks import Fork
 
+from .cache import DEFAULT_MAX_SIZE, TransitionToolCache
+from .corpus import TransitionToolCorpus
+from .json_codec import JSONCodec
+from .metrics import TransitionToolMetrics, count_bytes, mark_cached, phase
+from .probe import probe
+from .scratch import ScratchDirectoryPool
+from .worker_pool import TransitionToolWorkerPool
+
 
 class UnknownTransitionTool(Exception):
     """Exception raised if an unknown t8n is encountered"""
@@ -56,6 +72,33 @@ def dump_files_to_directory(output_path: str, files: Dict[str, Any]) -> None:
             os.chmod(file_path, file_mode)
 
 
+@dataclass(kw_only=True)
+class TransitionToolRequest:
+    """
+    Inputs of a single state transition, as accepted by `TransitionTool.evaluate`.
+    """
+
+    alloc: Any
+    txs: Any
+    env: Any
+    fork_name: str
+    chain_id: int = 1
+    reward: int = 0
+    eips: Optional[List[int]] = None
+    debug_output_path: str = ""
+
+
+@dataclass(kw_only=True)
+class TransitionToolOutput:
+    """
+    Outputs of a single state transition, or the error raised while evaluating it.
+    """
+
+    alloc: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+
 class TransitionTool:
     """
     Transition tool abstract base class which should be inherited by all transition tool
@@ -71,6 +114,12 @@ class TransitionTool:
     version_flag: str = "-v"
     t8n_subcommand: Optional[str] = None
     cached_version: Optional[str] = None
+    worker_pool: Optional[TransitionToolWorkerPool] = None
+    cache: Optional[TransitionToolCache] = None
+    scratch_pool: Optional[ScratchDirectoryPool] = None
+    json_codec: JSONCodec = JSONCodec()
+    metrics: Optional[TransitionToolMetrics] = None
+    corpus: Optional[TransitionToolCorpus] = None
 
     # Abstract methods that each tool must implement
 
@@ -144,18 +193,14 @@ class TransitionTool:
             cls.registered_tools, key=lambda x: x.version_flag
         ):
             try:
-                result = subprocess.run(
-                    [binary, version_flag], stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                )
+                result = probe([binary, version_flag])
                 if result.returncode != 0:
                     raise Exception(f"Non-zero return code: {result.returncode}")
 
                 if result.stderr:
-                    raise Exception(f"Tool wrote to stderr: {result.stderr.decode()}")
+                    raise Exception(f"Tool wrote to stderr: {result.stderr}")
 
-                binary_output = ""
-                if result.stdout:
-                    binary_output = result.stdout.decode().strip()
+                binary_output = result.stdout.strip()
             except Exception:
                 # If the tool doesn't support the version flag,
                 # we'll get an non-zero exit code.
@@ -180,15 +225,12 @@ class TransitionTool:
         Return name and version of tool used to state transition
         """
         if self.cached_version is None:
-            result = subprocess.run(
-                [str(self.binary), self.version_flag],
-                stdout=subprocess.PIPE,
-            )
+            result = probe([str(self.binary), self.version_flag])
 
             if result.returncode != 0:
-                raise Exception("failed to evaluate: " + result.stderr.decode())
+                raise Exception("failed to evaluate: " + result.stderr)
 
-            self.cached_version = result.stdout.decode().strip()
+            self.cached_version = result.stdout.strip()
 
         return self.cached_version
 
@@ -203,7 +245,82 @@ class TransitionTool:
         """
         Perform any cleanup tasks related to the tested tool.
         """
-        pass
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+        if self.scratch_pool is not None:
+            self.scratch_pool.close()
+            self.scratch_pool = None
+
+    @property
+    def scratch(self) -> ScratchDirectoryPool:
+        """
+        Returns the pool of scratch directories the tool writes its output files to.
+        """
+        if self.scratch_pool is None:
+            self.scratch_pool = ScratchDirectoryPool()
+        return self.scratch_pool
+
+    def start_worker_pool(self, *, workers: int, command: Optional[List[str]] = None):
+        """
+        Starts `workers` long-lived worker processes that serve all subsequent `evaluate`
+        calls through the framed protocol described in `evm_transition_tool.worker_pool`.
+
+        By default every worker runs the pure-Python reference server hosting this tool, which
+        is only possible for tools the server can keep warm between requests, see
+        `reference_server_arguments`; `command` can be used to launch any other server that
+        speaks the same protocol.
+        """
+        if command is None:
+            arguments = self.reference_server_arguments()
+            if arguments is None:
+                raise Exception(
+                    f"{self.__class__.__name__} cannot be kept running between state "
+                    "transitions by the reference server, a worker command is required."
+                )
+            command = [
+                sys.executable,
+                "-m",
+                "evm_transition_tool.reference_server",
+            ] + arguments
+            if self.trace:
+                command.append("--trace")
+        self.worker_pool = TransitionToolWorkerPool(command=command, workers=workers)
+
+    def enable_cache(self, *, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Caches the results of all subsequent `evaluate` calls in `directory`, see
+        `evm_transition_tool.cache`.
+        """
+        self.cache = TransitionToolCache(directory=directory, max_size=max_size)
+
+    def enable_capture(
+        self, *, directory: Path, threshold: Optional[float] = None, sample_rate: float = 0.0
+    ) -> TransitionToolCorpus:
+        """
+        Captures the inputs of all subsequent `evaluate` calls slower than `threshold` seconds,
+        or sampled at `sample_rate`, in a replay corpus, see `evm_transition_tool.corpus`.
+        """
+        self.corpus = TransitionToolCorpus(
+            directory=directory, threshold=threshold, sample_rate=sample_rate
+        )
+        return self.corpus
+
+    def enable_metrics(self) -> TransitionToolMetrics:
+        """
+        Records the metrics of all subsequent `evaluate` calls, see
+        `evm_transition_tool.metrics`.
+        """
+        self.metrics = TransitionToolMetrics()
+        return self.metrics
+
+    def reference_server_arguments(self) -> Optional[List[str]]:
+        """
+        Returns the arguments the reference server requires to host this tool, or `None` if the
+        server would still start the tool binary for every state transition, gaining nothing
+        over evaluating the transitions directly.
+        """
+        return None
 
     def reset_traces(self):
         """
@@ -225,6 +342,29 @@ class TransitionTool:
         """
         return self.traces
 
+    def collect_traces(
+        self, receipts: List[Any], output_dir: str, debug_output_path: str = ""
+    ) -> None:
+        """
+        Reads the trace files written by the tool to `output_dir` for each of the receipts of
+        a state transition and appends them to the current list.
+        """
+        traces: List[List[Dict]] = []
+        for i, r in enumerate(receipts):
+            h = r["transactionHash"]
+            trace_file_name = f"trace-{i}-{h}.jsonl"
+            if debug_output_path:
+                shutil.copy(
+                    os.path.join(output_dir, trace_file_name),
+                    os.path.join(debug_output_path, trace_file_name),
+                )
+            with open(os.path.join(output_dir, trace_file_name), "r") as trace_file:
+                tx_traces: List[Dict] = []
+                for trace_line in trace_file.readlines():
+                    tx_traces.append(json.loads(trace_line))
+                traces.append(tx_traces)
+        self.append_traces(traces)
+
     def evaluate(
         self,
         *,
@@ -238,16 +378,520 @@ class TransitionTool:
         debug_output_path: str = "",
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
-        Executes `evm t8n` with the specified arguments.
+        Executes the transition tool with the specified arguments.
+
+        The result is served from the cache if one was enabled and the same transition was
+        already evaluated by the same tool version. Otherwise, the request is served by the
+        worker pool if one was started, or the tool is invoked directly.
+        """
+        if eips is not None:
+            fork_name = "+".join([fork_name] + [str(eip) for eip in eips])
+
+        with self._measure_call(fork_name):
+            key = self._cache_key(
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                debug_output_path=debug_output_path,
+            )
+            if key is not None and (cached := self._cache_get(key)) is not None:
+                return cached
+            start = time.perf_counter()
+            output_alloc, output_result = self._evaluate_uncached(
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                debug_output_path=debug_output_path,
+            )
+            if self.corpus is not None:
+                self.corpus.capture(
+                    wall_time=time.perf_counter() - start,
+                    alloc=alloc,
+                    txs=txs,
+                    env=env,
+                    fork_name=fork_name,
+                    chain_id=chain_id,
+                    reward=reward,
+                )
+            if key is not None:
+                self._cache_put(key, output_alloc, output_result)
+            return output_alloc, output_result
 
-        If a client's `t8n` tool varies from the default behavior, this method
-        should be overridden.
+    async def evaluate_async(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int = 1,
+        reward: int = 0,
+        eips: Optional[List[int]] = None,
+        debug_output_path: str = "",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Coroutine version of `evaluate`, which lets a single event loop wait on many state
+        transitions at the same time.
         """
         if eips is not None:
             fork_name = "+".join([fork_name] + [str(eip) for eip in eips])
 
-        temp_dir = tempfile.TemporaryDirectory()
+        with self._measure_call(fork_name):
+            key = self._cache_key(
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                debug_output_path=debug_output_path,
+            )
+            if key is not None and (cached := self._cache_get(key)) is not None:
+                return cached
+            kwargs: Dict[str, Any] = dict(
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                debug_output_path=debug_output_path,
+            )
+            start = time.perf_counter()
+            if self.worker_pool is not None:
+                output_alloc, output_result = await self._run_in_executor(
+                    self._evaluate_in_worker_pool, **kwargs
+                )
+            else:
+                output_alloc, output_result = await self._evaluate_async(**kwargs)
+            if self.corpus is not None:
+                self.corpus.capture(
+                    wall_time=time.perf_counter() - start,
+                    alloc=alloc,
+                    txs=txs,
+                    env=env,
+                    fork_name=fork_name,
+                    chain_id=chain_id,
+                    reward=reward,
+                )
+            if key is not None:
+                self._cache_put(key, output_alloc, output_result)
+            return output_alloc, output_result
+
+    def _measure_call(self, fork_name: str) -> ContextManager:
+        """
+        Returns a context recording the metrics of a call, if metrics are enabled.
+        """
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.call(fork=fork_name)
+
+    def _cache_key(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
+    ) -> Optional[str]:
+        """
+        Returns the cache key of a state transition, or None if it must not be cached.
+
+        Traced and debugged transitions always invoke the tool, since their side effects are
+        not cached.
+        """
+        if self.cache is None or self.trace or debug_output_path:
+            return None
+        with phase("cache"):
+            return self.cache.key(
+                version=self.version(),
+                request={
+                    "state": {"fork": fork_name, "chainid": chain_id, "reward": reward},
+                    "input": {"alloc": alloc, "txs": txs, "env": env},
+                },
+            )
+
+    def _cache_get(self, key: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Returns the cached output of a state transition, if any.
+        """
+        assert self.cache is not None
+        with phase("cache"):
+            cached = self.cache.get(key)
+        if cached is None:
+            return None
+        mark_cached()
+        return cached["alloc"], cached["result"]
+
+    def _cache_put(self, key: str, alloc: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Stores the output of a state transition in the cache.
+        """
+        assert self.cache is not None
+        with phase("cache"):
+            self.cache.put(key, {"alloc": alloc, "result": result})
+
+    def evaluate_many(
+        self, requests: Sequence[TransitionToolRequest]
+    ) -> List[TransitionToolOutput]:
+        """
+        Executes a batch of independent state transitions.
+
+        The outputs are returned in the order of the requests; an error raised while
+        evaluating a request is returned in its output instead of being raised. Up to
+        `batch_concurrency()` transitions are evaluated at the same time, except when tracing,
+        so that the traces are collected in order.
+        """
+        workers = self.batch_concurrency()
+        if self.trace or workers <= 1 or len(requests) <= 1:
+            return [self._evaluate_request(request) for request in requests]
+        # Evaluate every request in the caller's context, so it keeps its metric labels.
+        context = copy_context()
+        with ThreadPoolExecutor(max_workers=min(workers, len(requests))) as executor:
+            return list(
+                executor.map(lambda r: context.copy().run(self._evaluate_request, r), requests)
+            )
+
+    def batch_concurrency(self) -> int:
+        """
+        Returns the number of state transitions of a batch that can be evaluated concurrently.
+
+        Every transition is evaluated in its own tool process, so by default one per CPU, or
+        one per worker if a worker pool was started.
+        """
+        if self.worker_pool is not None:
+            return len(self.worker_pool.workers)
+        return os.cpu_count() or 1
 
+    def _evaluate_request(self, request: TransitionToolRequest) -> TransitionToolOutput:
+        """
+        Evaluates a single request of a batch, capturing any error raised.
+        """
+        try:
+            alloc, result = self.evaluate(
+                alloc=request.alloc,
+                txs=request.txs,
+                env=request.env,
+                fork_name=request.fork_name,
+                chain_id=request.chain_id,
+                reward=request.reward,
+                eips=request.eips,
+                debug_output_path=request.debug_output_path,
+            )
+        except Exception as e:
+            return TransitionToolOutput(error=e)
+        return TransitionToolOutput(alloc=alloc, result=result)
+
+    def _evaluate_uncached(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Evaluates the state transition using the worker pool if one was started, otherwise
+        invokes the tool directly.
+        """
+        if self.worker_pool is not None:
+            return self._evaluate_in_worker_pool(
+                alloc=alloc,
+                txs=txs,
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                debug_output_path=debug_output_path,
+            )
+
+        return self._evaluate(
+            alloc=alloc,
+            txs=txs,
+            env=env,
+            fork_name=fork_name,
+            chain_id=chain_id,
+            reward=reward,
+            debug_output_path=debug_output_path,
+        )
+
+    def _evaluate_in_worker_pool(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Sends the state transition to one of the workers of the pool.
+        """
+        assert self.worker_pool is not None
+        request = {
+            "state": {
+                "fork": fork_name,
+                "chainid": chain_id,
+                "reward": reward,
+            },
+            "input": {
+                "alloc": alloc,
+                "txs": txs,
+                "env": env,
+            },
+        }
+        if debug_output_path:
+            dump_files_to_directory(
+                debug_output_path,
+                request["input"]
+                | {
+                    "state": request["state"],
+                },
+            )
+
+        with phase("execute"):
+            output = self.worker_pool.request(request)
+
+        if "alloc" not in output or "result" not in output:
+            raise Exception("malformed result")
+
+        for traces in output.get("traces", []):
+            self.append_traces(traces)
+
+        if debug_output_path:
+            dump_files_to_directory(
+                debug_output_path,
+                {
+                    "output_alloc": output["alloc"],
+                    "output_result": output["result"],
+                },
+            )
+
+        return output["alloc"], output["result"]
+
+    def _evaluate(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Executes `evm t8n` with the specified arguments.
+
+        If a client's `t8n` tool varies from the default behavior, this method and
+        `_evaluate_async` should be overridden.
+        """
+        with self.scratch.directory() as output_dir:
+            args = self._t8n_args(
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                output_dir=output_dir,
+            )
+            stdin = {
+                "alloc": alloc,
+                "txs": txs,
+                "env": env,
+            }
+            stdout, stderr, returncode = self._run_t8n(args, stdin)
+            return self._t8n_output(
+                args=args,
+                stdin=stdin,
+                stdout=stdout,
+                stderr=stderr,
+                returncode=returncode,
+                output_dir=output_dir,
+                debug_output_path=debug_output_path,
+            )
+
+    def _run_t8n(self, args: List[str], stdin: Dict[str, Any]) -> Tuple[bytes, bytes, int]:
+        """
+        Runs a `t8n` invocation reading its inputs from stdin, and returns its stdout, stderr
+        and return code.
+
+        The inputs are encoded and written to the process in chunks from a thread, while the
+        tool starts up and its output is read, so that neither pipe fills up.
+        """
+        with phase("spawn"):
+            process = subprocess.Popen(
+                args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        assert process.stdin and process.stdout and process.stderr
+        stderr_chunks: List[bytes] = []
+        stdin_sizes: List[int] = []
+        stdin_errors: List[BaseException] = []
+
+        def write_stdin():
+            assert process.stdin is not None
+            try:
+                with phase("encode"):
+                    data = self.json_codec.encode(stdin)
+                for chunk in self.json_codec.chunks(data):
+                    process.stdin.write(chunk)
+                stdin_sizes.append(len(data))
+                process.stdin.close()
+            except BrokenPipeError:
+                # The tool exited early, its stderr tells why.
+                pass
+            except BaseException as e:
+                # E.g. inputs that cannot be encoded: stop the tool, which would otherwise
+                # wait for the rest of its inputs, and raise the error in the caller.
+                stdin_errors.append(e)
+                process.kill()
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        def read_stderr():
+            assert process.stderr is not None
+            stderr_chunks.append(process.stderr.read())
+
+        threads = [
+            # The writer thread records its encoding time in the metrics of the current call.
+            threading.Thread(target=copy_context().run, args=(write_stdin,), daemon=True),
+            threading.Thread(target=read_stderr, daemon=True),
+        ]
+        with phase("execute"):
+            for thread in threads:
+                thread.start()
+            stdout = process.stdout.read()
+            for thread in threads:
+                thread.join()
+            process.stdout.close()
+            process.stderr.close()
+            returncode = process.wait()
+        if stdin_errors:
+            raise stdin_errors[0]
+        count_bytes(stdin=sum(stdin_sizes), stdout=len(stdout))
+        return stdout, b"".join(stderr_chunks), returncode
+
+    async def _evaluate_async(
+        self,
+        *,
+        alloc: Any,
+        txs: Any,
+        env: Any,
+        fork_name: str,
+        chain_id: int,
+        reward: int,
+        debug_output_path: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Executes `evm t8n` with the specified arguments without blocking the event loop.
+        """
+        with self.scratch.directory() as output_dir:
+            args = self._t8n_args(
+                env=env,
+                fork_name=fork_name,
+                chain_id=chain_id,
+                reward=reward,
+                output_dir=output_dir,
+            )
+            stdin = {
+                "alloc": alloc,
+                "txs": txs,
+                "env": env,
+            }
+            with phase("spawn"):
+                process = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+            assert process.stdout is not None and process.stderr is not None
+            with phase("execute"):
+                try:
+                    stdin_size, stdout, stderr = await asyncio.gather(
+                        self._write_stdin_async(process, stdin),
+                        process.stdout.read(),
+                        process.stderr.read(),
+                    )
+                except BaseException:
+                    # E.g. inputs that cannot be encoded: do not leave the tool running.
+                    if process.returncode is None:
+                        process.kill()
+                    await process.wait()
+                    raise
+                await process.wait()
+            count_bytes(stdin=stdin_size, stdout=len(stdout))
+            assert process.returncode is not None
+            return self._t8n_output(
+                args=args,
+                stdin=stdin,
+                stdout=stdout,
+                stderr=stderr,
+                returncode=process.returncode,
+                output_dir=output_dir,
+                debug_output_path=debug_output_path,
+            )
+
+    async def _write_stdin_async(
+        self, process: asyncio.subprocess.Process, stdin: Dict[str, Any]
+    ) -> int:
+        """
+        Encodes the inputs of a `t8n` invocation and writes them into the process without
+        blocking the event loop, and returns the number of bytes written.
+        """
+        assert process.stdin is not None
+        with phase("encode"):
+            data = self.json_codec.encode(stdin)
+        try:
+            for chunk in self.json_codec.chunks(data):
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            # The tool exited early, its stderr tells why.
+            pass
+        return len(data)
+
+    async def _evaluate_in_executor(self, **kwargs: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Runs the blocking `_evaluate` in the default executor of the running event loop, for
+        tools that cannot be driven by the loop directly.
+        """
+        return await self._run_in_executor(self._evaluate, **kwargs)
+
+    async def _run_in_executor(
+        self, function: Callable[..., Tuple[Dict[str, Any], Dict[str, Any]]], **kwargs: Any
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Runs a blocking evaluation in the default executor of the running event loop, within a
+        copy of the current context so that the call metrics follow it.
+        """
+        context = copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: context.run(partial(function, **kwargs))
+        )
+
+    def _t8n_args(
+        self, *, env: Any, fork_name: str, chain_id: int, reward: int, output_dir: str
+    ) -> List[str]:
+        """
+        Returns the command line of a `t8n` invocation reading its inputs from stdin.
+        """
         if int(env["currentNumber"], 0) == 0:
             reward = -1
 
@@ -262,7 +906,7 @@ class TransitionTool:
             "--output.result=stdout",
             "--output.alloc=stdout",
             "--output.body=txs.rlp",
-            f"--output.basedir={temp_dir.name}",
+            f"--output.basedir={output_dir}",
             f"--state.fork={fork_name}",
             f"--state.chainid={chain_id}",
             f"--state.reward={reward}",
@@ -270,26 +914,28 @@ class TransitionTool:
 
         if self.trace:
             args.append("--trace")
+        return args
 
-        stdin = {
-            "alloc": alloc,
-            "txs": txs,
-            "env": env,
-        }
-
-        encoded_input = str.encode(json.dumps(stdin))
-        result = subprocess.run(
-            args,
-            input=encoded_input,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
+    def _t8n_output(
+        self,
+        *,
+        args: List[str],
+        stdin: Dict[str, Any],
+        stdout: bytes,
+        stderr: bytes,
+        returncode: int,
+        output_dir: str,
+        debug_output_path: str,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Parses the output of a `t8n` invocation, once the tool exited, collecting its traces
+        and dumping the debug files if requested.
+        """
         if debug_output_path:
             t8n_script = textwrap.dedent(
                 f"""\
                 #!/bin/bash
-                mkdir {temp_dir.name}
+                mkdir -p {output_dir}
                 {' '.join(args)} < {debug_output_path}/stdin
                 """
             )
@@ -300,39 +946,27 @@ class TransitionTool:
                     "args": args,
                     "t8n.sh+x": t8n_script,
                     "stdin": stdin,
-                    "stdout": result.stdout.decode(),
-                    "stderr": result.stderr.decode(),
-                    "returncode": result.returncode,
+                    "stdout": stdout.decode(),
+                    "stderr": stderr.decode(),
+                    "returncode": returncode,
                 },
             )
 
-        if result.returncode != 0:
-            raise Exception("failed to evaluate: " + result.stderr.decode())
+        if returncode != 0:
+            raise Exception("failed to evaluate: " + stderr.decode())
 
-        output = json.loads(result.stdout)
+        try:
+            with phase("decode"):
+                output = self.json_codec.loads(stdout)
+        except ValueError:
+            raise Exception("malformed result")
 
-        if "alloc" not in output or "result" not in output:
+        if not isinstance(output, dict) or "alloc" not in output or "result" not in output:
             raise Exception("malformed result")
 
         if self.trace:
-            receipts: List[Any] = output["result"]["receipts"]
-            traces: List[List[Dict]] = []
-            for i, r in enumerate(receipts):
-                h = r["transactionHash"]
-                trace_file_name = f"trace-{i}-{h}.jsonl"
-                if debug_output_path:
-                    shutil.copy(
-                        os.path.join(temp_dir.name, trace_file_name),
-                        os.path.join(debug_output_path, trace_file_name),
-                    )
-                with open(os.path.join(temp_dir.name, trace_file_name), "r") as trace_file:
-                    tx_traces: List[Dict] = []
-                    for trace_line in trace_file.readlines():
-                        tx_traces.append(json.loads(trace_line))
-                    traces.append(tx_traces)
-            self.append_traces(traces)
-
-        temp_dir.cleanup()
+            with phase("traces"):
+                self.collect_traces(output["result"]["receipts"], output_dir, debug_output_path)
 
         if debug_output_path:
             dump_files_to_directory(
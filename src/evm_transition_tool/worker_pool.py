@@ -0,0 +1,188 @@
+"""
+Pool of long-lived transition tool worker processes.
+
+Workers are spoken to through a framed request/response protocol over their stdin and stdout:
+every message is a JSON document preceded by its length, encoded as a 4-byte big-endian
+unsigned integer.
+
+Requests follow the layout used by Besu's `t8n-server`:
+
+    {
+        "state": {"fork": "...", "chainid": 1, "reward": 0},
+        "input": {"alloc": {...}, "txs": [...], "env": {...}}
+    }
+
+and responses contain the `alloc` and `result` objects, optionally the `traces` collected
+during the transition, or a single `error` string if the request could not be processed.
+"""
+
+import json
+import struct
+import subprocess
+import tempfile
+from queue import Queue
+from typing import IO, Any, Dict, List, Optional, Sequence
+
+FRAME_HEADER = struct.Struct(">I")
+
+
+class TransitionToolWorkerError(Exception):
+    """Exception raised when a transition tool worker fails to process a request"""
+
+    pass
+
+
+def write_frame(stream: IO[bytes], message: Dict[str, Any]) -> None:
+    """
+    Writes a single length-prefixed JSON message to the stream.
+    """
+    payload = json.dumps(message).encode()
+    stream.write(FRAME_HEADER.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def read_frame(stream: IO[bytes]) -> Optional[Dict[str, Any]]:
+    """
+    Reads a single length-prefixed JSON message from the stream.
+
+    Returns `None` if the stream was closed before a new message started.
+    """
+    header = stream.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise TransitionToolWorkerError("truncated frame header")
+    (length,) = FRAME_HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        raise TransitionToolWorkerError(
+            f"truncated frame: expected {length} bytes, got {len(payload)}"
+        )
+    return json.loads(payload)
+
+
+class TransitionToolWorker:
+    """
+    A single long-lived worker process speaking the framed protocol.
+
+    The process is (re)started lazily, so a worker that crashed while serving a request is
+    transparently replaced on the next one.
+    """
+
+    command: List[str]
+    process: Optional[subprocess.Popen] = None
+
+    def __init__(self, command: Sequence[str]):
+        self.command = list(command)
+        self.stderr = tempfile.TemporaryFile()
+
+    def is_alive(self) -> bool:
+        """
+        Returns True if the worker process is running.
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """
+        Starts the worker process.
+        """
+        self.stderr.seek(0)
+        self.stderr.truncate()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.stderr,
+        )
+
+    def stderr_output(self) -> str:
+        """
+        Returns everything the current worker process wrote to stderr.
+        """
+        self.stderr.seek(0)
+        return self.stderr.read().decode(errors="replace")
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends a request to the worker and waits for its response.
+        """
+        if not self.is_alive():
+            self.start()
+        assert self.process is not None
+        assert self.process.stdin is not None and self.process.stdout is not None
+        try:
+            write_frame(self.process.stdin, message)
+            response = read_frame(self.process.stdout)
+        except (BrokenPipeError, TransitionToolWorkerError) as e:
+            self.stop()
+            raise TransitionToolWorkerError(
+                f"transition tool worker failed: {e}\n{self.stderr_output()}"
+            )
+        if response is None:
+            self.stop()
+            raise TransitionToolWorkerError(
+                "transition tool worker exited unexpectedly:\n" + self.stderr_output()
+            )
+        return response
+
+    def stop(self, timeout: float = 5) -> None:
+        """
+        Stops the worker process, killing it if it does not exit after its stdin is closed.
+        """
+        if self.process is None:
+            return
+        try:
+            if self.process.stdin is not None:
+                self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        if self.process.stdout is not None:
+            self.process.stdout.close()
+        self.process = None
+
+
+class TransitionToolWorkerPool:
+    """
+    Keeps a fixed number of transition tool workers warm and dispatches requests to the
+    first idle one.
+
+    The pool is safe to use from multiple threads.
+    """
+
+    workers: List[TransitionToolWorker]
+    idle_workers: "Queue[TransitionToolWorker]"
+
+    def __init__(self, *, command: Sequence[str], workers: int):
+        if workers < 1:
+            raise ValueError("a worker pool requires at least one worker")
+        self.workers = [TransitionToolWorker(command) for _ in range(workers)]
+        self.idle_workers = Queue()
+        for worker in self.workers:
+            worker.start()
+            self.idle_workers.put(worker)
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends a request to an idle worker and returns its response.
+        """
+        worker = self.idle_workers.get()
+        try:
+            response = worker.request(message)
+        finally:
+            self.idle_workers.put(worker)
+        if "error" in response:
+            raise TransitionToolWorkerError(response["error"])
+        return response
+
+    def shutdown(self) -> None:
+        """
+        Stops all worker processes.
+        """
+        for worker in self.workers:
+            worker.stop()
+            worker.stderr.close()
@@ -19,7 +19,7 @@ from ethereum_test_forks import (
     get_transition_forks,
     transition_fork_to,
 )
-from evm_transition_tool import TransitionTool
+from evm_transition_tool import ExecutionSpecsInProcessTransitionTool, TransitionTool
 
 
 def pytest_addoption(parser):
@@ -259,8 +259,10 @@ def pytest_configure(config):
         config.unsupported_forks = []
         return
 
-    evm_bin = config.getoption("evm_bin")
-    t8n = TransitionTool.from_binary_path(binary_path=evm_bin)
+    if config.getoption("in_process_t8n", default=False):
+        t8n: TransitionTool = ExecutionSpecsInProcessTransitionTool()
+    else:
+        t8n = TransitionTool.from_binary_path(binary_path=config.getoption("evm_bin"))
     config.unsupported_forks = [
         fork for fork in config.fork_range if not t8n.is_fork_supported(config.fork_map[fork])
     ]
@@ -0,0 +1,325 @@
+"""
+Work queue of a distributed fill, served over a TCP or Unix socket.
+
+A `fill --coordinator=ADDRESS` session collects the tests and serves their modules, the work
+units, to the `fill --worker-of=ADDRESS` sessions that connect to it, on the same or other
+hosts. Every worker collects the same tests, pulls a unit whenever it is ready for more work
+and streams the fixtures it fills back to the coordinator, which writes them once the unit
+completes. The units of a worker that disconnects before completing them are queued again,
+and the fixtures it sent for them are discarded.
+
+The protocol is one JSON object per line, the worker sending:
+- `{"op": "hello", "digest": ...}`, the digest of its collection, which must match the
+  coordinator's,
+- `{"op": "next"}`, answered by `{"unit": ..., "nodeids": [...]}`, or by
+  `{"wait": seconds}` while all the remaining units are in progress, or `{"done": true}`,
+- `{"op": "fixture", "position": ..., "module_file": ..., "name": ..., "fixture": ...}`,
+  not answered,
+- `{"op": "complete", "unit": ..., "failures": ..., "durations": {...}}`.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .fixture_writer import FixtureWriter, merge_shards, remove_shards
+from .scheduling import module_of
+
+COORDINATOR_SHARD = "coordinator"
+WAIT_INTERVAL = 0.5
+
+
+def parse_address(address: str) -> Tuple[socket.AddressFamily, Any]:
+    """
+    Parses a `host:port` or `unix:path` socket address.
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:") :]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "localhost", int(port))
+
+
+def format_address(family: socket.AddressFamily, address: Any) -> str:
+    """
+    Formats a socket address as accepted by `parse_address`.
+    """
+    if family == socket.AF_UNIX:
+        return f"unix:{address}"
+    return f"{address[0]}:{address[1]}"
+
+
+def collection_digest(nodeids: List[str]) -> str:
+    """
+    Returns the digest of the node ids of a collection, in order.
+    """
+    return hashlib.sha256("\n".join(nodeids).encode()).hexdigest()
+
+
+class CoordinatorError(Exception):
+    """
+    Raised on a worker when the coordinator rejects it.
+    """
+
+
+class FillCoordinator:
+    """
+    Serves the modules of the collected tests to the workers and writes the fixtures of the
+    completed modules.
+
+    The shards left in the output directory by an interrupted coordinator are removed before
+    serving, so that their fixtures are not merged with the new ones.
+    """
+
+    nodeids: List[str]
+    units: Dict[str, List[str]]
+    pending: List[str]
+    fixtures: Dict[str, List[Tuple[int, str, str, Dict[str, Any]]]]
+    completed: Set[str]
+    failures: int
+    durations: Dict[str, float]
+
+    def __init__(self, address: str, nodeids: List[str], output_dir: str) -> None:
+        self.nodeids = nodeids
+        self.units = {}
+        for nodeid in nodeids:
+            self.units.setdefault(module_of(nodeid), []).append(nodeid)
+        self.pending = list(self.units)
+        self.fixtures = {}
+        self.completed = set()
+        self.failures = 0
+        self.durations = {}
+        self.output_dir = output_dir
+        remove_shards(output_dir)
+        self.writer = FixtureWriter(output_dir, shard=COORDINATOR_SHARD)
+        self.lock = Lock()
+        self.finished = Event()
+        if not self.units:
+            self.finished.set()
+        self.server = self.make_server(address)
+        self.thread: Optional[Thread] = None
+
+    def make_server(self, address: str) -> socketserver.BaseServer:
+        """
+        Returns a threading server bound to the given address, handling every connection
+        with `handle`.
+        """
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                coordinator.handle(self.rfile, self.wfile)
+
+        family, server_address = parse_address(address)
+        server: socketserver.BaseServer
+        if family == socket.AF_UNIX:
+            if os.path.exists(server_address):
+                os.unlink(server_address)
+            server = socketserver.ThreadingUnixStreamServer(server_address, Handler)
+        else:
+            server = socketserver.ThreadingTCPServer(server_address, Handler)
+        server.daemon_threads = True  # type: ignore[attr-defined]
+        return server
+
+    @property
+    def address(self) -> str:
+        """
+        Returns the address the coordinator listens on, with the actual port if `0` was given.
+        """
+        return format_address(self.server.socket.family, self.server.server_address)
+
+    def start(self) -> None:
+        """
+        Starts serving the work units.
+        """
+        self.thread = Thread(target=self.server.serve_forever, name="fill-coordinator")
+        self.thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until all the work units are completed, and returns whether they are.
+        """
+        return self.finished.wait(timeout)
+
+    def close(self) -> int:
+        """
+        Stops serving, completes the fixture files and returns the number of files written.
+        """
+        if self.thread is not None:
+            self.server.shutdown()
+            self.thread.join()
+        self.server.server_close()
+        self.writer.close()
+        return merge_shards(self.output_dir)
+
+    def handle(self, rfile, wfile) -> None:
+        """
+        Serves the requests of a worker until it disconnects, then queues the units it did
+        not complete again.
+        """
+        connection: Set[str] = set()
+        try:
+            for line in rfile:
+                response = self.request(connection, json.loads(line))
+                if response is not None:
+                    wfile.write(json.dumps(response).encode() + b"\n")
+                    wfile.flush()
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self.lock:
+                for unit in connection - self.completed:
+                    self.fixtures.pop(unit, None)
+                    self.pending.insert(0, unit)
+
+    def request(self, connection: Set[str], message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Handles a request of a worker, which was assigned the units of `connection`.
+        """
+        op = message["op"]
+        with self.lock:
+            if op == "hello":
+                if message["digest"] != collection_digest(self.nodeids):
+                    return {"error": "the worker collected different tests"}
+                return {"ok": True}
+            if op == "next":
+                if self.pending:
+                    unit = self.pending.pop(0)
+                    self.fixtures[unit] = []
+                    connection.add(unit)
+                    return {"unit": unit, "nodeids": self.units[unit]}
+                if self.finished.is_set():
+                    return {"done": True}
+                return {"wait": WAIT_INTERVAL}
+            if op == "fixture":
+                unit = module_of(self.nodeids[message["position"]])
+                if unit in connection and unit not in self.completed:
+                    self.fixtures[unit].append(
+                        (
+                            message["position"],
+                            message["module_file"],
+                            message["name"],
+                            message["fixture"],
+                        )
+                    )
+                return None
+            if op == "complete":
+                unit = message["unit"]
+                if unit in connection and unit not in self.completed:
+                    for position, module_file, name, fixture in self.fixtures.pop(unit):
+                        self.writer.write(module_file, name, fixture, position)
+                    self.completed.add(unit)
+                    self.failures += message.get("failures", 0)
+                    self.durations.update(message.get("durations", {}))
+                    if len(self.completed) == len(self.units):
+                        self.finished.set()
+                return {"ok": True}
+        return {"error": f"unknown request: {op}"}
+
+
+class CoordinatorClient:
+    """
+    Connection of a worker to the coordinator.
+    """
+
+    def __init__(self, address: str, nodeids: List[str]) -> None:
+        family, server_address = parse_address(address)
+        self.socket = socket.socket(family, socket.SOCK_STREAM)
+        self.socket.connect(server_address)
+        self.rfile = self.socket.makefile("rb")
+        self.wfile = self.socket.makefile("wb")
+        self.lock = Lock()
+        response = self.request({"op": "hello", "digest": collection_digest(nodeids)})
+        if "error" in response:
+            self.close()
+            raise CoordinatorError(response["error"])
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """
+        Sends a message to the coordinator.
+        """
+        with self.lock:
+            self.wfile.write(json.dumps(message).encode() + b"\n")
+            self.wfile.flush()
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends a message to the coordinator and returns its response.
+        """
+        with self.lock:
+            self.wfile.write(json.dumps(message).encode() + b"\n")
+            self.wfile.flush()
+            line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("the coordinator closed the connection")
+        return json.loads(line)
+
+    def next_unit(self, wait: bool = True) -> Optional[Tuple[str, List[str]]]:
+        """
+        Returns the next work unit, or None once all the units are completed or the
+        coordinator is gone. Without `wait`, returns None as soon as no unit is pending.
+        """
+        while True:
+            try:
+                response = self.request({"op": "next"})
+            except (ConnectionError, OSError):
+                return None
+            if "unit" in response:
+                return response["unit"], response["nodeids"]
+            if response.get("done") or not wait:
+                return None
+            time.sleep(response["wait"])
+
+    def send_fixture(
+        self, position: int, module_file: str, name: str, fixture: Dict[str, Any]
+    ) -> None:
+        """
+        Streams a filled fixture to the coordinator.
+        """
+        self.send(
+            {
+                "op": "fixture",
+                "position": position,
+                "module_file": module_file,
+                "name": name,
+                "fixture": fixture,
+            }
+        )
+
+    def complete(self, unit: str, failures: int, durations: Dict[str, float]) -> None:
+        """
+        Reports the completion of a work unit.
+        """
+        self.request(
+            {"op": "complete", "unit": unit, "failures": failures, "durations": durations}
+        )
+
+    def close(self) -> None:
+        """
+        Closes the connection.
+        """
+        self.rfile.close()
+        self.wfile.close()
+        self.socket.close()
+
+
+class CoordinatorFixtureWriter(FixtureWriter):
+    """
+    Streams the fixtures filled by a worker to the coordinator instead of writing them.
+    """
+
+    def __init__(self, client: CoordinatorClient) -> None:
+        super().__init__("")
+        self.client = client
+
+    def write_fixture(
+        self, module_file: str, name: str, fixture: Dict[str, Any], position: int = 0
+    ) -> None:
+        """
+        Sends a fixture to the coordinator.
+        """
+        self.client.send_fixture(position, module_file, name, fixture)
@@ -0,0 +1,188 @@
+"""
+Fingerprints of the inputs of the filled test items, used by `fill --incremental` to reuse
+the fixtures of the items whose inputs did not change since the previous session.
+
+The fingerprint of an item covers:
+- the source of its test module, of the conftest files above it and of the helper modules
+  they import from the repository, recursively,
+- its node id, which includes its fork and other parameters,
+- the digest of the sources of the testing framework packages,
+- the version of the transition tool and of the solc compiler,
+- the command-line options that change the generated fixtures.
+"""
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+FINGERPRINTS_FILE = ".fingerprints.json"
+FRAMEWORK_PACKAGES = ("ethereum_test_forks", "ethereum_test_tools", "evm_transition_tool")
+
+
+@lru_cache(maxsize=None)
+def file_digest(path: Path) -> str:
+    """
+    Returns the SHA-256 digest of the contents of a file, or an empty string if it cannot be
+    read.
+    """
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def imported_modules(path: Path) -> Set[str]:
+    """
+    Returns the names of the modules imported by a Python source file, with relative imports
+    resolved against the file's package.
+    """
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return set()
+    names: Set[str] = set()
+    package_parts = path.parent.parts
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                # Relative imports are resolved as paths, see `module_dependencies`.
+                base = Path(*package_parts[: len(package_parts) - node.level + 1])
+                module_path = base.joinpath(*(node.module or "").split("."))
+                names.add(str(module_path))
+                names.update(str(module_path / alias.name) for alias in node.names)
+            elif node.module:
+                names.add(node.module)
+                names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+def module_file(name: str) -> Optional[Path]:
+    """
+    Returns the source file of a module given by name or by path, if it can be found
+    without importing it.
+    """
+    if os.sep in name:
+        path = Path(name)
+        for candidate in (path.with_suffix(".py"), path / "__init__.py"):
+            if candidate.is_file():
+                return candidate
+        return None
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+    return Path(spec.origin)
+
+
+@lru_cache(maxsize=None)
+def module_dependencies(path: Path, root: Path, excluded: Iterable[Path] = ()) -> List[Path]:
+    """
+    Returns the source files under `root` that the given file imports, directly or
+    indirectly, including itself and excluding the files under the `excluded` directories.
+    """
+    dependencies: Set[Path] = set()
+    pending = [path.resolve()]
+    while pending:
+        current = pending.pop()
+        if current in dependencies:
+            continue
+        dependencies.add(current)
+        # Importing a module runs the `__init__.py` of its package first.
+        package = current.parent if current.name != "__init__.py" else current.parent.parent
+        package_init = package / "__init__.py"
+        for dependency in [package_init if package_init.is_file() else None] + [
+            module_file(name) for name in imported_modules(current)
+        ]:
+            if dependency is None:
+                continue
+            dependency = dependency.resolve()
+            if not dependency.is_relative_to(root) or any(
+                dependency.is_relative_to(directory) for directory in excluded
+            ):
+                continue
+            pending.append(dependency)
+    return sorted(dependencies)
+
+
+@lru_cache(maxsize=None)
+def package_digest(package: str) -> str:
+    """
+    Returns the digest of the sources of an installed package, which changes with any edit
+    of the package, unlike its version number.
+    """
+    directory = package_directory(package)
+    if directory is None:
+        return ""
+    digest = hashlib.sha256()
+    for path in sorted(directory.rglob("*.py")):
+        digest.update(str(path.relative_to(directory)).encode())
+        digest.update(file_digest(path).encode())
+    return digest.hexdigest()
+
+
+def package_directory(package: str) -> Optional[Path]:
+    """
+    Returns the directory of an installed package.
+    """
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return Path(list(spec.submodule_search_locations)[0]).resolve()
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Returns the digest of the canonical JSON encoding of the given parts.
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class FillFingerprints:
+    """
+    Fingerprints and fixture locations of the items filled in previous sessions, stored in
+    the output directory along with the fixtures.
+    """
+
+    path: Path
+    entries: Dict[str, Dict[str, Any]]
+
+    def __init__(self, output_dir: Path):
+        self.path = Path(output_dir) / FINGERPRINTS_FILE
+        self.entries = self.load()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the entries stored by the previous session, if any.
+        """
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        """
+        Atomically stores the entries.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.entries, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
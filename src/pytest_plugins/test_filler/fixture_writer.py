@@ -0,0 +1,192 @@
+"""
+Streaming writer of the fixture files.
+
+Every fixture is encoded and appended to its output file as soon as it is produced, instead
+of being held until all the fixtures of the file are known, so that the memory used by the
+fill does not grow with the size of the test modules. The files are byte-for-byte identical to
+a `json.dump(..., indent=4)` of all their fixtures, keyed `NNN-name` in the order they were
+written.
+
+Files are written under a temporary name and moved in place once complete, so that an
+interrupted session never leaves a truncated fixture file, and the previous version of a
+file can still be read while its new version is written.
+
+When the tests of a module may run on several `pytest-xdist` workers, each worker writes
+shards instead, JSON lines files tagged with the collection position of the test of every
+fixture, and `merge_shards` reassembles each file in the collection order once the session
+ends, identical to the file a single worker would have written. The shards of the nodes of a
+multi-node fill are merged the same way by the `merge_fixtures` entry point.
+"""
+
+import glob
+import json
+import os
+from queue import Queue
+from threading import Thread
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+PARTIAL_SUFFIX = ".partial"
+SHARD_SUFFIX = ".shard"
+QUEUE_SIZE = 16
+
+
+class FixtureWriter:
+    """
+    Appends fixtures to their output files, optionally from a background thread.
+
+    With a background thread, fixtures are queued and encoded by the thread, at most
+    `QUEUE_SIZE` of them waiting at any time; errors of the thread are raised by `close`.
+    With a `shard` name, fixtures are appended to the shards of that name.
+    """
+
+    output_dir: str
+    shard: Optional[str]
+    files: Dict[str, IO[str]]
+    counts: Dict[str, int]
+
+    def __init__(
+        self, output_dir: str, *, background: bool = False, shard: Optional[str] = None
+    ) -> None:
+        self.output_dir = output_dir
+        self.shard = shard
+        self.files = {}
+        self.counts = {}
+        self.queue: Optional[Queue[Optional[Tuple[str, str, Dict[str, Any], int]]]] = None
+        self.thread: Optional[Thread] = None
+        self.error: Optional[BaseException] = None
+        if background:
+            self.queue = Queue(maxsize=QUEUE_SIZE)
+            self.thread = Thread(target=self.run, name="fixture-writer", daemon=True)
+            self.thread.start()
+
+    def path(self, module_file: str) -> str:
+        """
+        Returns the path of the output file of the given module file name.
+        """
+        return os.path.join(self.output_dir, module_file + ".json")
+
+    def write(
+        self, module_file: str, name: str, fixture: Dict[str, Any], position: int = 0
+    ) -> None:
+        """
+        Appends a fixture to the given output file; `position` is the collection position of
+        the test that produced it, used to order the shards.
+        """
+        if self.queue is None:
+            self.write_fixture(module_file, name, fixture, position)
+        elif self.error is None:
+            self.queue.put((module_file, name, fixture, position))
+
+    def write_fixture(
+        self, module_file: str, name: str, fixture: Dict[str, Any], position: int = 0
+    ) -> None:
+        """
+        Encodes a fixture and appends it to its output file, opening the file if needed.
+        """
+        index = self.counts.get(module_file, 0)
+        if index == 0:
+            path = self.path(module_file)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            if self.shard is None:
+                self.files[module_file] = open(path + PARTIAL_SUFFIX, "w")
+            else:
+                # A worker may run the tests of a split module in several batches.
+                self.files[module_file] = open(f"{path}.{self.shard}{SHARD_SUFFIX}", "a")
+        self.counts[module_file] = index + 1
+        if self.shard is not None:
+            line = json.dumps({"position": position, "name": name, "fixture": fixture})
+            self.files[module_file].write(line + "\n")
+            return
+        key = json.dumps(str(index).zfill(3) + "-" + name)
+        value = json.dumps(fixture, indent=4).replace("\n", "\n    ")
+        self.files[module_file].write(("{\n" if index == 0 else ",\n") + f"    {key}: {value}")
+
+    def run(self) -> None:
+        """
+        Writes the queued fixtures until `close` is called.
+        """
+        assert self.queue is not None
+        while (entry := self.queue.get()) is not None:
+            if self.error is not None:
+                continue
+            try:
+                self.write_fixture(*entry)
+            except BaseException as e:
+                self.error = e
+
+    def close(self) -> None:
+        """
+        Completes all the output files and moves them in place.
+        """
+        if self.queue is not None and self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.queue = None
+        for module_file, f in self.files.items():
+            if self.shard is not None:
+                f.close()
+                continue
+            if self.error is None:
+                f.write("\n}")
+            f.close()
+            if self.error is None:
+                os.replace(f.name, self.path(module_file))
+            else:
+                os.unlink(f.name)
+        self.files = {}
+        if self.error is not None:
+            raise self.error
+
+
+def shard_files(output_dir: str) -> Dict[str, List[str]]:
+    """
+    Returns the shards of the output directory, by module file.
+    """
+    shards: Dict[str, List[str]] = {}
+    pattern = os.path.join(glob.escape(output_dir), "**", f"*.json.*{SHARD_SUFFIX}")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        relative_path = os.path.relpath(path, output_dir)
+        module_file = relative_path[: relative_path.rindex(".json.")]
+        shards.setdefault(module_file, []).append(path)
+    return shards
+
+
+def remove_shards(output_dir: str) -> None:
+    """
+    Removes the shards left in the output directory, e.g. by an interrupted session.
+    """
+    for paths in shard_files(output_dir).values():
+        for path in paths:
+            os.unlink(path)
+
+
+def merge_shards(
+    output_dir: str, input_dirs: Optional[List[str]] = None, *, remove: bool = True
+) -> int:
+    """
+    Reassembles the fixture files from their shards, found in the input directories or else
+    in the output directory, in the collection order of the tests that produced them, and
+    returns the number of files written. The merged shards are removed unless `remove` is
+    false.
+    """
+    shards: Dict[str, List[str]] = {}
+    for input_dir in input_dirs or [output_dir]:
+        for module_file, paths in shard_files(input_dir).items():
+            shards.setdefault(module_file, []).extend(paths)
+    for module_file, paths in sorted(shards.items()):
+        entries = []
+        for path in paths:
+            with open(path) as f:
+                for sequence, line in enumerate(f):
+                    entry = json.loads(line)
+                    entries.append((entry["position"], path, sequence, entry))
+        # The fixtures of a test are all in the same shard, in the order they were produced.
+        entries.sort(key=lambda e: e[:3])
+        writer = FixtureWriter(output_dir)
+        for _, _, _, entry in entries:
+            writer.write(module_file, entry["name"], entry["fixture"])
+        writer.close()
+        if remove:
+            for path in paths:
+                os.unlink(path)
+    return len(shards)
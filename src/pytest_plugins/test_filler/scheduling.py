@@ -0,0 +1,170 @@
+"""
+Duration-aware scheduling of the tests across the `pytest-xdist` workers.
+
+Tests are grouped by module, as with `--dist loadscope`, and the modules are handed to the
+workers longest-first according to the durations recorded in previous sessions, so that the
+longest modules do not start last. A module expected to take longer than half of the fair
+share of a worker is split into its individual tests, which are then scheduled across all
+the workers; the fixtures it produces on several workers are merged once the session ends,
+see `fixture_writer.merge_shards`.
+
+The same durations deterministically partition the tests across the nodes of a multi-node
+fill, `fill --shard=i/n`, see `shard_assignment`.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+import pytest
+from xdist.remote import Producer  # type: ignore
+from xdist.scheduler import LoadScopeScheduling  # type: ignore
+from xdist.workermanage import WorkerController  # type: ignore
+
+DURATIONS_CACHE_KEY = "fill/durations"
+DEFAULT_DURATION = 1.0
+
+
+def module_of(nodeid: str) -> str:
+    """
+    Returns the module part of a test node id.
+    """
+    return nodeid.split("::", 1)[0]
+
+
+def expected_durations(collection: List[str], durations: Dict[str, float]) -> Dict[str, float]:
+    """
+    Returns the expected duration of every test, the mean recorded duration for the tests
+    that were never run.
+    """
+    known = [durations[nodeid] for nodeid in collection if nodeid in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+    return {nodeid: durations.get(nodeid, default) for nodeid in collection}
+
+
+def modules_to_split(expected: Dict[str, float], workers: int) -> Set[str]:
+    """
+    Returns the modules expected to take longer than half of the fair share of a worker.
+    """
+    if workers <= 1:
+        return set()
+    module_durations: Dict[str, float] = {}
+    for nodeid, duration in expected.items():
+        module = module_of(nodeid)
+        module_durations[module] = module_durations.get(module, 0.0) + duration
+    threshold = sum(expected.values()) / workers / 2
+    return {module for module, duration in module_durations.items() if duration > threshold}
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parses a `i/n` shard specification, with `1 <= i <= n`.
+    """
+    index, _, count = value.partition("/")
+    shard = (int(index), int(count))
+    if not 1 <= shard[0] <= shard[1]:
+        raise ValueError(f"invalid shard: {value}")
+    return shard
+
+
+def shard_assignment(
+    collection: List[str], durations: Dict[str, float], count: int
+) -> Dict[str, int]:
+    """
+    Assigns every test to one of `count` shards, numbered from 1, longest test first to the
+    shard with the least expected duration so far.
+
+    The assignment only depends on the collection and on the durations, so that every node
+    of a multi-node fill computes the same one. Without durations, the tests are dealt to
+    the shards in turn, in node id order.
+    """
+    expected = expected_durations(collection, durations)
+    loads = [(0.0, shard) for shard in range(1, count + 1)]
+    assignment: Dict[str, int] = {}
+    for nodeid in sorted(collection, key=lambda nodeid: (-expected[nodeid], nodeid)):
+        load, shard = heapq.heappop(loads)
+        assignment[nodeid] = shard
+        heapq.heappush(loads, (load + expected[nodeid], shard))
+    return assignment
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """
+    Schedules whole modules longest-first, splitting the longest ones into single tests.
+    """
+
+    durations: Dict[str, float]
+    expected: Dict[str, float]
+    split_modules: Set[str]
+    unit_durations: Dict[str, float]
+    workqueue_sorted: bool
+
+    def __init__(
+        self, config: pytest.Config, log: Optional[Producer], durations: Dict[str, float]
+    ) -> None:
+        super().__init__(config, log)
+        self.durations = durations
+        self.expected = {}
+        self.split_modules = set()
+        self.unit_durations = {}
+        self.workqueue_sorted = False
+
+    def _split_scope(self, nodeid: str) -> str:
+        """
+        Returns the work unit of a test: the test itself if its module is split, otherwise
+        its module.
+        """
+        module = module_of(nodeid)
+        return nodeid if module in self.split_modules else module
+
+    def schedule(self) -> None:
+        """
+        Estimates the durations of the tests and chooses the modules to split before the
+        first work units are assigned.
+        """
+        if self.collection is None and self.collection_is_completed:
+            collection = list(next(iter(self.registered_collections.values())))
+            self.expected = expected_durations(collection, self.durations)
+            self.split_modules = modules_to_split(self.expected, len(self.nodes))
+            if self.split_modules:
+                self.log("Splitting modules:", sorted(self.split_modules))
+        super().schedule()
+
+    def unit_duration(self, scope: str) -> float:
+        """
+        Returns the expected duration of a work unit.
+        """
+        if scope not in self.unit_durations:
+            self.unit_durations[scope] = sum(
+                self.expected.get(nodeid, 0.0) for nodeid in self.workqueue[scope]
+            )
+        return self.unit_durations[scope]
+
+    def remove_node(self, node: WorkerController) -> Optional[str]:
+        """
+        Removes a node, whose pending work units are queued again and sorted on the next
+        assignment.
+        """
+        self.workqueue_sorted = False
+        return super().remove_node(node)
+
+    def _assign_work_unit(self, node: WorkerController) -> None:
+        """
+        Assigns the longest pending work unit to a node.
+
+        The work queue is sorted longest-first once, instead of searched on every assignment.
+        """
+        assert self.workqueue
+        if not self.workqueue_sorted:
+            for scope in sorted(self.workqueue, key=self.unit_duration, reverse=True):
+                self.workqueue.move_to_end(scope)
+            self.workqueue_sorted = True
+        scope, work_unit = self.workqueue.popitem(last=False)
+        self.assigned_work.setdefault(node, {})[scope] = work_unit
+        worker_collection = self.registered_collections[node]
+        node.send_runtest_some(
+            [
+                worker_collection.index(nodeid)
+                for nodeid, completed in work_unit.items()
+                if not completed
+            ]
+        )
@@ -5,11 +5,17 @@ Top-level pytest configuration file providing:
 and that modifies pytest hooks in order to fill test specs for all tests and
 writes the generated fixtures to file.
 """
+import asyncio
 import json
 import os
 import re
+import shlex
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import asdict
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Tuple, Type
+from threading import Thread
+from typing import Any, Callable, Coroutine, Dict, Generator, List, Optional, Tuple, Type
 
 import pytest
 
@@ -20,14 +26,50 @@ from ethereum_test_tools import (
     BlockchainTest,
     BlockchainTestFiller,
     Fixture,
+    GenesisCache,
     StateTest,
     StateTestFiller,
     Yul,
     fill_test,
+    fill_test_async,
 )
-from evm_transition_tool import TransitionTool
+from ethereum_test_tools.spec.genesis_cache import DEFAULT_MAX_ENTRIES
+from evm_transition_tool import (
+    BesuTransitionTool,
+    ExecutionSpecsInProcessTransitionTool,
+    TransitionTool,
+)
+from evm_transition_tool.besu import DEFAULT_REQUEST_TIMEOUT
+from evm_transition_tool.cache import TransitionToolCacheStats
+from evm_transition_tool.metrics import metric_labels, prometheus_textfile, summarize
+from evm_transition_tool.probe import tool_probes
 from pytest_plugins.spec_version_checker.spec_version_checker import EIPSpecTestItem
 
+from .coordinator import CoordinatorClient, CoordinatorFixtureWriter, FillCoordinator
+from .fingerprints import (
+    FRAMEWORK_PACKAGES,
+    FillFingerprints,
+    file_digest,
+    fingerprint,
+    module_dependencies,
+    package_digest,
+    package_directory,
+)
+from .fixture_writer import FixtureWriter, merge_shards, remove_shards
+from .scheduling import DURATIONS_CACHE_KEY, DurationScheduling, parse_shard, shard_assignment
+
+TOOL_PROBE_CACHE = "tool-probes.json"
+T8N_METRICS_REPORT = "t8n-metrics.json"
+T8N_METRICS_TEXTFILE = "t8n-metrics.prom"
+FINGERPRINT_OPTIONS = (
+    "disable_hive",
+    "evm_bin",
+    "filler_path",
+    "flat_output",
+    "in_process_t8n",
+    "solc_bin",
+)
+
 
 def pytest_addoption(parser):
     """
@@ -51,6 +93,125 @@ def pytest_addoption(parser):
         default=None,
         help="Collect traces of the execution information from the transition tool.",
     )
+    evm_group.addoption(
+        "--in-process-t8n",
+        action="store_true",
+        dest="in_process_t8n",
+        default=False,
+        help=(
+            "Run the execution-specs transition tool within the pytest process instead of "
+            "starting a tool binary for every transition. Overrides --evm-bin."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-workers",
+        action="store",
+        dest="t8n_workers",
+        type=int,
+        default=0,
+        help=(
+            "Number of long-lived transition tool worker processes used to serve all the "
+            "state transitions of the session. Only applies to tools that stay loaded between "
+            "transitions: the in-process execution-specs tool (--in-process-t8n), Besu, or a "
+            "server given with --t8n-server-cmd; binaries started for every transition, such "
+            "as geth's evm, are not supported. Default: 0 (evaluate every transition directly)."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-server-cmd",
+        action="store",
+        dest="t8n_server_cmd",
+        default=None,
+        help=(
+            "Command that starts a worker speaking the framed t8n worker protocol, used with "
+            "--t8n-workers. Default: Besu's t8n-server, or the pure-Python reference server "
+            "hosting the in-process execution-specs tool."
+        ),
+    )
+    evm_group.addoption(
+        "--tool-probe-cache",
+        action="store",
+        dest="tool_probe_cache",
+        type=Path,
+        default=None,
+        help=(
+            "File storing the results of the commands run to identify the evm and solc "
+            "binaries, reused while the binaries are unchanged. "
+            f"Default: {TOOL_PROBE_CACHE} in pytest's cache directory."
+        ),
+    )
+    evm_group.addoption(
+        "--besu-request-timeout",
+        action="store",
+        dest="besu_request_timeout",
+        type=float,
+        default=DEFAULT_REQUEST_TIMEOUT,
+        help=(
+            "Timeout in seconds of a state transition request to a Besu `t8n-server`. "
+            f"Default: {DEFAULT_REQUEST_TIMEOUT:g}."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-cache-dir",
+        action="store",
+        dest="t8n_cache_dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory used to cache the results of the transition tool across tests, xdist "
+            "workers and sessions. Default: None (no caching)."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-cache-max-size",
+        action="store",
+        dest="t8n_cache_max_size",
+        type=int,
+        default=1024,
+        help=(
+            "Maximum size of the transition tool cache in MiB; the least recently used results "
+            "are evicted once it is exceeded. Default: 1024."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-capture-dir",
+        action="store",
+        dest="t8n_capture_dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory of a replay corpus where the inputs of slow or sampled transition tool "
+            "calls are captured, to be replayed with `t8n_replay`. Default: None (no capture)."
+        ),
+    )
+    evm_group.addoption(
+        "--t8n-capture-threshold",
+        action="store",
+        dest="t8n_capture_threshold",
+        type=float,
+        default=1.0,
+        help="Capture the transition tool calls taking at least this many seconds. Default: 1.",
+    )
+    evm_group.addoption(
+        "--t8n-capture-sample",
+        action="store",
+        dest="t8n_capture_sample",
+        type=float,
+        default=0.0,
+        help="Also capture this fraction of all the transition tool calls. Default: 0.",
+    )
+    evm_group.addoption(
+        "--t8n-metrics-dir",
+        action="store",
+        dest="t8n_metrics_dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory where a report of the latency, phases and I/O sizes of the transition "
+            f"tool calls is written, as {T8N_METRICS_REPORT} and as a Prometheus textfile, "
+            f"{T8N_METRICS_TEXTFILE}. Default: None (no metrics)."
+        ),
+    )
 
     solc_group = parser.getgroup("solc", "Arguments defining the solc executable")
     solc_group.addoption(
@@ -86,6 +247,13 @@ def pytest_addoption(parser):
         default=False,
         help="Output each test case in the directory without the folder structure.",
     )
+    test_group.addoption(
+        "--fixture-writer-thread",
+        action="store_true",
+        dest="fixture_writer_thread",
+        default=False,
+        help="Encode and write the fixtures from a background thread, off the test loop.",
+    )
     test_group.addoption(
         "--disable-hive",
         action="store_true",
@@ -93,6 +261,135 @@ def pytest_addoption(parser):
         default=False,
         help="Output tests skipping hive-related properties.",
     )
+    test_group.addoption(
+        "--incremental",
+        action="store_true",
+        dest="incremental",
+        default=False,
+        help=(
+            "Reuse the fixtures of the output directory for the tests whose module source, "
+            "imported helpers, fork, framework, tool versions and options did not change "
+            "since they were last filled."
+        ),
+    )
+    test_group.addoption(
+        "--duration-scheduling",
+        action="store_true",
+        dest="duration_scheduling",
+        default=False,
+        help=(
+            "With xdist, schedule the test modules longest-first using the test durations "
+            "recorded by previous sessions, splitting the longest modules across workers."
+        ),
+    )
+    test_group.addoption(
+        "--shard",
+        action="store",
+        dest="shard",
+        type=parse_shard,
+        default=None,
+        help=(
+            "Only fill the tests of shard `i/n` of a multi-node fill, writing fixture shards "
+            "to be combined by the `merge_fixtures` entry point."
+        ),
+    )
+    test_group.addoption(
+        "--shard-durations",
+        action="append",
+        dest="shard_durations",
+        type=Path,
+        default=[],
+        help=(
+            "Test durations file, e.g. `.pytest_cache/v/fill/durations`, used to balance the "
+            "shards of `--shard`; can be repeated. Every node must be given the same files."
+        ),
+    )
+    test_group.addoption(
+        "--coordinator",
+        action="store",
+        dest="coordinator",
+        default=None,
+        help=(
+            "Serve the collected test modules to `--worker-of` sessions on the given "
+            "`host:port` or `unix:path` address, instead of filling them, and write the "
+            "fixtures they fill."
+        ),
+    )
+    test_group.addoption(
+        "--worker-of",
+        action="store",
+        dest="worker_of",
+        default=None,
+        help=(
+            "Fill the test modules served by the `--coordinator` session at the given "
+            "`host:port` or `unix:path` address, streaming the fixtures back to it."
+        ),
+    )
+    test_group.addoption(
+        "--deferred-fill",
+        action="store_true",
+        dest="deferred_fill",
+        default=False,
+        help=(
+            "Fill the test specs in the background, resolving them once their test function "
+            "returns, instead of within the spec's constructor."
+        ),
+    )
+    test_group.addoption(
+        "--fill-engine",
+        action="store",
+        dest="fill_engine",
+        choices=["threads", "asyncio"],
+        default="threads",
+        help=(
+            "How deferred specs are filled concurrently: by a pool of threads, or by a single "
+            "asyncio event loop overlapping the transition tool calls. `asyncio` implies "
+            "`--deferred-fill`. Default: threads."
+        ),
+    )
+    test_group.addoption(
+        "--t8n-max-in-flight",
+        action="store",
+        dest="t8n_max_in_flight",
+        type=int,
+        default=0,
+        help=(
+            "Maximum number of transition tool calls in flight with `--fill-engine=asyncio`. "
+            "Default: one per worker with `--t8n-workers`, one per CPU otherwise."
+        ),
+    )
+
+    test_group.addoption(
+        "--genesis-cache-size",
+        action="store",
+        dest="genesis_cache_size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help=(
+            "Number of genesis blocks kept in memory, shared by the tests with the same fork, "
+            "pre-allocation and genesis environment; 0 disables the cache. "
+            f"Default: {DEFAULT_MAX_ENTRIES}."
+        ),
+    )
+    test_group.addoption(
+        "--genesis-cache-dir",
+        action="store",
+        dest="genesis_cache_dir",
+        type=Path,
+        default=None,
+        help="Also persist the cached genesis blocks to this directory, across sessions.",
+    )
+    test_group.addoption(
+        "--signing-workers",
+        action="store",
+        dest="signing_workers",
+        type=int,
+        default=None,
+        help=(
+            "Number of threads signing the transactions of the blocks that carry many of them. "
+            "Default: one per CPU, or one per `pytest-xdist` worker."
+        ),
+    )
 
     debug_group = parser.getgroup("debug", "Arguments defining debug behavior")
     debug_group.addoption(
@@ -102,6 +399,42 @@ def pytest_addoption(parser):
         default="",
         help="Path to dump the transition tool debug output.",
     )
+    debug_group.addoption(
+        "--verify-genesis-roots",
+        action="store_true",
+        dest="verify_genesis_roots",
+        default=False,
+        help=(
+            "Verify the genesis state and withdrawals roots computed in-process against the "
+            "roots computed by the transition tool."
+        ),
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """
+    Loads the results of the tool probes of previous sessions, before any plugin instantiates
+    a transition tool in its `pytest_configure` hook.
+
+    Without a `--tool-probe-cache` and with pytest's cache disabled, the probes are only kept
+    in memory for the session.
+    """
+    path = config.getoption("tool_probe_cache")
+    if path is None:
+        if not config.pluginmanager.has_plugin("cacheprovider"):
+            return
+        path = config.rootpath / config.getini("cache_dir") / TOOL_PROBE_CACHE
+    tool_probes.enable_persistence(path)
+
+
+def transition_tool_from_config(config, **kwargs) -> TransitionTool:
+    """
+    Instantiates the transition tool selected by the command-line options.
+    """
+    if config.getoption("in_process_t8n"):
+        return ExecutionSpecsInProcessTransitionTool(**kwargs)
+    return TransitionTool.from_binary_path(binary_path=config.getoption("evm_bin"), **kwargs)
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -128,22 +461,23 @@ def pytest_configure(config):
         "markers",
         "compile_yul_with(fork): Always compile Yul source using the corresponding evm version.",
     )
+    config.addinivalue_line(
+        "markers",
+        "no_deferred_fill: fill the test's specs within the test, even with --deferred-fill.",
+    )
+    config.t8n_cache_stats = TransitionToolCacheStats()
+    config.t8n_metrics_calls = []
+    config.fill_fingerprint_updates = {}
+    config.fill_reused_items = 0
+    config.fill_item_positions = {}
+    config.fill_durations = {}
+    if config.getoption("fill_engine") == "asyncio":
+        config.option.deferred_fill = True
     if config.option.collectonly:
         return
     # Instantiate the transition tool here to check that the binary path/trace option is valid.
     # This ensures we only raise an error once, if appropriate, instead of for every test.
-    t8n = TransitionTool.from_binary_path(
-        binary_path=config.getoption("evm_bin"), trace=config.getoption("evm_collect_traces")
-    )
-    if (
-        isinstance(config.getoption("numprocesses"), int)
-        and config.getoption("numprocesses") > 0
-        and "Besu" in str(t8n.detect_binary_pattern)
-    ):
-        pytest.exit(
-            "The Besu t8n tool does not work well with the xdist plugin; use -n=0.",
-            returncode=pytest.ExitCode.USAGE_ERROR,
-        )
+    transition_tool_from_config(config, trace=config.getoption("evm_collect_traces"))
 
 
 @pytest.hookimpl(trylast=True)
@@ -151,8 +485,7 @@ def pytest_report_header(config, start_path):
     """Add lines to pytest's console output header"""
     if config.option.collectonly:
         return
-    binary_path = config.getoption("evm_bin")
-    t8n = TransitionTool.from_binary_path(binary_path=binary_path)
+    t8n = transition_tool_from_config(config)
     solc_version_string = Yul("", binary=config.getoption("solc_bin")).version()
     return [f"{t8n.version()}, solc version {solc_version_string}"]
 
@@ -178,13 +511,247 @@ def t8n(request, evm_bin: Path) -> Generator[TransitionTool, None, None]:
     """
     Returns the configured transition tool.
     """
-    t8n = TransitionTool.from_binary_path(
-        binary_path=evm_bin, trace=request.config.getoption("evm_collect_traces")
+    t8n = transition_tool_from_config(
+        request.config, trace=request.config.getoption("evm_collect_traces")
     )
+    if isinstance(t8n, BesuTransitionTool):
+        t8n.request_timeout = request.config.getoption("besu_request_timeout")
+    if workers := request.config.getoption("t8n_workers"):
+        server_cmd = request.config.getoption("t8n_server_cmd")
+        t8n.start_worker_pool(
+            workers=workers,
+            command=shlex.split(server_cmd) if server_cmd else None,
+        )
+    if cache_dir := request.config.getoption("t8n_cache_dir"):
+        t8n.enable_cache(
+            directory=cache_dir,
+            max_size=request.config.getoption("t8n_cache_max_size") * 1024 * 1024,
+        )
+    if capture_dir := request.config.getoption("t8n_capture_dir"):
+        t8n.enable_capture(
+            directory=capture_dir,
+            threshold=request.config.getoption("t8n_capture_threshold"),
+            sample_rate=request.config.getoption("t8n_capture_sample"),
+        )
+    if request.config.getoption("t8n_metrics_dir"):
+        t8n.enable_metrics()
     yield t8n
+    if t8n.cache is not None:
+        request.config.t8n_cache_stats.update(t8n.cache.stats)
+    if t8n.metrics is not None:
+        request.config.t8n_metrics_calls.extend(t8n.metrics.to_json())
     t8n.shutdown()
 
 
+def pytest_sessionstart(session):
+    """
+    Removes the fixture shards left by an interrupted session.
+    """
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+    if (
+        config.getoption("duration_scheduling")
+        or config.getoption("shard")
+        or config.getoption("coordinator")
+    ):
+        remove_shards(config.getoption("output"))
+
+
+def load_shard_durations(paths: List[Path]) -> Dict[str, float]:
+    """
+    Returns the test durations of the given files, the later files taking precedence.
+    """
+    durations: Dict[str, float] = {}
+    for path in paths:
+        with open(path) as f:
+            durations.update(json.load(f))
+    return durations
+
+
+def pytest_collection_finish(session):
+    """
+    Records the collection position of every item, which orders the fixtures of modules
+    split across workers; with `--shard`, positions are recorded before the items of the
+    other shards are deselected.
+    """
+    if session.config.getoption("shard"):
+        return
+    session.config.fill_item_positions = {item.nodeid: i for i, item in enumerate(session.items)}
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session):
+    """
+    With `--coordinator`, serves the collected modules to the workers until they are all
+    filled. With `--worker-of`, fills the modules served by the coordinator.
+    """
+    config = session.config
+    if config.option.collectonly or session.testsfailed:
+        return None
+    if address := config.getoption("coordinator"):
+        coordinate_fill(session, address)
+        return True
+    if address := config.getoption("worker_of"):
+        fill_coordinated_units(session, address)
+        return True
+    return None
+
+
+def coordinate_fill(session, address: str) -> None:
+    """
+    Serves the collected modules to the workers and writes the fixtures they fill.
+    """
+    config = session.config
+    coordinator = FillCoordinator(
+        address, [item.nodeid for item in session.items], config.getoption("output")
+    )
+    coordinator.start()
+    terminalreporter = config.pluginmanager.get_plugin("terminalreporter")
+    if terminalreporter is not None:
+        terminalreporter.write_line(
+            f"Serving {len(coordinator.units)} modules to workers on {coordinator.address}"
+        )
+    try:
+        coordinator.wait()
+    finally:
+        coordinator.close()
+    session.testsfailed += coordinator.failures
+    config.fill_durations.update(coordinator.durations)
+
+
+def fill_coordinated_units(session, address: str) -> None:
+    """
+    Runs the items of the modules served by the coordinator, fetching the next module before
+    the last item of the current one runs, so that the session-scoped fixtures are kept.
+    """
+    config = session.config
+    items = {item.nodeid: item for item in session.items}
+    client = CoordinatorClient(address, list(items))
+    config.fill_coordinator_client = client
+    try:
+        unit = client.next_unit()
+        while unit is not None:
+            name, nodeids = unit
+            failures = session.testsfailed
+            next_unit = None
+            for i, nodeid in enumerate(nodeids):
+                nextitem = items[nodeids[i + 1]] if i + 1 < len(nodeids) else None
+                if nextitem is None and (next_unit := client.next_unit(wait=False)):
+                    nextitem = items[next_unit[1][0]]
+                items[nodeid].config.hook.pytest_runtest_protocol(
+                    item=items[nodeid], nextitem=nextitem
+                )
+                if session.shouldfail or session.shouldstop:
+                    return
+            client.complete(
+                name,
+                session.testsfailed - failures,
+                {nodeid: config.fill_durations.get(nodeid, 0.0) for nodeid in nodeids},
+            )
+            unit = next_unit or client.next_unit()
+    finally:
+        client.close()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """
+    Returns the duration-aware scheduler if `--duration-scheduling` is enabled.
+    """
+    if not config.getoption("duration_scheduling"):
+        return None
+    cache = getattr(config, "cache", None)
+    durations = cache.get(DURATIONS_CACHE_KEY, {}) if cache is not None else {}
+    return DurationScheduling(config, log, durations)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Records the duration of every test, for the duration-aware scheduling of later sessions.
+    """
+    outcome = yield
+    durations = item.config.fill_durations
+    durations[item.nodeid] = durations.get(item.nodeid, 0.0) + outcome.get_result().duration
+
+
+def pytest_sessionfinish(session):
+    """
+    Sends the transition tool cache statistics, metrics, fill fingerprints and test durations
+    of an xdist worker to the controller. Otherwise, merges the fixture shards, stores the
+    fingerprints and the test durations, and writes the metrics report.
+    """
+    config = session.config
+    if hasattr(config, "workeroutput"):
+        config.workeroutput["t8n_cache_stats"] = asdict(config.t8n_cache_stats)
+        config.workeroutput["t8n_metrics_calls"] = config.t8n_metrics_calls
+        config.workeroutput["fill_fingerprint_updates"] = config.fill_fingerprint_updates
+        config.workeroutput["fill_reused_items"] = config.fill_reused_items
+        config.workeroutput["fill_durations"] = config.fill_durations
+        return
+    if config.getoption("duration_scheduling") and not config.getoption("shard"):
+        merge_shards(config.getoption("output"))
+    # pytest's cache is not available with `-p no:cacheprovider`.
+    cache = getattr(config, "cache", None)
+    if config.fill_durations and cache is not None:
+        cache.set(DURATIONS_CACHE_KEY, cache.get(DURATIONS_CACHE_KEY, {}) | config.fill_durations)
+    if config.getoption("incremental") and config.fill_fingerprint_updates:
+        fingerprints = FillFingerprints(config.getoption("output"))
+        fingerprints.entries.update(config.fill_fingerprint_updates)
+        fingerprints.entries = {k: v for k, v in fingerprints.entries.items() if v is not None}
+        fingerprints.save()
+    if metrics_dir := config.getoption("t8n_metrics_dir"):
+        summary = summarize(config.t8n_metrics_calls)
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        with open(metrics_dir / T8N_METRICS_REPORT, "w") as f:
+            json.dump(summary, f, indent=4)
+        with open(metrics_dir / T8N_METRICS_TEXTFILE, "w") as f:
+            f.write(prometheus_textfile(summary))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Collects the transition tool cache statistics, metrics, fill fingerprints and test
+    durations of a finished xdist worker.
+    """
+    workeroutput = getattr(node, "workeroutput", {})
+    if stats := workeroutput.get("t8n_cache_stats"):
+        node.config.t8n_cache_stats.update(TransitionToolCacheStats(**stats))
+    node.config.t8n_metrics_calls.extend(workeroutput.get("t8n_metrics_calls", []))
+    node.config.fill_fingerprint_updates.update(workeroutput.get("fill_fingerprint_updates", {}))
+    node.config.fill_reused_items += workeroutput.get("fill_reused_items", 0)
+    node.config.fill_durations.update(workeroutput.get("fill_durations", {}))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """
+    Reports the transition tool cache statistics, the location of the metrics report and the
+    number of reused fixtures at the end of the session.
+    """
+    if hasattr(config, "workerinput"):
+        return
+    if config.getoption("incremental"):
+        terminalreporter.write_sep("-", "incremental fill")
+        terminalreporter.write_line(
+            f"{config.fill_reused_items} of {len(config.fill_fingerprint_updates)} tests reused "
+            "their previous fixtures"
+        )
+    if config.getoption("t8n_cache_dir"):
+        stats = config.t8n_cache_stats
+        terminalreporter.write_sep("-", "t8n cache")
+        terminalreporter.write_line(
+            f"{stats.hits} hits, {stats.misses} misses ({stats.hit_rate:.1%} hit rate)"
+        )
+    if metrics_dir := config.getoption("t8n_metrics_dir"):
+        terminalreporter.write_sep("-", "t8n metrics")
+        terminalreporter.write_line(
+            f"{len(config.t8n_metrics_calls)} calls, report written to "
+            f"{metrics_dir / T8N_METRICS_REPORT}"
+        )
+
+
 @pytest.fixture(autouse=True, scope="session")
 def base_test_config(request) -> BaseTestConfig:
     """
@@ -192,6 +759,17 @@ def base_test_config(request) -> BaseTestConfig:
     """
     config = BaseTestConfig()
     config.disable_hive = request.config.getoption("disable_hive")
+    config.verify_genesis_roots = request.config.getoption("verify_genesis_roots")
+    config.signing_workers = request.config.getoption("signing_workers")
+    if config.signing_workers is None and hasattr(request.config, "workerinput"):
+        # The `pytest-xdist` workers already use all the CPUs.
+        config.signing_workers = 1
+    if max_entries := request.config.getoption("genesis_cache_size"):
+        config.genesis_cache = GenesisCache(
+            max_entries=max_entries,
+            directory=request.config.getoption("genesis_cache_dir"),
+            version=fingerprint(*(package_digest(package) for package in FRAMEWORK_PACKAGES)),
+        )
     return config
 
 
@@ -214,17 +792,31 @@ def convert_test_name_to_path(name: str) -> str:
 
 class FixtureCollector:
     """
-    Collects all fixtures generated by the test cases.
+    Collects all fixtures generated by the test cases, streaming each of them to its output
+    file as soon as it is added.
     """
 
-    all_fixtures: Dict[str, List[Tuple[str, Any]]]
     output_dir: str
     flat_output: bool
-
-    def __init__(self, output_dir: str, flat_output: bool) -> None:
-        self.all_fixtures = {}
+    writer: FixtureWriter
+    fingerprints: Dict[str, str]
+    filled: Dict[str, List[Dict[str, str]]]
+    previous_fixtures: Dict[str, Dict[str, Any]]
+
+    def __init__(
+        self,
+        output_dir: str,
+        flat_output: bool,
+        writer_thread: bool = False,
+        shard: Optional[str] = None,
+        writer: Optional[FixtureWriter] = None,
+    ) -> None:
         self.output_dir = output_dir
         self.flat_output = flat_output
+        self.writer = writer or FixtureWriter(output_dir, background=writer_thread, shard=shard)
+        self.fingerprints = {}
+        self.filled = {}
+        self.previous_fixtures = {}
 
     def add_fixture(self, item, fixture: Fixture) -> None:
         """
@@ -241,7 +833,7 @@ class FixtureCollector:
             module_path_no_ext = os.path.join(dirname, basename)
             module_dir = os.path.relpath(
                 module_path_no_ext,
-                item.funcargs["filler_path"],
+                item.config.getoption("filler_path"),
             )
             return module_dir
 
@@ -253,33 +845,70 @@ class FixtureCollector:
                 strip_test_prefix(item.originalname),
             )
         )
-        if module_dir not in self.all_fixtures:
-            self.all_fixtures[module_dir] = []
         m = re.match(r".*?\[(.*)\]", item.name)
         if not m:
             raise Exception("Could not parse test name: " + item.name)
         name = m.group(1)
         if fixture.name:
             name += "-" + fixture.name
-        jsonFixture = fixture.to_json()
-        self.all_fixtures[module_dir].append((name, jsonFixture))
+        self.writer.write(module_dir, name, fixture.to_json(), self.position(item))
+        self.filled.setdefault(item.nodeid, []).append({"file": module_dir, "name": name})
+
+    def position(self, item) -> int:
+        """
+        Returns the collection position of an item.
+        """
+        return item.config.fill_item_positions.get(item.nodeid, 0)
+
+    def reuse_fixtures(self, item, fixtures: List[Dict[str, str]]) -> bool:
+        """
+        Adds the given fixtures from the previous contents of the output directory, and
+        returns False, adding none of them, if any is missing.
+        """
+        found = []
+        for fixture in fixtures:
+            module_file = fixture["file"]
+            if module_file not in self.previous_fixtures:
+                self.previous_fixtures[module_file] = {}
+                try:
+                    with open(os.path.join(self.output_dir, module_file + ".json")) as f:
+                        for indexed_name, contents in json.load(f).items():
+                            # Strip the index prefix added by `dump_fixtures`.
+                            name = indexed_name.split("-", 1)[1]
+                            self.previous_fixtures[module_file][name] = contents
+                except (OSError, ValueError, IndexError):
+                    pass
+            if fixture["name"] not in self.previous_fixtures[module_file]:
+                return False
+            found.append((module_file, fixture["name"]))
+        for module_file, name in found:
+            self.writer.write(
+                module_file,
+                name,
+                self.previous_fixtures[module_file].pop(name),
+                self.position(item),
+            )
+        return True
 
     def dump_fixtures(self) -> None:
         """
-        Dumps all collected fixtures to their respective files.
+        Completes the fixture files of the module.
         """
         os.makedirs(self.output_dir, exist_ok=True)
-        for module_file, fixtures in self.all_fixtures.items():
-            output_json = {}
-            for index, name_fixture in enumerate(fixtures):
-                name, fixture = name_fixture
-                name = str(index).zfill(3) + "-" + name
-                output_json[name] = fixture
-            file_path = os.path.join(self.output_dir, module_file + ".json")
-            if not self.flat_output:
-                os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, "w") as f:
-                json.dump(output_json, f, indent=4)
+        self.writer.close()
+
+
+def writer_shard(config) -> Optional[str]:
+    """
+    Returns the name of the fixture shards written by this process, if the tests of a module
+    may run on several nodes or workers.
+    """
+    parts = []
+    if shard := config.getoption("shard"):
+        parts.append("node{}of{}".format(*shard))
+    if hasattr(config, "workerinput") and (parts or config.getoption("duration_scheduling")):
+        parts.append(config.workerinput["workerid"])
+    return "-".join(parts) or None
 
 
 @pytest.fixture(scope="module")
@@ -288,12 +917,276 @@ def fixture_collector(request):
     Returns the configured fixture collector instance used for all tests
     in one test module.
     """
+    config = request.config
     fixture_collector = FixtureCollector(
-        output_dir=request.config.getoption("output"),
-        flat_output=request.config.getoption("flat_output"),
+        output_dir=config.getoption("output"),
+        flat_output=config.getoption("flat_output"),
+        writer_thread=config.getoption("fixture_writer_thread"),
+        shard=writer_shard(config),
+        writer=(
+            CoordinatorFixtureWriter(config.fill_coordinator_client)
+            if config.getoption("worker_of")
+            else None
+        ),
     )
     yield fixture_collector
     fixture_collector.dump_fixtures()
+    for nodeid, fixture_fingerprint in fixture_collector.fingerprints.items():
+        if nodeid in fixture_collector.filled:
+            request.config.fill_fingerprint_updates[nodeid] = {
+                "fingerprint": fixture_fingerprint,
+                "fixtures": fixture_collector.filled[nodeid],
+            }
+
+
+def session_fingerprint(config, t8n: TransitionTool) -> str:
+    """
+    Returns the fingerprint of the inputs shared by all the items of the session.
+    """
+    if not hasattr(config, "fill_session_fingerprint"):
+        try:
+            solc_version = Yul("", binary=config.getoption("solc_bin")).version()
+        except Exception:
+            solc_version = ""
+        config.fill_session_fingerprint = fingerprint(
+            {package: package_digest(package) for package in FRAMEWORK_PACKAGES},
+            t8n.version(),
+            solc_version,
+            {option: config.getoption(option) for option in FINGERPRINT_OPTIONS},
+        )
+    return config.fill_session_fingerprint
+
+
+def item_fingerprint(item, t8n: TransitionTool) -> str:
+    """
+    Returns the fingerprint of the inputs of a test item: its module and the helpers it
+    imports, the conftest files above it, its parameters including the fork, and the inputs
+    shared by all the items of the session.
+    """
+    root = item.config.rootpath.resolve()
+    excluded = tuple(
+        directory
+        for directory in map(package_directory, FRAMEWORK_PACKAGES)
+        if directory is not None
+    )
+    sources = list(module_dependencies(Path(item.path), root, excluded))
+    directory = Path(item.path).resolve().parent
+    while directory.is_relative_to(root):
+        conftest = directory / "conftest.py"
+        if conftest.is_file():
+            sources += module_dependencies(conftest, root, excluded)
+        if directory == root:
+            break
+        directory = directory.parent
+    fork = getattr(item, "callspec", None) and item.callspec.params.get("fork")
+    return fingerprint(
+        session_fingerprint(item.config, t8n),
+        item.nodeid,
+        str(fork),
+        sorted({str(path.relative_to(root)): file_digest(path) for path in sources}.items()),
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """
+    With `--incremental`, skips the test function of an item whose fingerprint did not change
+    since it was last filled, reusing its fixtures from the output directory.
+    """
+    config = pyfuncitem.config
+    if (
+        not config.getoption("incremental")
+        or config.getoption("evm_collect_traces")
+        or config.getoption("t8n_dump_dir")
+        or not any(p in pyfuncitem.fixturenames for p in SPEC_TYPES_PARAMETERS)
+    ):
+        return None
+    fixture_collector = pyfuncitem.funcargs["fixture_collector"]
+    nodeid = pyfuncitem.nodeid
+    current = item_fingerprint(pyfuncitem, pyfuncitem.funcargs["t8n"])
+    if not hasattr(config, "fill_fingerprints"):
+        config.fill_fingerprints = FillFingerprints(config.getoption("output"))
+    previous = config.fill_fingerprints.entries.get(nodeid)
+    if (
+        previous is not None
+        and previous["fingerprint"] == current
+        and fixture_collector.reuse_fixtures(pyfuncitem, previous["fixtures"])
+    ):
+        config.fill_fingerprint_updates[nodeid] = previous
+        config.fill_reused_items += 1
+        return True
+    # Forget the previous entry unless the item fills its fixtures again.
+    config.fill_fingerprint_updates[nodeid] = None
+    fixture_collector.fingerprints[nodeid] = current
+    return None
+
+
+def with_metric_labels(
+    fill: Callable[[], Fixture],
+    fill_async: Callable[..., Coroutine[Any, Any, Fixture]],
+    **labels: str,
+) -> Tuple[Callable[[], Fixture], Callable[..., Coroutine[Any, Any, Fixture]]]:
+    """
+    Wraps the fill functions of a spec so that the transition tool calls they make are
+    labeled in the metrics, whichever thread or task runs them.
+    """
+
+    def labeled_fill() -> Fixture:
+        with metric_labels(**labels):
+            return fill()
+
+    async def labeled_fill_async(**kwargs: Any) -> Fixture:
+        with metric_labels(**labels):
+            return await fill_async(**kwargs)
+
+    return labeled_fill, labeled_fill_async
+
+
+class DeferredFiller:
+    """
+    Fills the test specs of a module in the background, started as soon as a test defines
+    them, as many at a time as the transition tool can evaluate.
+
+    The specs of a test are resolved once its test function returns, see
+    `pytest_runtest_call`: their fixtures are added to the collector and the first fill error
+    fails the test, so every result is reported by the test that defined the spec. With the
+    `asyncio` engine, specs are filled by coroutines of a single event loop running in a
+    background thread instead of a pool of threads, the blocks of every spec still being
+    produced one after the other.
+    """
+
+    pending: Dict[str, List["Future[Fixture]"]]
+    executor: Optional[ThreadPoolExecutor]
+    loop: Optional[asyncio.AbstractEventLoop]
+    in_flight: Optional[asyncio.Semaphore]
+
+    def __init__(
+        self,
+        t8n: TransitionTool,
+        fixture_collector: FixtureCollector,
+        engine: str = "threads",
+        max_in_flight: int = 0,
+    ) -> None:
+        self.t8n = t8n
+        self.fixture_collector = fixture_collector
+        self.engine = engine
+        self.max_in_flight = max_in_flight
+        self.pending = {}
+        self.executor = None
+        self.loop = None
+        self.in_flight = None
+
+    def defer(
+        self,
+        item: pytest.Item,
+        fill: Callable[[], Fixture],
+        fill_async: Callable[..., Coroutine[Any, Any, Fixture]],
+    ) -> None:
+        """
+        Starts filling the spec defined by a test item; `fill_async` is called with the
+        semaphore limiting the transition tool calls in flight.
+        """
+        # Traces are collected in the transition tool, so traced specs are filled one at a time.
+        if self.t8n.trace or self.engine != "asyncio":
+            future = self.thread_pool().submit(fill)
+        else:
+            loop = self.event_loop()
+            future = asyncio.run_coroutine_threadsafe(fill_async(in_flight=self.in_flight), loop)
+        self.pending.setdefault(item.nodeid, []).append(future)
+        item.stash[DEFERRED_FILLER_KEY] = self
+
+    def resolve(self, item: pytest.Item) -> Optional[Exception]:
+        """
+        Waits for the specs defined by a test item, adds their fixtures to the collector and
+        returns the first error raised while filling them, if any.
+        """
+        error: Optional[Exception] = None
+        for future in self.pending.pop(item.nodeid, []):
+            try:
+                fixture = future.result()
+            except Exception as e:
+                error = error or e
+            else:
+                self.fixture_collector.add_fixture(item, fixture)
+        return error
+
+    def thread_pool(self) -> ThreadPoolExecutor:
+        """
+        Returns the pool of threads filling the specs, started on first use.
+        """
+        if self.executor is None:
+            workers = 1 if self.t8n.trace else self.t8n.batch_concurrency()
+            self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        return self.executor
+
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the event loop filling the specs, started in a background thread on first use.
+        """
+        if self.loop is None:
+            loop = asyncio.new_event_loop()
+            Thread(target=loop.run_forever, name="deferred-fill", daemon=True).start()
+            self.in_flight = asyncio.run_coroutine_threadsafe(
+                self.create_semaphore(), loop
+            ).result()
+            self.loop = loop
+        return self.loop
+
+    async def create_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore limiting the transition tool calls in flight, created within
+        the event loop using it.
+        """
+        return asyncio.Semaphore(self.max_in_flight or self.t8n.batch_concurrency())
+
+    def close(self) -> None:
+        """
+        Waits for the specs still being filled and stops the threads or the event loop.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.loop is not None:
+            for futures in self.pending.values():
+                wait(futures)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.loop = None
+        self.pending = {}
+
+
+DEFERRED_FILLER_KEY = pytest.StashKey[DeferredFiller]()
+
+
+def fills_within_test(item: pytest.Item) -> bool:
+    """
+    Returns True if the specs of a test must be filled within the test even with
+    `--deferred-fill`: if it is marked `no_deferred_fill`, or if its test function uses
+    `pytest.raises`, which may expect filling a spec to raise.
+    """
+    if item.get_closest_marker("no_deferred_fill"):
+        return True
+    function = getattr(item, "function", None)
+    return function is not None and "raises" in function.__code__.co_names
+
+
+@pytest.fixture(scope="module")
+def deferred_filler(
+    request, t8n, fixture_collector
+) -> Generator[DeferredFiller | None, None, None]:
+    """
+    Returns the deferred filler of the module if `--deferred-fill` is enabled, None otherwise.
+    """
+    if not request.config.getoption("deferred_fill"):
+        yield None
+        return
+    deferred_filler = DeferredFiller(
+        t8n,
+        fixture_collector,
+        engine=request.config.getoption("fill_engine"),
+        max_in_flight=request.config.getoption("t8n_max_in_flight"),
+    )
+    yield deferred_filler
+    deferred_filler.close()
 
 
 @pytest.fixture(autouse=True, scope="session")
@@ -359,7 +1252,15 @@ SPEC_TYPES_PARAMETERS: List[str] = [s.pytest_parameter_name() for s in SPEC_TYPE
 
 @pytest.fixture(scope="function")
 def state_test(
-    request, t8n, fork, engine, reference_spec, eips, fixture_collector, base_test_config
+    request,
+    t8n,
+    fork,
+    engine,
+    reference_spec,
+    eips,
+    fixture_collector,
+    deferred_filler,
+    base_test_config,
 ) -> StateTestFiller:
     """
     Fixture used to instantiate an auto-fillable StateTest object from within
@@ -381,24 +1282,31 @@ def state_test(
                     t8n_dump_dir, convert_test_name_to_path(request.node.name)
                 )
             super(StateTestWrapper, self).__init__(*args, **kwargs)
-            fixture_collector.add_fixture(
-                request.node,
-                fill_test(
-                    t8n,
-                    self,
-                    fork,
-                    engine,
-                    reference_spec,
-                    eips=eips,
-                ),
+            fill, fill_async = with_metric_labels(
+                partial(fill_test, t8n, self, fork, engine, reference_spec, eips=eips),
+                partial(fill_test_async, t8n, self, fork, engine, reference_spec, eips=eips),
+                test=request.node.nodeid,
+                spec="state_test",
             )
+            if deferred_filler is not None and not fills_within_test(request.node):
+                deferred_filler.defer(request.node, fill, fill_async)
+            else:
+                fixture_collector.add_fixture(request.node, fill())
 
     return StateTestWrapper
 
 
 @pytest.fixture(scope="function")
 def blockchain_test(
-    request, t8n, fork, engine, reference_spec, eips, fixture_collector, base_test_config
+    request,
+    t8n,
+    fork,
+    engine,
+    reference_spec,
+    eips,
+    fixture_collector,
+    deferred_filler,
+    base_test_config,
 ) -> BlockchainTestFiller:
     """
     Fixture used to define an auto-fillable BlockchainTest analogous to the
@@ -414,28 +1322,31 @@ def blockchain_test(
                     t8n_dump_dir, convert_test_name_to_path(request.node.name)
                 )
             super(BlockchainTestWrapper, self).__init__(*args, **kwargs)
-            fixture_collector.add_fixture(
-                request.node,
-                fill_test(
-                    t8n,
-                    self,
-                    fork,
-                    engine,
-                    reference_spec,
-                    eips=eips,
-                ),
+            fill, fill_async = with_metric_labels(
+                partial(fill_test, t8n, self, fork, engine, reference_spec, eips=eips),
+                partial(fill_test_async, t8n, self, fork, engine, reference_spec, eips=eips),
+                test=request.node.nodeid,
+                spec="blockchain_test",
             )
+            if deferred_filler is not None and not fills_within_test(request.node):
+                deferred_filler.defer(request.node, fill, fill_async)
+            else:
+                fixture_collector.add_fixture(request.node, fill())
 
     return BlockchainTestWrapper
 
 
+@pytest.hookimpl(hookwrapper=True)
 def pytest_collection_modifyitems(items, config):
     """
     A pytest hook called during collection, after all items have been
     collected.
 
     Here we dynamically apply "state_test" or "blockchain_test" markers
-    to a test if the test function uses the corresponding fixture.
+    to a test if the test function uses the corresponding fixture, before
+    the items are selected by marker. Once all the other plugins have
+    selected the items, the items of the other shards are deselected with
+    `--shard`.
     """
     for item in items:
         if isinstance(item, EIPSpecTestItem):
@@ -449,6 +1360,27 @@ def pytest_collection_modifyitems(items, config):
         if "yul" in item.fixturenames:
             marker = pytest.mark.yul_test()
             item.add_marker(marker)
+    yield
+    if config.getoption("shard"):
+        select_shard_items(items, config)
+
+
+def select_shard_items(items, config):
+    """
+    Deselects the items of the other shards, after recording the collection position of
+    every item, which orders the fixtures of the shards once merged.
+    """
+    config.fill_item_positions = {item.nodeid: i for i, item in enumerate(items)}
+    index, count = config.getoption("shard")
+    assignment = shard_assignment(
+        [item.nodeid for item in items],
+        load_shard_durations(config.getoption("shard_durations")),
+        count,
+    )
+    deselected = [item for item in items if assignment[item.nodeid] != index]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if assignment[item.nodeid] == index]
 
 
 def pytest_make_parametrize_id(config, val, argname):
@@ -459,12 +1391,16 @@ def pytest_make_parametrize_id(config, val, argname):
     return f"{argname}={val}"
 
 
+@pytest.hookimpl(wrapper=True)
 def pytest_runtest_call(item):
     """
     Pytest hook called in the context of test execution.
+
+    With `--deferred-fill`, also resolves the specs defined by the test once its test function
+    returns, so that a spec that fails to fill fails the test that defined it.
     """
     if isinstance(item, EIPSpecTestItem):
-        return
+        return (yield)
 
     class InvalidFiller(Exception):
         def __init__(self, message):
@@ -482,3 +1418,12 @@ def pytest_runtest_call(item):
             + "properly generate a test: "
             + ", ".join(SPEC_TYPES_PARAMETERS)
         )
+
+    try:
+        result = yield
+    finally:
+        deferred_filler = item.stash.get(DEFERRED_FILLER_KEY, None)
+        error = deferred_filler.resolve(item) if deferred_filler is not None else None
+    if error is not None:
+        raise error
+    return result
@@ -0,0 +1,132 @@
+"""
+Test the distributed fill coordinator, with all participants on localhost.
+"""
+
+import json
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pytest_plugins.test_filler.coordinator import (
+    CoordinatorClient,
+    CoordinatorError,
+    FillCoordinator,
+)
+
+NODEIDS = [
+    "tests/a.py::test[fork_Paris]",
+    "tests/a.py::test[fork_Shanghai]",
+    "tests/b.py::test[fork_Paris]",
+    "tests/c.py::test[fork_Paris]",
+]
+
+
+def fill_unit(client: CoordinatorClient, unit: str, nodeids: List[str]):
+    """
+    Sends one fixture per test of a unit, into a single file, and completes the unit.
+    """
+    for nodeid in nodeids:
+        position = NODEIDS.index(nodeid)
+        client.send_fixture(position, "filled", nodeid, {"position": position})
+    client.complete(unit, 0, {nodeid: 1.0 for nodeid in nodeids})
+
+
+def filled_names(output_dir: Path) -> List[str]:
+    """
+    Returns the names of the fixtures of the filled file, in order.
+    """
+    with open(output_dir / "filled.json") as f:
+        return [name.split("-", 1)[1] for name in json.load(f)]
+
+
+@pytest.mark.parametrize("socket_type", ["tcp", "unix"])
+def test_coordinated_fill(tmp_path: Path, socket_type: str):
+    """
+    Test that the units filled by several workers are written in collection order.
+    """
+    address = "localhost:0" if socket_type == "tcp" else f"unix:{tmp_path / 'fill.sock'}"
+    coordinator = FillCoordinator(address, NODEIDS, str(tmp_path / "fixtures"))
+    coordinator.start()
+    clients = [CoordinatorClient(coordinator.address, NODEIDS) for _ in range(2)]
+    units = [client.next_unit() for client in clients]
+    assert [unit[0] for unit in units if unit] == ["tests/a.py", "tests/b.py"]
+    for client, unit in reversed(list(zip(clients, units))):
+        assert unit is not None
+        fill_unit(client, *unit)
+    assert not coordinator.wait(0)
+    unit = clients[1].next_unit()
+    assert unit is not None
+    fill_unit(clients[1], *unit)
+    assert coordinator.wait(1)
+    assert clients[0].next_unit() is None
+    for client in clients:
+        client.close()
+
+    assert coordinator.close() == 1
+    assert filled_names(tmp_path / "fixtures") == NODEIDS
+    assert coordinator.durations == {nodeid: 1.0 for nodeid in NODEIDS}
+
+
+def test_worker_disconnection(tmp_path: Path):
+    """
+    Test that the units of a worker that disconnects are filled by another worker, and that
+    the fixtures it sent for them are discarded.
+    """
+    coordinator = FillCoordinator("localhost:0", NODEIDS, str(tmp_path))
+    coordinator.start()
+    failing = CoordinatorClient(coordinator.address, NODEIDS)
+    unit = failing.next_unit()
+    assert unit is not None and unit[0] == "tests/a.py"
+    failing.send_fixture(0, "filled", NODEIDS[0], {"position": 0})
+    failing.close()
+
+    client = CoordinatorClient(coordinator.address, NODEIDS)
+    filled = []
+    while (unit := client.next_unit()) is not None:
+        filled.append(unit[0])
+        fill_unit(client, *unit)
+    client.close()
+    assert sorted(filled) == ["tests/a.py", "tests/b.py", "tests/c.py"]
+    coordinator.close()
+    assert filled_names(tmp_path) == NODEIDS
+
+
+def test_interrupted_coordinator(tmp_path: Path):
+    """
+    Test that the fixtures written by an interrupted coordinator are not merged into the
+    fixture files of the next one.
+    """
+    interrupted = FillCoordinator("localhost:0", NODEIDS, str(tmp_path))
+    interrupted.start()
+    client = CoordinatorClient(interrupted.address, NODEIDS)
+    unit = client.next_unit()
+    assert unit is not None
+    fill_unit(client, *unit)
+    client.close()
+    # Interrupted before the shards are merged.
+    interrupted.server.shutdown()
+    interrupted.server.server_close()
+    interrupted.writer.close()
+    assert list(tmp_path.glob("*.shard"))
+
+    coordinator = FillCoordinator("localhost:0", NODEIDS, str(tmp_path))
+    coordinator.start()
+    client = CoordinatorClient(coordinator.address, NODEIDS)
+    while (unit := client.next_unit()) is not None:
+        fill_unit(client, *unit)
+    client.close()
+    assert coordinator.close() == 1
+    assert filled_names(tmp_path) == NODEIDS
+    assert not list(tmp_path.glob("*.shard"))
+
+
+def test_collection_mismatch(tmp_path: Path):
+    """
+    Test that a worker that collected different tests is rejected.
+    """
+    coordinator = FillCoordinator("localhost:0", NODEIDS, str(tmp_path))
+    coordinator.start()
+    with pytest.raises(CoordinatorError):
+        CoordinatorClient(coordinator.address, NODEIDS[1:])
+    coordinator.close()
@@ -0,0 +1,84 @@
+"""
+Test the deferred filling of the test specs of a module.
+"""
+
+import json
+import sys
+
+import pytest
+
+FAKE_EVM = f"""\
+#!{sys.executable}
+import sys
+if "-v" in sys.argv:
+    print("evm version 1.13.4-stable-fake")
+elif "--help" in sys.argv:
+    print("Shanghai")
+else:
+    sys.exit("state transitions are not supported")
+"""
+
+TEST_MODULE = """
+import pytest
+from ethereum_test_tools import Account, Block
+
+@pytest.mark.valid_from("Shanghai")
+@pytest.mark.valid_until("Shanghai")
+@pytest.mark.parametrize("index", range(4))
+def test_deferred(blockchain_test, index):
+    # Blocks require a state transition, which always fails.
+    blocks = [Block()] if index == 2 else []
+    blockchain_test(pre={{0x100 + index: Account(balance=1)}}, post={{}}, blocks=blocks)
+
+@pytest.mark.valid_from("Shanghai")
+@pytest.mark.valid_until("Shanghai")
+{marker}
+def test_{name}_fill_raises(blockchain_test):
+    with pytest.raises(Exception):
+        blockchain_test(pre={{}}, post={{}}, blocks=[Block()])
+"""
+
+
+@pytest.mark.parametrize("xdist_args", [[], ["-n", "2"]], ids=["no_xdist", "xdist"])
+def test_deferred_fill(pytester, xdist_args):
+    """
+    Test that a spec that fails to fill fails the test that defined it, that tests expecting
+    the fill to raise fill within the test, and that the fixtures of the other specs are
+    written.
+    """
+    evm = pytester.path / "evm"
+    evm.write_text(FAKE_EVM)
+    evm.chmod(0o755)
+    tests_dir = pytester.mkpydir("tests")
+    # The test expecting the fill to raise is detected, or marked to fill within the test.
+    for name, marker in [("first", ""), ("second", "@pytest.mark.no_deferred_fill")]:
+        (tests_dir / f"test_{name}.py").write_text(TEST_MODULE.format(name=name, marker=marker))
+
+    result = pytester.runpytest_subprocess(
+        "-p",
+        "pytest_plugins.test_filler.test_filler",
+        "-p",
+        "pytest_plugins.forks.forks",
+        "-p",
+        "pytest_plugins.spec_version_checker.spec_version_checker",
+        f"--evm-bin={evm}",
+        "--filler-path=tests",
+        "--output=fixtures",
+        "--deferred-fill",
+        "--dist=loadscope",
+        "--no-header",
+        *xdist_args,
+        "tests",
+    )
+    result.assert_outcomes(passed=8, failed=2)
+    result.stdout.fnmatch_lines_random(
+        [
+            f"FAILED tests/test_{name}.py::test_deferred[[]fork=Shanghai-index=2[]]*"
+            for name in ["first", "second"]
+        ]
+    )
+    for name in ["first", "second"]:
+        with open(pytester.path / "fixtures" / name / "deferred.json") as f:
+            fixtures = json.load(f)
+        assert len(fixtures) == 3
+        assert not [key for key in fixtures if "index=2" in key]
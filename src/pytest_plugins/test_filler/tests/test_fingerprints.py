@@ -0,0 +1,62 @@
+"""
+Test the fingerprints of the incremental fill.
+"""
+
+from pathlib import Path
+
+from pytest_plugins.test_filler.fingerprints import (
+    FillFingerprints,
+    fingerprint,
+    module_dependencies,
+)
+
+
+def test_module_dependencies(tmp_path: Path, monkeypatch):
+    """
+    Test that the helpers imported from the repository are found recursively, through
+    absolute and relative imports, but not the modules outside of it or excluded.
+    """
+    monkeypatch.syspath_prepend(str(tmp_path))
+    files = {
+        "tests/__init__.py": "",
+        "tests/eip1/__init__.py": "",
+        "tests/eip1/test_eip1.py": "import json\nfrom .spec import Spec\nfrom ..common import x\n",
+        "tests/eip1/spec.py": "from helpers import y\n",
+        "tests/common.py": "x = 1\n",
+        "helpers/__init__.py": "from helpers.sub import y\n",
+        "helpers/sub.py": "from framework import z\ny = 1\n",
+        "framework/__init__.py": "z = 1\n",
+        "unused.py": "",
+    }
+    for name, contents in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(contents)
+
+    dependencies = module_dependencies(
+        tmp_path / "tests/eip1/test_eip1.py", tmp_path, (tmp_path / "framework",)
+    )
+    assert [str(path.relative_to(tmp_path)) for path in dependencies] == [
+        "helpers/__init__.py",
+        "helpers/sub.py",
+        "tests/__init__.py",
+        "tests/common.py",
+        "tests/eip1/__init__.py",
+        "tests/eip1/spec.py",
+        "tests/eip1/test_eip1.py",
+    ]
+
+
+def test_fill_fingerprints(tmp_path: Path):
+    """
+    Test that the fingerprints are stored in the output directory and read back.
+    """
+    assert fingerprint({"b": 1, "a": 2}, "x") == fingerprint({"a": 2, "b": 1}, "x")
+    assert fingerprint("x") != fingerprint("y")
+
+    fingerprints = FillFingerprints(tmp_path / "fixtures")
+    assert fingerprints.entries == {}
+    entry = {"fingerprint": fingerprint("x"), "fixtures": [{"file": "a/b", "name": "fork_1"}]}
+    fingerprints.entries["tests/a/test_b.py::test_b[fork_1]"] = entry
+    fingerprints.save()
+    assert FillFingerprints(tmp_path / "fixtures").entries == fingerprints.entries
+    assert [p.name for p in (tmp_path / "fixtures").iterdir()] == [".fingerprints.json"]
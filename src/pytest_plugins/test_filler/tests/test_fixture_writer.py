@@ -0,0 +1,104 @@
+"""
+Test the streaming writer of the fixture files.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from pytest_plugins.test_filler.fixture_writer import (
+    PARTIAL_SUFFIX,
+    SHARD_SUFFIX,
+    FixtureWriter,
+    merge_shards,
+)
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_fixture_writer(tmp_path: Path, background: bool):
+    """
+    Test that the streamed files are identical to a dump of all their fixtures, and only
+    appear once complete.
+    """
+    fixtures: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {
+        "a/test_a": [
+            (f"fork_{i}", {"pre": {"0x01": [i, "x" * i]}, "_info": {}}) for i in range(12)
+        ],
+        "test_b": [("fork_0", {"nested": {"empty": {}, "list": []}})],
+    }
+    writer = FixtureWriter(str(tmp_path), background=background)
+    for module_file, module_fixtures in fixtures.items():
+        for name, fixture in module_fixtures:
+            writer.write(module_file, name, fixture)
+    assert not (tmp_path / "test_b.json").exists()
+    writer.close()
+
+    for module_file, module_fixtures in fixtures.items():
+        expected = json.dumps(
+            {str(i).zfill(3) + "-" + name: f for i, (name, f) in enumerate(module_fixtures)},
+            indent=4,
+        )
+        assert (tmp_path / f"{module_file}.json").read_text() == expected
+    assert not list(tmp_path.rglob(f"*{PARTIAL_SUFFIX}"))
+
+
+def test_fixture_writer_error(tmp_path: Path):
+    """
+    Test that an error of the background thread is raised on close, leaving no partial file.
+    """
+    writer = FixtureWriter(str(tmp_path), background=True)
+    writer.write("test_a", "fork_0", {"ok": 1})
+    writer.write("test_a", "fork_1", {"not_json": object()})
+    with pytest.raises(TypeError):
+        writer.close()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_merge_shards(tmp_path: Path):
+    """
+    Test that the shards written by several workers are merged in the collection order of
+    the tests, as a single worker would have written them.
+    """
+    shards = [FixtureWriter(str(tmp_path), shard=f"gw{i}") for i in range(2)]
+    single = FixtureWriter(str(tmp_path / "single"))
+    for position in [3, 0, 2, 1, 4]:
+        # Test 2 produces two fixtures.
+        for name in [f"test_{position}"] + (["test_2-extra"] if position == 2 else []):
+            shards[position % 2].write("a/test_a", name, {"position": position}, position)
+    for position in range(5):
+        for name in [f"test_{position}"] + (["test_2-extra"] if position == 2 else []):
+            single.write("a/test_a", name, {"position": position})
+    for writer in shards + [single]:
+        writer.close()
+    assert len(list(tmp_path.rglob(f"*{SHARD_SUFFIX}"))) == 2
+
+    assert merge_shards(str(tmp_path)) == 1
+    merged = (tmp_path / "a/test_a.json").read_text()
+    assert merged == (tmp_path / "single/a/test_a.json").read_text()
+    assert not list(tmp_path.rglob(f"*{SHARD_SUFFIX}"))
+
+
+def test_merge_shards_of_nodes(tmp_path: Path):
+    """
+    Test that the shards of several output directories are merged into another one, leaving
+    the input directories untouched.
+    """
+    input_dirs = [tmp_path / f"node{i}" for i in range(2)]
+    for i, input_dir in enumerate(input_dirs):
+        writer = FixtureWriter(str(input_dir), shard=f"node{i}")
+        for position in range(i, 4, 2):
+            writer.write("a/test_a", f"test_{position}", {"position": position}, position)
+        writer.close()
+    single = FixtureWriter(str(tmp_path / "single"))
+    for position in range(4):
+        single.write("a/test_a", f"test_{position}", {"position": position})
+    single.close()
+
+    output_dir = tmp_path / "merged"
+    assert merge_shards(str(output_dir), [str(d) for d in input_dirs], remove=False) == 1
+    merged = (output_dir / "a/test_a.json").read_text()
+    assert merged == (tmp_path / "single/a/test_a.json").read_text()
+    for input_dir in input_dirs:
+        assert len(list(input_dir.rglob(f"*{SHARD_SUFFIX}"))) == 1
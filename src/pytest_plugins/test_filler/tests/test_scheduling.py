@@ -0,0 +1,161 @@
+"""
+Test the duration-aware scheduling of the tests across xdist workers.
+"""
+
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from pytest_plugins.test_filler.scheduling import (
+    DurationScheduling,
+    expected_durations,
+    modules_to_split,
+    parse_shard,
+    shard_assignment,
+)
+
+
+class MockConfig:
+    """
+    Configuration of a session with two workers.
+    """
+
+    option = SimpleNamespace(loadscopereorder=True)
+
+    def getvalue(self, name: str):
+        """
+        Returns the xdist execution nodes.
+        """
+        assert name == "tx"
+        return ["2*popen"]
+
+
+class MockNode:
+    """
+    Worker recording the tests it is sent.
+    """
+
+    def __init__(self, worker_id: str):
+        self.gateway = SimpleNamespace(id=worker_id)
+        self.sent: List[int] = []
+        self.shutting_down = False
+
+    def send_runtest_some(self, indices: List[int]):
+        """
+        Records the indices of the sent tests.
+        """
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        """
+        Marks the node as shutting down.
+        """
+        self.shutting_down = True
+
+
+def test_expected_durations():
+    """
+    Test that unknown tests are expected to take the mean of the recorded durations, and
+    that only the modules taking more than half of a worker's share are split.
+    """
+    collection = ["a.py::t1", "a.py::t2", "b.py::t1", "c.py::t1"]
+    expected = expected_durations(collection, {"a.py::t1": 10.0, "a.py::t2": 8.0, "b.py::t1": 3})
+    assert expected == {"a.py::t1": 10.0, "a.py::t2": 8.0, "b.py::t1": 3, "c.py::t1": 7.0}
+    assert modules_to_split(expected, 2) == {"a.py"}
+    assert modules_to_split(expected, 1) == set()
+
+
+def test_duration_scheduling():
+    """
+    Test that the longest work units are assigned first, and that the tests of a split
+    module are spread across the workers.
+    """
+    collection = [
+        "small.py::test[fork_Paris]",
+        "medium.py::test[fork_Paris]",
+        "medium.py::test[fork_Shanghai]",
+        "large.py::test[fork_Paris]",
+        "large.py::test[fork_Shanghai]",
+        "large.py::test[fork_Cancun]",
+    ]
+    durations = dict(zip(collection, [1.0, 2.0, 2.0, 9.0, 8.0, 7.0]))
+    scheduler = DurationScheduling(MockConfig(), None, durations)
+    nodes = [MockNode("gw0"), MockNode("gw1")]
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+
+    assert scheduler.split_modules == {"large.py"}
+    assert [collection[i] for i in nodes[0].sent[:1]] == ["large.py::test[fork_Paris]"]
+    assert [collection[i] for i in nodes[1].sent[:1]] == ["large.py::test[fork_Shanghai]"]
+    for node in nodes:
+        for index in list(node.sent):
+            scheduler.mark_test_complete(node, index)
+    assert sorted(nodes[0].sent + nodes[1].sent) == list(range(len(collection)))
+    assert scheduler.tests_finished
+
+
+def test_duration_scheduling_order():
+    """
+    Test that the work units are sent longest-first, the units with equal durations in
+    collection order.
+    """
+    durations = [3.0, 1.0, 5.0, 3.0, 4.0, 2.0, 4.5, 0.5]
+    collection = [f"m{i}.py::test" for i in range(len(durations))]
+    scheduler = DurationScheduling(MockConfig(), None, dict(zip(collection, durations)))
+    sent: List[int] = []
+    nodes = [MockNode("gw0"), MockNode("gw1")]
+    for node in nodes:
+        node.sent = sent
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, collection)
+    scheduler.schedule()
+    while len(sent) < len(collection):
+        pending = [
+            nodeid
+            for work_unit in scheduler.assigned_work[nodes[0]].values()
+            for nodeid, completed in work_unit.items()
+            if not completed
+        ]
+        scheduler.mark_test_complete(nodes[0], collection.index(pending[0]))
+    assert [durations[i] for i in sent] == sorted(durations, reverse=True)
+    assert [collection[i] for i in sent][3:5] == ["m0.py::test", "m3.py::test"]
+
+
+def test_parse_shard():
+    """
+    Test the parsing of the `--shard` option.
+    """
+    assert parse_shard("1/4") == (1, 4)
+    assert parse_shard("4/4") == (4, 4)
+    for value in ["0/4", "5/4", "1", "a/b"]:
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shard_assignment():
+    """
+    Test that the tests are dealt in turn without durations, and balanced by duration
+    otherwise, independently of the collection order.
+    """
+    collection = [f"test_{i}.py::test" for i in range(5)]
+    assert shard_assignment(collection, {}, 2) == {
+        "test_0.py::test": 1,
+        "test_1.py::test": 2,
+        "test_2.py::test": 1,
+        "test_3.py::test": 2,
+        "test_4.py::test": 1,
+    }
+    durations = dict(zip(collection, [1.0, 6.0, 2.0, 3.0]))
+    assignment = shard_assignment(collection, durations, 2)
+    # test_4 is expected to take the mean duration, 3 seconds.
+    assert assignment == {
+        "test_1.py::test": 1,
+        "test_3.py::test": 2,
+        "test_4.py::test": 2,
+        "test_2.py::test": 1,
+        "test_0.py::test": 2,
+    }
+    assert shard_assignment(collection[::-1], durations, 2) == assignment